@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BarriersConfig(AppConfig):
     name = "barriers"
+
+    def ready(self):
+        from .template_registry import activity_templates, history_templates
+
+        if not settings.DEBUG:
+            history_templates.load()
+            activity_templates.load()
@@ -1,9 +1,16 @@
 import uuid
+from functools import partial
 
-import requests
+from django.conf import settings
 
 from utils.api.client import MarketAccessAPIClient
-from utils.exceptions import FileUploadError, ScanError
+from utils.exceptions import (
+    APICircuitOpenException,
+    APIDeadlineExceededException,
+    FileUploadError,
+    ScanError,
+)
+from utils.uploads import upload_in_background, upload_to_s3
 
 
 class APIFormMixin:
@@ -25,10 +32,18 @@ class DocumentMixin:
     3. Calls the API confirming that the file has been uploaded.
     4. Polls the API until the virus scan is complete, raising an exception
        if it fails the check.
+
+    Files are streamed to S3 in chunks, with failed attempts retried. With
+    S3_UPLOAD_IN_BACKGROUND, steps 2 and 3 run in a background pool when
+    we aren't waiting for the scan.
+
+    Pass wait_for_scan=False to skip step 4 and leave the browser to poll
+    for the scan result, so the worker isn't tied up for the whole scan.
     """
 
     def __init__(self, *args, **kwargs):
         self.token = kwargs.pop("token")
+        self.wait_for_scan = kwargs.pop("wait_for_scan", True)
         super().__init__(*args, **kwargs)
 
     def validate_document(self, field_name="document"):
@@ -64,19 +79,32 @@ class DocumentMixin:
         document = self.cleaned_data[field_name]
 
         client = MarketAccessAPIClient(self.token)
-        data = client.documents.create(
-            filename=document.name,
-            filesize=document.size,
-        )
-        document_id = data["id"]
-
-        self.upload_to_s3(url=data["signed_upload_url"], document=document)
-
-        client.documents.complete_upload(document_id)
-        client.documents.check_scan_status(document_id)
+        try:
+            data = client.documents.create(
+                filename=document.name,
+                filesize=document.size,
+            )
+            document_id = data["id"]
+
+            if not self.wait_for_scan and settings.S3_UPLOAD_IN_BACKGROUND:
+                upload_in_background(
+                    document_id=document_id,
+                    url=data["signed_upload_url"],
+                    file=document,
+                    on_complete=partial(client.documents.complete_upload, document_id),
+                )
+            else:
+                self.upload_to_s3(url=data["signed_upload_url"], document=document)
+                client.documents.complete_upload(document_id)
+
+            if self.wait_for_scan:
+                client.documents.check_scan_status(document_id)
+        except (APICircuitOpenException, APIDeadlineExceededException):
+            raise FileUploadError("The file could not be uploaded in time. Try again.")
 
         return {
             "id": document_id,
+            "scanned": self.wait_for_scan,
             "file": {
                 "name": document.name,
                 "size": document.size,
@@ -84,21 +112,7 @@ class DocumentMixin:
         }
 
     def upload_to_s3(self, url, document):
-        document.seek(0)
-        response = requests.put(
-            url,
-            headers={
-                "x-amz-server-side-encryption": "AES256",
-            },
-            data=document,
-        )
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            raise FileUploadError(
-                "A system error has occured, so the file has not been "
-                "uploaded. Try again."
-            )
+        upload_to_s3(url, document)
 
     def is_multi_document(self):
         """
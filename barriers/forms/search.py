@@ -1,4 +1,5 @@
 import copy
+import weakref
 from operator import itemgetter
 from urllib.parse import urlencode
 
@@ -6,6 +7,114 @@ from django import forms
 from django.http import QueryDict
 
 
+class SearchChoices:
+    """
+    Choices for the metadata driven fields of BarrierSearchForm.
+
+    Built once per Metadata instance, and so once per metadata version,
+    then shared by every search form. Choices are tuples so they can't be
+    changed by accident, and each has a value to label lookup.
+
+    Instances don't keep a reference to their metadata, so the cache entry
+    goes away along with an old metadata version.
+    """
+
+    _instances = weakref.WeakKeyDictionary()
+
+    def __init__(self, metadata):
+        self.choices = {
+            "country": self.get_country_choices(metadata),
+            "country_trading_bloc": self.get_trading_bloc_choices(
+                metadata,
+                {
+                    "TB00016": "Include country specific implementations of EU regulations"
+                },
+            ),
+            "extra_location": self.get_trading_bloc_choices(
+                metadata, {"TB00016": "Include EU-wide barriers"}
+            ),
+            "trade_direction": tuple(metadata.get_trade_direction_choices()),
+            "sector": tuple(
+                (sector["id"], sector["name"])
+                for sector in metadata.get_sector_list(level=0)
+            ),
+            "organisation": tuple(metadata.get_gov_organisation_choices()),
+            "category": self.get_category_choices(metadata),
+            "region": tuple(
+                (region["id"], region["name"])
+                for region in metadata.get_overseas_region_list()
+            ),
+            "priority": self.get_priority_choices(metadata),
+            "status": self.get_status_choices(metadata),
+            "tags": tuple(
+                sorted(
+                    (str(tag["id"]), tag["title"])
+                    for tag in metadata.get_barrier_tags()
+                )
+            ),
+        }
+        self.lookups = {
+            field_name: dict(choices) for field_name, choices in self.choices.items()
+        }
+
+    @classmethod
+    def for_metadata(cls, metadata):
+        try:
+            return cls._instances[metadata]
+        except KeyError:
+            instance = cls._instances[metadata] = cls(metadata)
+            return instance
+
+    def get_country_choices(self, metadata):
+        return tuple(
+            (trading_bloc["code"], trading_bloc["name"])
+            for trading_bloc in metadata.get_trading_bloc_list()
+        ) + tuple(
+            (country["id"], country["name"]) for country in metadata.get_country_list()
+        )
+
+    def get_trading_bloc_choices(self, metadata, labels):
+        return tuple(
+            (
+                trading_bloc["code"],
+                labels.get(trading_bloc["code"], trading_bloc["name"]),
+            )
+            for trading_bloc in metadata.get_trading_bloc_list()
+        )
+
+    def get_category_choices(self, metadata):
+        choices = set(
+            (str(category["id"]), category["title"])
+            for category in metadata.data["categories"]
+        )
+        return tuple(sorted(choices, key=itemgetter(1)))
+
+    def get_priority_choices(self, metadata):
+        priorities = sorted(
+            metadata.data["barrier_priorities"], key=itemgetter("order")
+        )
+        return tuple(
+            (
+                priority["code"],
+                (
+                    f"<span class='priority-marker "
+                    f"priority-marker--{ priority['code'].lower() }'>"
+                    f"</span>{priority['name']}"
+                ),
+            )
+            for priority in priorities
+        )
+
+    def get_status_choices(self, metadata):
+        status_ids = ("1", "2", "3", "4", "5", "7")
+        choices = [
+            (id, value)
+            for id, value in metadata.data["barrier_status"].items()
+            if id in status_ids
+        ]
+        return tuple(sorted(choices, key=itemgetter(0)))
+
+
 class BarrierSearchForm(forms.Form):
     search_id = forms.UUIDField(required=False, widget=forms.HiddenInput())
     search = forms.CharField(
@@ -144,17 +253,7 @@ class BarrierSearchForm(forms.Form):
             kwargs["data"] = self.get_data_from_querydict(kwargs["data"])
 
         super().__init__(*args, **kwargs)
-        self.set_country_choices()
-        self.set_country_trading_bloc_choices()
-        self.set_extra_location_choices()
-        self.set_trade_direction_choices()
-        self.set_sector_choices()
-        self.set_organisation_choices()
-        self.set_category_choices()
-        self.set_region_choices()
-        self.set_priority_choices()
-        self.set_status_choices()
-        self.set_tags_choices()
+        self.set_choices()
         self.index_filter_groups()
 
     def get_data_from_querydict(self, data):
@@ -188,104 +287,10 @@ class BarrierSearchForm(forms.Form):
         }
         return {k: v for k, v in cleaned_data.items() if v}
 
-    def set_country_choices(self):
-        location_choices = [
-            (trading_bloc["code"], trading_bloc["name"])
-            for trading_bloc in self.metadata.get_trading_bloc_list()
-        ] + [
-            (country["id"], country["name"])
-            for country in self.metadata.get_country_list()
-        ]
-        self.fields["country"].choices = location_choices
-
-    def set_extra_location_choices(self):
-        trading_bloc_labels = {
-            "TB00016": "Include EU-wide barriers",
-        }
-        self.fields["extra_location"].choices = [
-            (
-                trading_bloc["code"],
-                trading_bloc_labels.get(trading_bloc["code"], trading_bloc["name"]),
-            )
-            for trading_bloc in self.metadata.get_trading_bloc_list()
-        ]
-
-    def set_country_trading_bloc_choices(self):
-        trading_bloc_labels = {
-            "TB00016": "Include country specific implementations of EU regulations"
-        }
-        self.fields["country_trading_bloc"].choices = [
-            (
-                trading_bloc["code"],
-                trading_bloc_labels.get(trading_bloc["code"], trading_bloc["name"]),
-            )
-            for trading_bloc in self.metadata.get_trading_bloc_list()
-        ]
-
-    def set_trade_direction_choices(self):
-        self.fields[
-            "trade_direction"
-        ].choices = self.metadata.get_trade_direction_choices()
-
-    def set_sector_choices(self):
-        self.fields["sector"].choices = [
-            (sector["id"], sector["name"])
-            for sector in self.metadata.get_sector_list(level=0)
-        ]
-
-    def set_organisation_choices(self):
-        self.fields[
-            "organisation"
-        ].choices = self.metadata.get_gov_organisation_choices()
-
-    def set_category_choices(self):
-        choices = [
-            (str(category["id"]), category["title"])
-            for category in self.metadata.data["categories"]
-        ]
-        choices = list(set(choices))
-        choices.sort(key=itemgetter(1))
-        self.fields["category"].choices = choices
-
-    def set_region_choices(self):
-        choices = [
-            (country["id"], country["name"])
-            for country in self.metadata.get_overseas_region_list()
-        ]
-        self.fields["region"].choices = choices
-
-    def set_priority_choices(self):
-        priorities = self.metadata.data["barrier_priorities"]
-        priorities.sort(key=itemgetter("order"))
-        choices = [
-            (
-                priority["code"],
-                (
-                    f"<span class='priority-marker "
-                    f"priority-marker--{ priority['code'].lower() }'>"
-                    f"</span>{priority['name']}"
-                ),
-            )
-            for priority in priorities
-        ]
-        self.fields["priority"].choices = choices
-
-    def set_status_choices(self):
-        status_ids = ("1", "2", "3", "4", "5", "7")
-        choices = [
-            (id, value)
-            for id, value in self.metadata.data["barrier_status"].items()
-            if id in status_ids
-        ]
-        choices.sort(key=itemgetter(0))
-        self.fields["status"].choices = choices
-
-    def set_tags_choices(self):
-        choices = [
-            (str(tag["id"]), tag["title"]) for tag in self.metadata.get_barrier_tags()
-        ]
-        choices.sort(key=itemgetter(0))
-        self.fields["tags"].choices = choices
+    def set_choices(self):
+        self.search_choices = SearchChoices.for_metadata(self.metadata)
+        for field_name, choices in self.search_choices.choices.items():
+            self.fields[field_name].choices = choices
 
     def clean_country(self):
         data = self.cleaned_data["country"]
@@ -403,7 +408,9 @@ class BarrierSearchForm(forms.Form):
     def get_filter_readable_value(self, field_name, value):
         field = self.fields[field_name]
         if hasattr(field, "choices"):
-            field_lookup = dict(field.choices)
+            field_lookup = self.search_choices.lookups.get(field_name)
+            if field_lookup is None:
+                field_lookup = dict(field.choices)
             return ", ".join([field_lookup.get(x) for x in value])
         elif isinstance(field, forms.BooleanField):
             return field.label
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from utils.api.cache import CACHE_EVENTS, get_cache_stats
+from utils.api.client import MarketAccessAPIClient
+
+
+class Command(BaseCommand):
+    help = "Shows hit/miss counters for the shared API response cache"
+
+    def handle(self, *args, **options):
+        client = MarketAccessAPIClient()
+        names = [
+            resource.resource_name
+            for resource in vars(client).values()
+            if getattr(resource, "cache_timeout_setting", None)
+        ]
+        self.stdout.write(
+            f"{'resource':<20}" + "".join(f"{e:>12}" for e in CACHE_EVENTS)
+        )
+        for name, counts in get_cache_stats(names).items():
+            self.stdout.write(
+                f"{name:<20}" + "".join(f"{counts[e]:>12}" for e in CACHE_EVENTS)
+            )
@@ -1,4 +1,4 @@
-import dateutil.parser
+from django.utils.functional import cached_property
 
 from barriers.constants import PUBLIC_BARRIER_STATUSES
 from barriers.models.assessments import (
@@ -9,7 +9,7 @@ from barriers.models.assessments import (
 from barriers.models.commodities import BarrierCommodity
 from barriers.models.wto import WTOProfile
 from utils.metadata import get_metadata
-from utils.models import APIModel
+from utils.models import APIModel, parse_datetime
 
 
 class Barrier(APIModel):
@@ -42,22 +42,22 @@ class Barrier(APIModel):
     def admin_area_ids(self):
         return [admin_area["id"] for admin_area in self.data.get("admin_areas", [])]
 
-    @property
+    @cached_property
     def archived_on(self):
-        return dateutil.parser.parse(self.data["archived_on"])
+        return parse_datetime(self.data["archived_on"])
 
     @property
     def category_titles(self):
         return [category["title"] for category in self.categories]
 
-    @property
+    @cached_property
     def created_on(self):
-        return dateutil.parser.parse(self.data["created_on"])
+        return parse_datetime(self.data["created_on"])
 
-    @property
+    @cached_property
     def end_date(self):
         if self.data.get("end_date"):
-            return dateutil.parser.parse(self.data["end_date"])
+            return parse_datetime(self.data["end_date"])
 
     @property
     def commodities(self):
@@ -79,17 +79,17 @@ class Barrier(APIModel):
             grouped_commodities[key].append(barrier_commodity)
         return grouped_commodities
 
-    @property
+    @cached_property
     def last_seen_on(self):
-        return dateutil.parser.parse(self.data["last_seen_on"])
+        return parse_datetime(self.data["last_seen_on"])
 
     @property
     def location(self):
         return self.data.get("location")
 
-    @property
+    @cached_property
     def modified_on(self):
-        return dateutil.parser.parse(self.data["modified_on"])
+        return parse_datetime(self.data["modified_on"])
 
     @property
     def public_barrier(self):
@@ -220,9 +220,9 @@ class Barrier(APIModel):
             self._status.update(self.data["status"])
         return self._status
 
-    @property
+    @cached_property
     def status_date(self):
-        return dateutil.parser.parse(self.data.get("status_date"))
+        return parse_datetime(self.data.get("status_date"))
 
     @property
     def tags(self):
@@ -307,10 +307,10 @@ class PublicBarrier(APIModel):
     def internal_is_resolved(self):
         return self.data.get("internal_is_resolved")
 
-    @property
+    @cached_property
     def internal_status_date(self):
         if self.data.get("internal_status_date"):
-            return dateutil.parser.parse(self.data["internal_status_date"])
+            return parse_datetime(self.data["internal_status_date"])
 
     @property
     def internal_government_organisations(self):
@@ -337,20 +337,20 @@ class PublicBarrier(APIModel):
             return "Yes"
         return "No"
 
-    @property
+    @cached_property
     def status_date(self):
         if self.data.get("status_date"):
-            return dateutil.parser.parse(self.data["status_date"])
+            return parse_datetime(self.data["status_date"])
 
-    @property
+    @cached_property
     def first_published_on(self):
         if self.data.get("first_published_on") is not None:
-            return dateutil.parser.parse(self.data["first_published_on"])
+            return parse_datetime(self.data["first_published_on"])
 
-    @property
+    @cached_property
     def last_published_on(self):
         if self.data.get("last_published_on") is not None:
-            return dateutil.parser.parse(self.data["last_published_on"])
+            return parse_datetime(self.data["last_published_on"])
 
     @property
     def unpublished_changes(self):
@@ -358,10 +358,10 @@ class PublicBarrier(APIModel):
             return False
         return self.data.get("unpublished_changes")
 
-    @property
+    @cached_property
     def unpublished_on(self):
         if self.data.get("unpublished_on") is not None:
-            return dateutil.parser.parse(self.data["unpublished_on"])
+            return parse_datetime(self.data["unpublished_on"])
 
     @property
     def is_eligible(self):
@@ -447,7 +447,7 @@ class PublicBarrier(APIModel):
         elif self.public_view_status == PUBLIC_BARRIER_STATUSES.PUBLISHED:
             return "Published"
 
-    @property
+    @cached_property
     def reported_on(self):
         if self.data.get("reported_on"):
-            return dateutil.parser.parse(self.data["reported_on"])
+            return parse_datetime(self.data["reported_on"])
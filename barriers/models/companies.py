@@ -1,6 +1,4 @@
-import dateutil.parser
-
-from utils.models import APIModel
+from utils.models import APIModel, parse_datetime
 
 
 class Company(APIModel):
@@ -10,7 +8,7 @@ class Company(APIModel):
 
     def __init__(self, data):
         self.data = data
-        self.created_on = dateutil.parser.parse(data["created_on"])
+        self.created_on = parse_datetime(data["created_on"])
 
     def get_address_display(self):
         address_parts = [
@@ -1,8 +1,7 @@
-import dateutil.parser
-
 from barriers.constants import ARCHIVED_REASON
 from barriers.models.commodities import format_commodity_code
 from utils.metadata import Statuses
+from utils.models import parse_datetime
 
 from .base import BaseHistoryItem, GenericHistoryItem
 from .utils import PolymorphicBase
@@ -154,7 +153,7 @@ class EndDateHistoryItem(BaseHistoryItem):
 
     def get_value(self, value):
         if value:
-            return dateutil.parser.parse(value)
+            return parse_datetime(value)
 
 
 class IsSummarySensitiveHistoryItem(BaseHistoryItem):
@@ -232,7 +231,7 @@ class StatusHistoryItem(BaseHistoryItem):
 
     def get_value(self, value):
         if value["status_date"]:
-            value["status_date"] = dateutil.parser.parse(value["status_date"])
+            value["status_date"] = parse_datetime(value["status_date"])
         value["status_short_text"] = self.metadata.get_status_text(value["status"])
         value["status_text"] = self.metadata.get_status_text(
             status_id=value["status"],
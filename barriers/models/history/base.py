@@ -1,19 +1,21 @@
-import dateutil.parser
+from django.utils.functional import cached_property
 
-from utils.diff import diff_match_patch
+from utils.diff_service import get_diff, get_diffs
 from utils.metadata import MetadataMixin
-from utils.models import APIModel
+from utils.models import APIModel, parse_datetime
 
 
 class BaseHistoryItem(MetadataMixin, APIModel):
+    _diff = None
     _metadata = None
     _new_value = None
     _old_value = None
     modifier = ""
+    diff_budget = None
 
-    @property
+    @cached_property
     def date(self):
-        return dateutil.parser.parse(self.data["date"])
+        return parse_datetime(self.data["date"])
 
     @property
     def new_value(self):
@@ -29,10 +31,9 @@ class BaseHistoryItem(MetadataMixin, APIModel):
 
     @property
     def diff(self):
-        dmp = diff_match_patch()
-        diffs = dmp.diff_main(self.old_value or "", self.new_value or "")
-        dmp.diff_cleanupSemantic(diffs)
-        return dmp.diff_prettyHtml(diffs)
+        if self._diff is None:
+            self._diff = get_diff(self.old_value, self.new_value, self.diff_budget)
+        return self._diff
 
     def get_value(self, value):
         return value
@@ -46,3 +47,22 @@ class GenericHistoryItem(BaseHistoryItem):
     @property
     def field_name(self):
         return self.field.replace("_", " ").title()
+
+
+def prefetch_diffs(items, budget=None):
+    """
+    Diff the text of a batch of history items in one go.
+
+    Only items using the default text diff are included.
+    """
+    items = [
+        item
+        for item in items
+        if type(item).diff is BaseHistoryItem.diff
+        and item._diff is None
+        and isinstance(item.old_value or "", str)
+        and isinstance(item.new_value or "", str)
+    ]
+    diffs = get_diffs([(item.old_value, item.new_value) for item in items], budget)
+    for item, diff in zip(items, diffs):
+        item._diff = diff
@@ -1,15 +1,15 @@
-import dateutil.parser
+from django.utils.functional import cached_property
 
-from utils.models import APIModel
+from utils.models import APIModel, parse_datetime
 
 
 class Mention(APIModel):
     def __init__(self, data):
         self.data = data
 
-    @property
+    @cached_property
     def created_on(self):
-        return dateutil.parser.parse(self.data["created_on"])
+        return parse_datetime(self.data["created_on"])
 
     @property
     def go_to_url_path(self):
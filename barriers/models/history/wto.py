@@ -1,6 +1,5 @@
-import dateutil.parser
-
 from barriers.models.wto import WTOProfile
+from utils.models import parse_datetime
 
 from .base import BaseHistoryItem, GenericHistoryItem
 from .utils import PolymorphicBase
@@ -58,7 +57,7 @@ class RaisedDateHistoryItem(BaseHistoryItem):
 
     def get_value(self, value):
         if value:
-            return dateutil.parser.parse(value)
+            return parse_datetime(value)
 
 
 class WTONotifiedStatusHistoryItem(BaseHistoryItem):
@@ -0,0 +1,72 @@
+import os
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, engines
+from django.template.loader import get_template
+from django.template.utils import get_app_template_dirs
+
+
+class PartialTemplateRegistry:
+    """
+    Maps (model, field) to the compiled partial for a history or activity item.
+
+    Built once by scanning the partials directory, so rendering an item is a
+    dict lookup rather than a template search. Pairs without a partial map
+    to the default template, or None if there isn't one.
+
+    With DEBUG on templates are looked up every time, so edits show up
+    without a restart.
+    """
+
+    def __init__(self, directory, default_template_name=None):
+        self.directory = directory
+        self.default_template_name = default_template_name
+        self.templates = None
+        self.default_template = None
+
+    def get_template_dirs(self):
+        engine = engines["django"].engine
+        return list(engine.dirs) + list(get_app_template_dirs("templates"))
+
+    def get_template_name(self, model, field):
+        return f"{self.directory}/{model}/{field}.html"
+
+    def load(self):
+        templates = {}
+        for template_dir in self.get_template_dirs():
+            root = os.path.join(template_dir, self.directory)
+            for model in sorted(os.listdir(root)) if os.path.isdir(root) else ():
+                model_dir = os.path.join(root, model)
+                if not os.path.isdir(model_dir):
+                    continue
+                for filename in sorted(os.listdir(model_dir)):
+                    field, extension = os.path.splitext(filename)
+                    if extension == ".html" and (model, field) not in templates:
+                        templates[(model, field)] = get_template(
+                            self.get_template_name(model, field)
+                        )
+
+        if self.default_template_name:
+            self.default_template = get_template(self.default_template_name)
+        self.templates = templates
+
+    def lookup(self, model, field):
+        try:
+            return get_template(self.get_template_name(model, field))
+        except TemplateDoesNotExist:
+            if self.default_template_name:
+                return get_template(self.default_template_name)
+
+    def get(self, model, field):
+        if settings.DEBUG:
+            return self.lookup(model, field)
+        if self.templates is None:
+            self.load()
+        return self.templates.get((model, field), self.default_template)
+
+
+history_templates = PartialTemplateRegistry(
+    "barriers/history/partials",
+    default_template_name="barriers/history/partials/default.html",
+)
+activity_templates = PartialTemplateRegistry("barriers/activity/partials")
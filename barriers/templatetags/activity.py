@@ -1,14 +1,15 @@
 from django import template
-from django.template.loader import get_template
+
+from barriers.template_registry import activity_templates
 
 register = template.Library()
 
 
 @register.simple_tag(takes_context=True)
 def activity_item(context, item):
-    template_name = f"barriers/activity/partials/{item.model}/{item.field}.html"
-    try:
-        item_template = get_template(template_name)
-    except template.TemplateDoesNotExist:
+    item_template = activity_templates.get(item.model, item.field)
+    if item_template is None:
         return ""
-    return item_template.render(context.flatten())
+    # Render with the page's own context plus the item, rather than a copy
+    with context.push(item=item):
+        return item_template.template.render(context)
@@ -1,12 +1,11 @@
 from django import template
-from django.template.loader import select_template
+
+from barriers.template_registry import history_templates
 
 register = template.Library()
 
 
 @register.simple_tag()
 def history_item(item):
-    template_name = f"barriers/history/partials/{item.model}/{item.field}.html"
-    default_template_name = "barriers/history/partials/default.html"
-    item_template = select_template([template_name, default_template_name])
+    item_template = history_templates.get(item.model, item.field)
     return item_template.render({"item": item})
@@ -55,7 +55,7 @@ from .views.companies import (
     CompanyDetail,
 )
 from .views.core import BarrierDetail, Dashboard, WhatIsABarrier
-from .views.documents import DownloadDocument
+from .views.documents import DocumentScanStatus, DownloadDocument
 from .views.edit import (
     BarrierEditCausedByTradingBloc,
     BarrierEditCommercialValue,
@@ -75,7 +75,7 @@ from .views.government_organisations import (
     BarrierEditGovernmentOrganisations,
     BarrierRemoveGovernmentOrganisation,
 )
-from .views.history import BarrierHistory
+from .views.history import BarrierHistory, BarrierHistoryItems
 from .views.location import (
     AddAdminArea,
     BarrierEditCountryOrTradingBloc,
@@ -140,6 +140,11 @@ urlpatterns = [
         DownloadDocument.as_view(),
         name="download_document",
     ),
+    path(
+        "documents/<uuid:document_id>/scan-status/",
+        DocumentScanStatus.as_view(),
+        name="document_scan_status",
+    ),
     path("saved-searches/new/", NewSavedSearch.as_view(), name="new_saved_search"),
     path(
         "saved-searches/<uuid:saved_search_id>/rename/",
@@ -278,6 +283,11 @@ urlpatterns = [
     path(
         "barriers/<uuid:barrier_id>/history/", BarrierHistory.as_view(), name="history"
     ),
+    path(
+        "barriers/<uuid:barrier_id>/history/items/",
+        BarrierHistoryItems.as_view(),
+        name="history_items",
+    ),
     path(
         "barriers/<uuid:barrier_id>/interactions/add-note/",
         BarrierAddNote.as_view(),
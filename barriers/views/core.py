@@ -1,5 +1,8 @@
+from functools import partial
+
 from django.views.generic import TemplateView
 from utils.api.client import MarketAccessAPIClient
+from utils.api.concurrency import optional
 from utils.metadata import get_metadata
 
 from .mixins import AnalyticsMixin, BarrierMixin
@@ -19,12 +22,21 @@ class Dashboard(AnalyticsMixin, TemplateView):
         context_data = super().get_context_data(**kwargs)
         active = self.request.GET.get("active", "barriers")
         client = MarketAccessAPIClient(self.request.session.get("sso_token"))
-        my_barriers_saved_search = client.saved_searches.get("my-barriers")
-        team_barriers_saved_search = client.saved_searches.get("team-barriers")
-        mentions = client.mentions.list()
-        draft_barriers = client.reports.list()
-        saved_searches = client.saved_searches.list()
-        notification_exclusion = client.notification_exclusion.get()
+        (
+            my_barriers_saved_search,
+            team_barriers_saved_search,
+            mentions,
+            draft_barriers,
+            saved_searches,
+            notification_exclusion,
+        ) = client.gather(
+            partial(client.saved_searches.get, "my-barriers"),
+            partial(client.saved_searches.get, "team-barriers"),
+            optional(client.mentions.list, default=[]),
+            client.reports.list,
+            optional(client.saved_searches.list, default=[]),
+            client.notification_exclusion.get,
+        )
 
         are_all_mentions_read: bool = not any(
             not mention.read_by_recipient for mention in mentions
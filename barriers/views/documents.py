@@ -1,11 +1,41 @@
 from http import HTTPStatus
 
+from django.conf import settings
 from django.http import JsonResponse
 from django.template.defaultfilters import filesizeformat
-from django.views.generic import FormView, RedirectView
+from django.urls import reverse
+from django.views.generic import FormView, RedirectView, View
 
 from utils.api.client import MarketAccessAPIClient
 from utils.exceptions import FileUploadError, ScanError
+from utils.uploads import (
+    UPLOAD_ERROR_MESSAGE,
+    UPLOAD_FAILED,
+    UPLOADING,
+    get_upload_status,
+)
+
+# Documents uploaded but not yet scanned. They are only added to the session
+# key of their note or assessment once scanned clean. Each has its own key so
+# scan status polls for different documents don't overwrite each other.
+PENDING_DOCUMENT_SESSION_KEY = "pending_document:{document_id}"
+
+
+def add_document_to_session(session, session_key, document, multi_document):
+    if multi_document:
+        documents = session.get(session_key, [])
+        documents.append(document)
+        session[session_key] = documents
+    else:
+        session[session_key] = document
+
+
+def get_pending_document_session_key(document_id):
+    return PENDING_DOCUMENT_SESSION_KEY.format(document_id=document_id)
+
+
+def pop_pending_document(session, document_id):
+    return session.pop(get_pending_document_session_key(document_id), None)
 
 
 class DownloadDocument(RedirectView):
@@ -16,14 +46,64 @@ class DownloadDocument(RedirectView):
         return data["document_url"]
 
 
+class DocumentScanStatus(View):
+    """
+    Cheap status check polled by the browser while a document is scanned.
+
+    Once the document is scanned clean it is added to the session, ready
+    to be saved with its note or assessment. If the scan fails it is
+    dropped.
+    """
+
+    def get(self, request, *args, **kwargs):
+        document_id = str(self.kwargs.get("document_id"))
+
+        upload_status = get_upload_status(document_id)
+        if upload_status == UPLOADING:
+            return JsonResponse({"status": "uploading"})
+        elif upload_status == UPLOAD_FAILED:
+            pop_pending_document(request.session, document_id)
+            return JsonResponse(
+                {"status": "failed", "message": UPLOAD_ERROR_MESSAGE},
+                status=HTTPStatus.INTERNAL_SERVER_ERROR,
+            )
+
+        try:
+            scanned = request.api_client.documents.get_scan_status(document_id)
+        except ScanError as e:
+            pop_pending_document(request.session, document_id)
+            return JsonResponse(
+                {"status": "failed", "message": str(e)},
+                status=HTTPStatus.UNAUTHORIZED,
+            )
+
+        if not scanned:
+            return JsonResponse({"status": "scanning"})
+
+        pending_document = pop_pending_document(request.session, document_id)
+        if pending_document is not None:
+            add_document_to_session(
+                request.session,
+                pending_document["session_key"],
+                pending_document["document"],
+                pending_document["multi_document"],
+            )
+        return JsonResponse({"status": "clean"})
+
+
 class AddDocumentAjaxView(FormView):
     """
     Base ajax view for uploading documents
+
+    With FILE_SCAN_ASYNC the response is returned as soon as the file is
+    uploaded and includes a scan_status_url for the browser to poll. The
+    document is held as pending until that reports it clean.
     """
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs["token"] = self.request.session.get("sso_token")
+        kwargs["wait_for_scan"] = not settings.FILE_SCAN_ASYNC
         return kwargs
 
     def form_valid(self, form):
@@ -40,18 +120,25 @@ class AddDocumentAjaxView(FormView):
                 status=HTTPStatus.UNAUTHORIZED,
             )
 
-        self.add_document_to_session(document, form.is_multi_document())
-
-        return JsonResponse(
-            {
-                "documentId": document["id"],
-                "delete_url": self.get_delete_url(document),
-                "file": {
-                    "name": document["file"]["name"],
-                    "size": filesizeformat(document["file"]["size"]),
-                },
-            }
-        )
+        if document.get("scanned", True):
+            self.add_document_to_session(document, form.is_multi_document())
+        else:
+            self.add_pending_document(document, form.is_multi_document())
+
+        data = {
+            "documentId": document["id"],
+            "delete_url": self.get_delete_url(document),
+            "file": {
+                "name": document["file"]["name"],
+                "size": filesizeformat(document["file"]["size"]),
+            },
+        }
+        if not document.get("scanned", True):
+            data["scan_status_url"] = reverse(
+                "barriers:document_scan_status",
+                kwargs={"document_id": document["id"]},
+            )
+        return JsonResponse(data)
 
     def get_session_key(self):
         raise NotImplementedError
@@ -59,19 +146,28 @@ class AddDocumentAjaxView(FormView):
     def get_delete_url(self, document):
         raise NotImplementedError
 
-    def add_document_to_session(self, document, multi_document):
-        session_key = self.get_session_key()
-        flat_document = {
+    def get_flat_document(self, document):
+        return {
             "id": document["id"],
             "name": document["file"]["name"],
             "size": document["file"]["size"],
         }
-        if multi_document:
-            documents = self.request.session.get(session_key, [])
-            documents.append(flat_document)
-            self.request.session[session_key] = documents
-        else:
-            self.request.session[session_key] = flat_document
+
+    def add_document_to_session(self, document, multi_document):
+        add_document_to_session(
+            self.request.session,
+            self.get_session_key(),
+            self.get_flat_document(document),
+            multi_document,
+        )
+
+    def add_pending_document(self, document, multi_document):
+        session_key = get_pending_document_session_key(document["id"])
+        self.request.session[session_key] = {
+            "session_key": self.get_session_key(),
+            "document": self.get_flat_document(document),
+            "multi_document": multi_document,
+        }
 
     def form_invalid(self, form):
         return JsonResponse(
@@ -94,8 +190,9 @@ class DeleteDocumentAjaxView(RedirectView):
 
     def delete_document_from_session(self):
         document_id = str(self.kwargs.get("document_id"))
+        pop_pending_document(self.request.session, document_id)
         session_key = self.get_session_key()
-        documents = self.request.session[session_key]
+        documents = self.request.session.get(session_key, [])
 
         self.request.session[session_key] = [
             document for document in documents if document["id"] != document_id
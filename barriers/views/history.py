@@ -1,21 +1,53 @@
+from django.conf import settings
 from django.views.generic import TemplateView
 
-from utils.api.client import MarketAccessAPIClient
+from barriers.models.history.base import prefetch_diffs
+from utils.diff_service import DiffBudget
 
 from .mixins import BarrierMixin
 
 
-class BarrierHistory(BarrierMixin, TemplateView):
-    template_name = "barriers/history.html"
+class BarrierHistoryMixin:
+    """
+    Loads one page of a barrier's history, newest first.
+    """
 
     def get_context_data(self, **kwargs):
         context_data = super().get_context_data(**kwargs)
-        context_data["history_items"] = self.get_full_history()
+        history_items = self.get_full_history()
+        context_data["history_items"] = history_items
+        context_data["next_cursor"] = history_items.next_cursor
         return context_data
 
     def get_full_history(self):
-        client = MarketAccessAPIClient(self.request.session.get("sso_token"))
+        client = self.request.api_client
         barrier_id = self.kwargs.get("barrier_id")
-        full_history = client.barriers.get_full_history(barrier_id=barrier_id)
-        full_history.sort(key=lambda object: object.date, reverse=True)
+        full_history = client.barriers.get_full_history(
+            barrier_id=barrier_id,
+            limit=settings.HISTORY_PAGE_SIZE,
+            before=self.request.GET.get("before"),
+        )
+        self.share_diff_budget(full_history)
         return full_history
+
+    def share_diff_budget(self, history_items):
+        """
+        Bound the time spent diffing the whole page rather than each item.
+        """
+        budget = DiffBudget(settings.DIFF_PAGE_BUDGET)
+        for item in history_items:
+            item.diff_budget = budget
+        if settings.DIFF_PROCESSES > 0:
+            prefetch_diffs(history_items, budget)
+
+
+class BarrierHistory(BarrierHistoryMixin, BarrierMixin, TemplateView):
+    template_name = "barriers/history.html"
+
+
+class BarrierHistoryItems(BarrierHistoryMixin, TemplateView):
+    """
+    Renders just the next page of history items, for "Load older changes".
+    """
+
+    template_name = "barriers/partials/history_items.html"
@@ -1,10 +1,12 @@
 import urllib.parse
+from functools import partial
 from http import HTTPStatus
 
 from django.http import Http404, HttpResponseRedirect
 from django.urls import reverse
 
 from utils.api.client import MarketAccessAPIClient
+from utils.api.concurrency import optional
 from utils.exceptions import APIHttpException
 
 
@@ -40,25 +42,29 @@ class BarrierMixin:
         return self._notes
 
     def get_barrier(self):
-        client = MarketAccessAPIClient(self.request.session.get("sso_token"))
         barrier_id = self.kwargs.get("barrier_id")
         try:
-            return client.barriers.get(id=barrier_id)
+            return self.request.api_client.barriers.get(id=barrier_id)
         except APIHttpException as e:
             if e.status_code == HTTPStatus.NOT_FOUND:
                 raise Http404()
             raise
 
     def get_interactions(self):
-        client = MarketAccessAPIClient(self.request.session.get("sso_token"))
-        activity = client.barriers.get_activity(barrier_id=self.barrier.id)
-        interactions = self.notes + activity
+        client = self.request.api_client
+        notes, activity = client.gather(
+            lambda: self.notes,
+            optional(
+                partial(client.barriers.get_activity, barrier_id=self.barrier.id),
+                default=[],
+            ),
+        )
+        interactions = notes + activity
         interactions.sort(key=lambda object: object.date, reverse=True)
         return interactions
 
     def get_notes(self):
-        client = MarketAccessAPIClient(self.request.session.get("sso_token"))
-        return client.notes.list(barrier_id=self.barrier.id)
+        return self.request.api_client.notes.list(barrier_id=self.barrier.id)
 
     def get_context_data(self, **kwargs):
         context_data = super().get_context_data(**kwargs)
@@ -100,8 +106,7 @@ class TeamMembersContextMixin:
 
     def get_team_members(self):
         if self._team_members is None:
-            client = MarketAccessAPIClient(self.request.session.get("sso_token"))
-            self._team_members = client.barriers.get_team_members(
+            self._team_members = self.request.api_client.barriers.get_team_members(
                 barrier_id=self.kwargs.get("barrier_id")
             )
 
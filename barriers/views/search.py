@@ -1,12 +1,18 @@
+import time
+from functools import partial
+
 from django.conf import settings
 from django.forms import Form
 from django.http import StreamingHttpResponse
 from django.shortcuts import redirect
+from django.utils.cache import patch_vary_headers
 from django.views.generic import FormView, View
 
 from utils.api.client import MarketAccessAPIClient
+from utils.api.concurrency import optional
 from utils.metadata import get_metadata
 from utils.pagination import PaginationMixin
+from utils.streaming import StreamingExport, accepts_gzip, log_export_prepared
 from utils.tools import nested_sort
 
 from ..forms.search import BarrierSearchForm
@@ -65,10 +71,9 @@ class BarrierSearch(PaginationMixin, SearchFormView):
         return context_data
 
     def get_barriers(self, form):
-        return self.client.barriers.list(
+        return self.client.barriers.search(
             ordering="-reported_on",
-            limit=self.get_pagination_limit(),
-            offset=self.get_pagination_offset(),
+            **self.get_pagination_params(),
             **form.get_api_search_parameters(),
         )
 
@@ -86,7 +91,7 @@ class BarrierSearch(PaginationMixin, SearchFormView):
 
     def get_saved_search_context_data(self, form):
         context_data = {}
-        saved_search = self.get_saved_search(form)
+        saved_search = optional(partial(self.get_saved_search, form))()
         if saved_search:
             context_data["saved_search"] = saved_search
             form_filters = form.get_raw_filters()
@@ -103,7 +108,11 @@ class BarrierSearch(PaginationMixin, SearchFormView):
     def update_context_data_for_member(self, context_data, form):
         member_id = form.cleaned_data.get("member")
         if member_id:
-            member = self.client.barriers.get_team_member(member_id)
+            member = optional(
+                partial(self.client.barriers.get_team_member, member_id)
+            )()
+            if member is None:
+                return context_data
             context_data["filters"]["member"]["readable_value"] = member["user"][
                 "full_name"
             ]
@@ -132,7 +141,10 @@ class BarrierSearch(PaginationMixin, SearchFormView):
 class DownloadBarriers(SearchFormMixin, View):
     form_class = BarrierSearchForm
 
+    export_name = "barriers"
+
     def get(self, request, *args, **kwargs):
+        started_at = time.monotonic()
         form = self.form_class(**self.get_form_kwargs())
         form.full_clean()
         search_parameters = form.get_api_search_parameters()
@@ -143,13 +155,27 @@ class DownloadBarriers(SearchFormMixin, View):
             download_url = client.barriers.get_csv(
                 ordering="-reported_on", **search_parameters
             )
+            log_export_prepared(self.export_name, started_at, mode="s3")
             return redirect(download_url)
 
         file = client.barriers.get_streamed_csv(
             ordering="-reported_on", **search_parameters
         )
+        log_export_prepared(self.export_name, started_at, mode="stream")
+
+        compress = settings.CSV_DOWNLOAD_GZIP and accepts_gzip(request)
+        export = StreamingExport(
+            name=self.export_name,
+            response=file,
+            chunk_size=settings.CSV_DOWNLOAD_CHUNK_SIZE,
+            compress=compress,
+            started_at=started_at,
+        )
         response = StreamingHttpResponse(
-            file.iter_content(), content_type=file.headers["Content-Type"]
+            export, content_type=file.headers["Content-Type"]
         )
         response["Content-Disposition"] = file.headers["Content-Disposition"]
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
         return response
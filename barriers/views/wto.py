@@ -4,7 +4,11 @@ from django.views.generic import FormView, RedirectView
 from barriers.forms.wto import WTODocumentForm, WTOProfileForm, WTOStatusForm
 from utils.metadata import get_metadata
 
-from .documents import AddDocumentAjaxView, DeleteDocumentAjaxView
+from .documents import (
+    AddDocumentAjaxView,
+    DeleteDocumentAjaxView,
+    pop_pending_document,
+)
 from .mixins import APIBarrierFormViewMixin, SessionDocumentMixin
 
 
@@ -162,6 +166,7 @@ class DeleteWTODocument(DeleteDocumentAjaxView):
     def delete_document_from_session(self):
         barrier_id = str(self.kwargs.get("barrier_id"))
         document_id = str(self.kwargs.get("document_id"))
+        pop_pending_document(self.request.session, document_id)
 
         for session_key in (
             f"barrier:{barrier_id}:wto:committee_notification_document",
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/3.0/ref/settings/
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 import sentry_sdk
@@ -83,7 +84,7 @@ THIRD_PARTY_APPS = [
 
 LOCAL_APPS = [
     "authentication",
-    "barriers",
+    "barriers.apps.BarriersConfig",
     "core",
     "healthcheck",
     "reports",
@@ -96,9 +97,12 @@ if ELASTIC_APM_ENABLED:
     INSTALLED_APPS.append("elasticapm.contrib.django")
 
 MIDDLEWARE = [
+    "healthcheck.middleware.ServerTimingMiddleware",
+    "utils.middleware.RequestDeadlineMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "utils.middleware.APIClientMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -204,9 +208,37 @@ STATICFILES_FINDERS = (
 TRUSTED_USER_TOKEN = "ssobypass"
 
 USER_DATA_CACHE_TIME = 3600
-METADATA_CACHE_TIME = "10600"
+# Metadata is refreshed in the background after METADATA_CACHE_TIME, and a
+# stale copy is served for up to METADATA_STALE_TIME longer while it is
+METADATA_CACHE_TIME = env.int("METADATA_CACHE_TIME", default=10600)
+METADATA_STALE_TIME = env.int("METADATA_STALE_TIME", default=3600)
+# Longest time one process may spend refreshing the metadata for the others
+METADATA_REFRESH_LOCK_TIMEOUT = env.int("METADATA_REFRESH_LOCK_TIMEOUT", default=60)
+METADATA_VERSION_CHECK_INTERVAL = env.int("METADATA_VERSION_CHECK_INTERVAL", default=5)
+# Shared cache of rarely changing API resources, in seconds (0 disables)
+COMMODITIES_CACHE_TIME = env.int("COMMODITIES_CACHE_TIME", default=86400)
+GROUPS_CACHE_TIME = env.int("GROUPS_CACHE_TIME", default=600)
+# How long a stale entry may be served while it is revalidated
+API_CACHE_STALE_TIME = env.int("API_CACHE_STALE_TIME", default=600)
+
+# History diffs: time allowed per diff and per page (seconds), how long to
+# cache them for and how many processes to diff a page's items in (0 = off)
+DIFF_TIMEOUT = env.float("DIFF_TIMEOUT", default=1.0)
+DIFF_PAGE_BUDGET = env.float("DIFF_PAGE_BUDGET", default=2.0)
+DIFF_CACHE_TIME = env.int("DIFF_CACHE_TIME", default=7 * 86400)
+DIFF_PROCESSES = env.int("DIFF_PROCESSES", default=0)
+# Number of changes shown per page of barrier history
+HISTORY_PAGE_SIZE = env.int("HISTORY_PAGE_SIZE", default=50)
+# Per user cache of barrier search results (seconds, 0 disables) and whether
+# to fetch the next page of results in the background
+BARRIER_SEARCH_CACHE_TIME = env.int("BARRIER_SEARCH_CACHE_TIME", default=60)
+BARRIER_SEARCH_PREFETCH = env.bool("BARRIER_SEARCH_PREFETCH", default=False)
+
 MOCK_METADATA = False
 USE_S3_FOR_CSV_DOWNLOADS = env("USE_S3_FOR_CSV_DOWNLOADS", default=True)
+# Streamed (non S3) CSV downloads
+CSV_DOWNLOAD_CHUNK_SIZE = env.int("CSV_DOWNLOAD_CHUNK_SIZE", default=64 * 1024)
+CSV_DOWNLOAD_GZIP = env.bool("CSV_DOWNLOAD_GZIP", default=True)
 
 # CACHE / REDIS
 # Try to read from PaaS service env vars first
@@ -223,9 +255,22 @@ if REDIS_URI:
             "BACKEND": "django_redis.cache.RedisCache",
             "LOCATION": REDIS_URI,
             "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
-        }
+        },
+        "sessions": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URI,
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        },
     }
 
+# Sessions live in redis rather than the database, see utils.session_engine
+SESSION_ENGINE = "utils.session_engine"
+SESSION_CACHE_ALIAS = "sessions"
+# Compress session data at or over this many bytes
+SESSION_COMPRESS_MIN_SIZE = env.int("SESSION_COMPRESS_MIN_SIZE", default=1024)
+# Log sessions bigger than this many bytes along with their largest keys
+SESSION_SIZE_WARNING = env.int("SESSION_SIZE_WARNING", default=32 * 1024)
+
 # Market access API
 MARKET_ACCESS_API_URI = env("MARKET_ACCESS_API_URI")
 MARKET_ACCESS_API_HAWK_ID = env("MARKET_ACCESS_API_HAWK_ID")
@@ -256,9 +301,77 @@ FILE_SCAN_MAX_WAIT_TIME = env.int("FILE_SCAN_MAX_WAIT_TIME", default=30000)
 FILE_SCAN_STATUS_CHECK_INTERVAL = env.int(
     "FILE_SCAN_STATUS_CHECK_INTERVAL", default=500
 )
+FILE_SCAN_MAX_CHECK_INTERVAL = env.int("FILE_SCAN_MAX_CHECK_INTERVAL", default=4000)
+FILE_SCAN_BACKOFF_FACTOR = env.float("FILE_SCAN_BACKOFF_FACTOR", default=2)
+# Return ajax uploads straight away and let the browser poll for the scan result
+FILE_SCAN_ASYNC = env.bool("FILE_SCAN_ASYNC", default=True)
+
+# Uploads to S3 are streamed in chunks and retried on connection errors or 5xx
+S3_UPLOAD_CHUNK_SIZE = env.int("S3_UPLOAD_CHUNK_SIZE", default=64 * 1024)
+S3_UPLOAD_RETRIES = env.int("S3_UPLOAD_RETRIES", default=2)
+S3_UPLOAD_RETRY_DELAY = env.float("S3_UPLOAD_RETRY_DELAY", default=0.5)
+# Upload ajax documents from a per-worker background pool
+S3_UPLOAD_IN_BACKGROUND = env.bool("S3_UPLOAD_IN_BACKGROUND", default=False)
+S3_UPLOAD_WORKERS = env.int("S3_UPLOAD_WORKERS", default=4)
 ALLOWED_FILE_TYPES = env.list("ALLOWED_FILE_TYPES", default=["text/csv", "image/jpeg"])
 
 API_RESULTS_LIMIT = env.int("API_RESULTS_LIMIT", default=100)
+# Send the time spent on upstream calls per service to the browser. Off
+# outside DEBUG as it tells any client how the backend is doing
+SERVER_TIMING_HEADER = env.bool("SERVER_TIMING_HEADER", default=DEBUG)
+# Metrics for /metrics. Each worker writes its own file to METRICS_DIR at
+# most every METRICS_FLUSH_INTERVAL seconds, which are added up when scraped
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=True)
+METRICS_DIR = env(
+    "METRICS_DIR", default=os.path.join(tempfile.gettempdir(), "market_access_metrics")
+)
+METRICS_FLUSH_INTERVAL = env.int("METRICS_FLUSH_INTERVAL", default=10)
+# Number of sampled values kept per worker for percentiles
+METRICS_RESERVOIR_SIZE = env.int("METRICS_RESERVOIR_SIZE", default=1000)
+
+# Outbound HTTP connection pool, shared by all upstream clients in a process
+# HTTP_POOL_CONNECTIONS - number of per-host pools to keep
+# HTTP_POOL_MAXSIZE - max connections kept open to a single host
+# HTTP_POOL_BLOCK - wait for a free connection instead of opening extra ones
+HTTP_POOL_CONNECTIONS = env.int("HTTP_POOL_CONNECTIONS", default=10)
+HTTP_POOL_MAXSIZE = env.int("HTTP_POOL_MAXSIZE", default=50)
+HTTP_POOL_BLOCK = env.bool("HTTP_POOL_BLOCK", default=False)
+HTTP_KEEP_ALIVE = env.bool("HTTP_KEEP_ALIVE", default=True)
+
+# Upstream timeouts in seconds. API_READ_TIMEOUTS overrides the read timeout
+# for API paths starting with the given resource or path.
+UPSTREAM_CONNECT_TIMEOUT = env.float("UPSTREAM_CONNECT_TIMEOUT", default=3.05)
+API_READ_TIMEOUT = env.float("API_READ_TIMEOUT", default=15)
+API_READ_TIMEOUTS = {
+    "barriers/export": 60,
+    "barriers/s3-download": 60,
+    "metadata": 30,
+}
+DATAHUB_READ_TIMEOUT = env.float("DATAHUB_READ_TIMEOUT", default=10)
+SSO_READ_TIMEOUT = env.float("SSO_READ_TIMEOUT", default=10)
+# GETs to the API are retried at most API_MAX_RETRIES times, and only while
+# retries make up less than API_RETRY_BUDGET_RATIO of calls in this worker
+API_MAX_RETRIES = env.int("API_MAX_RETRIES", default=2)
+API_RETRY_BACKOFF = env.float("API_RETRY_BACKOFF", default=0.1)
+API_RETRY_BUDGET_RATIO = env.float("API_RETRY_BUDGET_RATIO", default=0.1)
+API_RETRY_BUDGET_MAX = env.int("API_RETRY_BUDGET_MAX", default=10)
+# Stop calling the API for a while after this many failures in a row
+API_BREAKER_FAILURE_THRESHOLD = env.int("API_BREAKER_FAILURE_THRESHOLD", default=5)
+API_BREAKER_RECOVERY_TIME = env.float("API_BREAKER_RECOVERY_TIME", default=10)
+
+# Seconds a request may spend on upstream calls, by url name. Upstream
+# timeouts are shrunk to fit what is left. None means no deadline.
+REQUEST_BUDGET = env.float("REQUEST_BUDGET", default=30)
+REQUEST_BUDGETS = {
+    "barriers:dashboard": 10,
+    "barriers:barrier_detail": 10,
+    "barriers:search": 10,
+    "barriers:find_a_barrier": 10,
+    "barriers:download": None,
+}
+
+# Max number of independent API calls a view may run at the same time
+API_MAX_CONCURRENT_CALLS = env.int("API_MAX_CONCURRENT_CALLS", default=6)
 
 # Logging
 # ============================================
@@ -8,6 +8,8 @@ TEST_RUNNER = "config.testrunner.PytestTestRunner"
 
 MOCK_METADATA = True
 
+METRICS_ENABLED = False
+
 WHITENOISE_AUTOREFRESH = True
 
 STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
@@ -19,7 +21,11 @@ PASSWORD_HASHERS = [
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.dummy.DummyCache",
-    }
+    },
+    "sessions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sessions",
+    },
 }
 
 # Overrides to be able to run individual tests from PyCharm
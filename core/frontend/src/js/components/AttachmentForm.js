@@ -4,6 +4,10 @@ ma.components.AttachmentForm = (function( jessie ){
 
 	var bind = jessie.bind;
 
+	var SCAN_POLL_INITIAL_DELAY = 500;
+	var SCAN_POLL_MAX_DELAY = 4000;
+	var SCAN_POLL_MAX_WAIT = 60000;
+
 	function AttachmentForm( fileUpload, attachments, submitButton, multiDocument=true ){
 
 		if( !fileUpload ){ throw new Error( 'fileUpload is required' ); }
@@ -73,15 +77,15 @@ ma.components.AttachmentForm = (function( jessie ){
 
 			if( documentId && file ){
 
-				this.submitButton.disabled = false;
-				this.fileUpload.showLink();
-				var item = {
-					id: documentId,
-					delete_url: data.delete_url,
-					name: file.name,
-					size: file.size
-				};
-				this.attachments.addItem( item, this.multiDocument );
+				if( data.scan_status_url ){
+
+					this.fileUpload.setProgress( 'scanning file for viruses...' );
+					this.pollScanStatus( data, SCAN_POLL_INITIAL_DELAY, Date.now() );
+
+				} else {
+
+					this.documentReady( data );
+				}
 
 			} else {
 
@@ -99,6 +103,83 @@ ma.components.AttachmentForm = (function( jessie ){
 		}
 	};
 
+	AttachmentForm.prototype.documentReady = function( data ){
+
+		this.submitButton.disabled = false;
+		this.fileUpload.showLink();
+		var item = {
+			id: data.documentId,
+			delete_url: data.delete_url,
+			name: data.file.name,
+			size: data.file.size
+		};
+		this.attachments.addItem( item, this.multiDocument );
+	};
+
+	AttachmentForm.prototype.scanFailed = function( data, message ){
+
+		this.removeDocument( data.delete_url );
+		this.showError( message || 'Unable to virus scan the file, try again.' );
+	};
+
+	AttachmentForm.prototype.pollScanStatus = function( data, delay, startedAt ){
+
+		var self = this;
+
+		window.setTimeout( function(){
+
+			var xhr = ma.xhr2();
+
+			xhr.addEventListener( 'error', function(){ self.scanFailed( data ); }, false );
+			xhr.addEventListener( 'load', function(){
+
+				var status;
+
+				try {
+
+					status = JSON.parse( xhr.response );
+
+				} catch( e ){
+
+					status = {};
+				}
+
+				if( xhr.status === 200 && status.status === 'clean' ){
+
+					self.documentReady( data );
+
+				} else if( xhr.status === 200 && ( status.status === 'scanning' || status.status === 'uploading' ) ){
+
+					if( ( Date.now() - startedAt ) > SCAN_POLL_MAX_WAIT ){
+
+						self.scanFailed( data, 'Virus scan took too long' );
+
+					} else {
+
+						self.pollScanStatus( data, Math.min( delay * 2, SCAN_POLL_MAX_DELAY ), startedAt );
+					}
+
+				} else {
+
+					self.scanFailed( data, status.message );
+				}
+			}, false );
+
+			xhr.open( 'GET', data.scan_status_url, true );
+			xhr.send();
+
+		}, delay );
+	};
+
+	AttachmentForm.prototype.removeDocument = function( deleteUrl ){
+
+		var xhr = ma.xhr2();
+
+		xhr.open( 'POST', deleteUrl, true );
+		xhr.setRequestHeader("X-CSRFToken", csrftoken);
+		xhr.send();
+	};
+
 	AttachmentForm.prototype.newFile = function( fieldName, file ){
 		var xhr2 = ma.xhr2();
 		var formData = new FormData();
@@ -125,12 +206,7 @@ ma.components.AttachmentForm = (function( jessie ){
 	AttachmentForm.prototype.deleteDocument = function( documentId, deleteUrl ){
 		if( !documentId ){ return; }
 
-		var xhr = ma.xhr2();
-
-		xhr.open( 'POST', deleteUrl, true );
-		xhr.setRequestHeader("X-CSRFToken", csrftoken);
-		xhr.send();
-
+		this.removeDocument( deleteUrl );
 		this.attachments.removeItem( documentId );
 	};
 
@@ -0,0 +1,63 @@
+ma.components.LoadMore = (function( jessie ){
+
+	if( !( ma.xhr2 && jessie.hasFeatures( 'attachListener', 'bind', 'cancelDefault' ) ) ){ return; }
+
+	var LOAD_MORE_CLASS = 'js-load-more';
+
+	function LoadMore( container ){
+
+		if( !container ){ return; }
+
+		this.container = container;
+		this.loading = false;
+
+		jessie.attachListener( container, 'click', jessie.bind( this.handleClick, this ) );
+	}
+
+	LoadMore.prototype.handleClick = function( e ){
+
+		var link = e.target;
+		var paragraph = link.parentNode;
+
+		if( !( link.getAttribute( 'data-url' ) && paragraph.className.indexOf( LOAD_MORE_CLASS ) !== -1 ) ){ return; }
+
+		jessie.cancelDefault( e );
+
+		if( this.loading ){ return; }
+
+		this.loading = true;
+		link.innerText = 'Loading...';
+		this.load( link.getAttribute( 'data-url' ), link, paragraph );
+	};
+
+	LoadMore.prototype.load = function( url, link, paragraph ){
+
+		var self = this;
+		var xhr = ma.xhr2();
+
+		xhr.addEventListener( 'load', function(){
+
+			self.loading = false;
+
+			if( xhr.status === 200 ){
+
+				paragraph.parentNode.removeChild( paragraph );
+				self.container.insertAdjacentHTML( 'beforeend', xhr.response );
+
+			} else {
+
+				// Fall back to loading the full page
+				window.location.href = link.href;
+			}
+		}, false );
+
+		xhr.addEventListener( 'error', function(){ window.location.href = link.href; }, false );
+
+		xhr.open( 'GET', url, true );
+		xhr.setRequestHeader( 'X-Requested-With', 'XMLHttpRequest' );
+		xhr.send();
+	};
+
+	return LoadMore;
+
+}( jessie ));
@@ -62,6 +62,7 @@ const main_js = () => {
         `${assetsSrcPath}js/components/DeleteModal.js`,
         `${assetsSrcPath}js/components/ToggleBox.js`,
         `${assetsSrcPath}js/components/AttachmentForm.js`,
+        `${assetsSrcPath}js/components/LoadMore.js`,
         `${assetsSrcPath}js/pages/index.js`,
         `${assetsSrcPath}js/pages/report/index.js`,
         `${assetsSrcPath}js/pages/report/is-resolved.js`,
@@ -1,8 +1,10 @@
-import requests
 from django.conf import settings
 from mohawk import Sender
 from sentry_sdk import capture_exception
 
+from utils.api.resilience import get_timeout
+from utils.api.transport import get_session
+
 from .constants import HealthStatus
 from .models import HealthCheck
 
@@ -34,13 +36,14 @@ def api_check():
     )
 
     try:
-        response = requests.get(
+        response = get_session().get(
             url,
             verify=not settings.DEBUG,
             headers={
                 "Authorization": sender.request_header,
                 "Content-Type": "text/plain",
             },
+            timeout=get_timeout("check"),
         )
         response.raise_for_status()
         response_data = response.json()
@@ -1,18 +1,65 @@
+import json
+import logging
 import time
 
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from utils.metrics import observe_request
+from utils.upstream import record_calls
+
+logger = logging.getLogger(__name__)
 
-class StatsMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
 
+class StatsMiddleware(MiddlewareMixin):
     def process_request(self, request):
-        """ Start time at request coming in """
+        """Start time at request coming in"""
         request.start_time = time.time()
 
     def process_response(self, request, response):
-        """ End of request, take time """
+        """End of request, take time"""
         total = time.time() - request.start_time
 
         # Add the header.
         response["X-Response-Time-Duration-ms"] = int(total * 1000)
         return response
+
+
+class ServerTimingMiddleware:
+    """
+    Times each request and the upstream calls made while handling it.
+
+    The time spent per upstream service (API, Redis, SSO, Data Hub...) and
+    in total is sent in a Server-Timing header. Requests that made upstream
+    calls are logged with the calls grouped by endpoint, slowest first, as
+    a JSON message since the ECS formatter drops any extra fields.
+    The timings are also recorded for the /metrics endpoint.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started_at = time.monotonic()
+        with record_calls() as recorder:
+            response = self.get_response(request)
+        duration = time.monotonic() - started_at
+
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = recorder.get_server_timing(duration)
+        if recorder.calls:
+            self.log_calls(request, response, recorder, duration)
+        observe_request(request, response, recorder, duration)
+        return response
+
+    def log_calls(self, request, response, recorder, duration):
+        metrics = {
+            "event": "upstream_calls",
+            "method": request.method,
+            "path": request.path,
+            "status_code": response.status_code,
+            "duration_ms": round(duration * 1000, 1),
+            "upstream": recorder.get_services(),
+            "endpoints": recorder.get_endpoints(),
+        }
+        logger.info(json.dumps(metrics))
@@ -2,7 +2,7 @@ from django.urls import path
 from django.utils.decorators import decorator_from_middleware
 
 from .middleware import StatsMiddleware
-from .views import APIHealthCheckView, HealthCheckView
+from .views import APIHealthCheckView, HealthCheckView, MetricsView
 
 app_name = "healthcheck"
 
@@ -17,4 +17,5 @@ urlpatterns = [
         decorator_from_middleware(StatsMiddleware)(APIHealthCheckView.as_view()),
         name="check-api",
     ),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
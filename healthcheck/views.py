@@ -1,9 +1,11 @@
 import time
 
-from django.views.generic import TemplateView
+from django.http import HttpResponse
+from django.views.generic import TemplateView, View
 
 from authentication.decorators import public_view
 from healthcheck.constants import HealthStatus
+from utils.metrics import collect
 
 from .checks import api_check, db_check
 
@@ -13,7 +15,7 @@ class HealthCheckView(TemplateView):
     template_name = "healthcheck.html"
 
     def get_context_data(self, **kwargs):
-        """ Adds status and response time to response context """
+        """Adds status and response time to response context"""
         context = super().get_context_data(**kwargs)
         context["status"] = db_check()
         # nearest approximation of a response time
@@ -26,10 +28,20 @@ class APIHealthCheckView(TemplateView):
     template_name = "healthcheck.html"
 
     def get_context_data(self, **kwargs):
-        """ Adds status and response time to response context """
+        """Adds status and response time to response context"""
         context = super().get_context_data(**kwargs)
         fe_response_time = time.time() - self.request.start_time
         data = api_check()
         context["status"] = data.get("status") or HealthStatus.FAIL
         context["response_time"] = data.get("duration") or fe_response_time
         return context
+
+
+@public_view
+class MetricsView(View):
+    """
+    Metrics from every worker on this host in the Prometheus text format.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(collect(), content_type="text/plain; version=0.0.4")
@@ -1,10 +1,10 @@
 import operator
 
-import dateutil.parser
+from django.utils.functional import cached_property
 
 from barriers.constants import STATUSES
 from utils.metadata import get_metadata
-from utils.models import APIModel
+from utils.models import APIModel, parse_datetime
 
 
 class Report(APIModel):
@@ -30,9 +30,9 @@ class Report(APIModel):
             return "In part"
         return "No"
 
-    @property
+    @cached_property
     def created_on(self):
-        return dateutil.parser.parse(self.data["created_on"])
+        return parse_datetime(self.data["created_on"])
 
     @property
     def progress(self):
@@ -2,6 +2,7 @@ from http import HTTPStatus
 
 import mock
 from django.conf import settings
+from django.test import override_settings
 from django.urls import reverse
 from mock import patch
 
@@ -9,6 +10,7 @@ from core.tests import MarketAccessTestCase
 from utils.exceptions import FileUploadError, ScanError
 
 
+@override_settings(FILE_SCAN_ASYNC=False)
 class EconomicAssessmentDocumentsTestCase(MarketAccessTestCase):
     @patch("utils.api.client.DocumentsResource.check_scan_status")
     @patch("utils.api.client.DocumentsResource.complete_upload")
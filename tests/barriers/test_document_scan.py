@@ -0,0 +1,233 @@
+from http import HTTPStatus
+
+from django.test import override_settings
+from django.urls import reverse
+from mock import patch
+
+from core.tests import MarketAccessTestCase
+from utils.api.client import MarketAccessAPIClient
+from utils.api.deadline import request_deadline
+from utils.exceptions import APIDeadlineExceededException, ScanError
+
+
+class DocumentScanTestCase(MarketAccessTestCase):
+    document_id = "38ab3bed-fc19-4770-9c12-9e26667efbc5"
+
+    @property
+    def session_key(self):
+        return f"barrier:{self.barrier['id']}:note:new:documents"
+
+    @property
+    def pending_key(self):
+        return f"pending_document:{self.document_id}"
+
+    @override_settings(FILE_SCAN_ASYNC=True)
+    @patch("utils.api.client.DocumentsResource.check_scan_status")
+    @patch("utils.api.client.DocumentsResource.complete_upload")
+    @patch("barriers.forms.mixins.DocumentMixin.upload_to_s3")
+    @patch("utils.api.client.DocumentsResource.create")
+    def test_async_upload_returns_before_scan(
+        self,
+        mock_create_document,
+        mock_upload_to_s3,
+        mock_complete_upload,
+        mock_check_scan_status,
+    ):
+        mock_create_document.return_value = {
+            "id": self.document_id,
+            "signed_upload_url": "someurl",
+        }
+
+        with open("tests/files/attachment.jpeg", "rb") as document:
+            response = self.client.post(
+                reverse(
+                    "barriers:add_note_document",
+                    kwargs={"barrier_id": self.barrier["id"]},
+                ),
+                data={"document": document},
+                xhr=True,
+            )
+
+        assert response.status_code == HTTPStatus.OK
+        response_data = response.json()
+        assert response_data["documentId"] == self.document_id
+        assert response_data["scan_status_url"] == reverse(
+            "barriers:document_scan_status",
+            kwargs={"document_id": self.document_id},
+        )
+        mock_complete_upload.assert_called_with(self.document_id)
+        assert mock_check_scan_status.called is False
+        # Not usable until the scan says it's clean
+        assert self.client.session.get(self.session_key) is None
+        assert self.pending_key in self.client.session
+
+    def add_pending_document(self):
+        session = self.client.session
+        session[self.pending_key] = {
+            "session_key": self.session_key,
+            "document": {"id": self.document_id, "name": "a.jpeg", "size": 1},
+            "multi_document": True,
+        }
+        session.save()
+
+    @patch("utils.api.client.DocumentsResource.get_scan_status")
+    def test_document_added_to_session_once_clean(self, mock_get_scan_status):
+        self.add_pending_document()
+        url = reverse(
+            "barriers:document_scan_status",
+            kwargs={"document_id": self.document_id},
+        )
+
+        mock_get_scan_status.return_value = False
+        self.client.get(url)
+        assert self.client.session.get(self.session_key) is None
+
+        mock_get_scan_status.return_value = True
+        self.client.get(url)
+        assert self.client.session[self.session_key] == [
+            {"id": self.document_id, "name": "a.jpeg", "size": 1}
+        ]
+        assert self.pending_key not in self.client.session
+
+    @patch("utils.api.client.DocumentsResource.get_scan_status")
+    def test_other_pending_documents_are_kept(self, mock_get_scan_status):
+        other_key = "pending_document:0f5c5d2e-6a4b-4f0e-9a7c-1d2e3f4a5b6c"
+        session = self.client.session
+        session[other_key] = {"session_key": self.session_key}
+        session.save()
+        self.add_pending_document()
+
+        mock_get_scan_status.return_value = True
+        self.client.get(
+            reverse(
+                "barriers:document_scan_status",
+                kwargs={"document_id": self.document_id},
+            )
+        )
+        assert self.pending_key not in self.client.session
+        assert other_key in self.client.session
+
+    @patch("utils.api.client.DocumentsResource.get_scan_status")
+    def test_infected_document_is_dropped(self, mock_get_scan_status):
+        self.add_pending_document()
+        mock_get_scan_status.side_effect = ScanError("Infected")
+        response = self.client.get(
+            reverse(
+                "barriers:document_scan_status",
+                kwargs={"document_id": self.document_id},
+            )
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert self.client.session.get(self.session_key) is None
+        assert self.pending_key not in self.client.session
+
+    @patch("utils.api.client.DocumentsResource.get_scan_status")
+    def test_scan_status(self, mock_get_scan_status):
+        url = reverse(
+            "barriers:document_scan_status",
+            kwargs={"document_id": self.document_id},
+        )
+
+        mock_get_scan_status.return_value = False
+        response = self.client.get(url)
+        assert response.json() == {"status": "scanning"}
+
+        mock_get_scan_status.return_value = True
+        response = self.client.get(url)
+        assert response.json() == {"status": "clean"}
+        mock_get_scan_status.assert_called_with(self.document_id)
+
+        with patch("barriers.views.documents.get_upload_status") as mock_status:
+            mock_status.return_value = "uploading"
+            response = self.client.get(url)
+            assert response.json() == {"status": "uploading"}
+
+        mock_get_scan_status.side_effect = ScanError("Scan failed")
+        response = self.client.get(url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.json() == {"status": "failed", "message": "Scan failed"}
+
+    @override_settings(
+        FILE_SCAN_MAX_WAIT_TIME=10000,
+        FILE_SCAN_STATUS_CHECK_INTERVAL=500,
+        FILE_SCAN_MAX_CHECK_INTERVAL=2000,
+        FILE_SCAN_BACKOFF_FACTOR=2,
+    )
+    @patch("utils.api.resources.time.sleep")
+    @patch("utils.api.client.MarketAccessAPIClient.post")
+    def test_check_scan_status_backs_off(self, mock_post, mock_sleep):
+        mock_post.side_effect = [{"status": "virus_scanning_scheduled"}] * 4 + [
+            {"status": "virus_scanned", "av_clean": True}
+        ]
+        MarketAccessAPIClient("token").documents.check_scan_status(self.document_id)
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        assert delays == [0.5, 1, 2, 2]
+
+    @patch("utils.api.client.MarketAccessAPIClient.post")
+    def test_get_scan_status_infected(self, mock_post):
+        mock_post.return_value = {"status": "virus_scanned", "av_clean": False}
+        with self.assertRaises(ScanError):
+            MarketAccessAPIClient("token").documents.get_scan_status(self.document_id)
+
+    @override_settings(FILE_SCAN_MAX_WAIT_TIME=30000)
+    @patch("utils.api.client.MarketAccessAPIClient.post")
+    def test_scan_wait_stops_at_request_deadline(self, mock_post):
+        mock_post.return_value = {"status": "virus_scanning_scheduled"}
+        clock = [100]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        with patch("time.monotonic", lambda: clock[0]), patch("time.sleep", sleep):
+            with request_deadline(5):
+                with self.assertRaisesRegex(ScanError, "took too long"):
+                    MarketAccessAPIClient("token").documents.check_scan_status(
+                        self.document_id
+                    )
+        assert clock[0] == 105
+
+    @override_settings(FILE_SCAN_ASYNC=False)
+    @patch("utils.api.client.MarketAccessAPIClient.post")
+    @patch("utils.api.client.DocumentsResource.complete_upload")
+    @patch("barriers.forms.mixins.DocumentMixin.upload_to_s3")
+    @patch("utils.api.client.DocumentsResource.create")
+    @patch("utils.api.client.NotesResource.create")
+    def test_upload_past_deadline_is_a_form_error(
+        self,
+        mock_create_note,
+        mock_create_document,
+        mock_upload_to_s3,
+        mock_complete_upload,
+        mock_post,
+    ):
+        mock_create_document.return_value = {
+            "id": self.document_id,
+            "signed_upload_url": "someurl",
+        }
+        mock_post.side_effect = APIDeadlineExceededException("Out of time")
+
+        with open("tests/files/attachment.jpeg", "rb") as document:
+            response = self.client.post(
+                reverse("barriers:add_note", kwargs={"barrier_id": self.barrier["id"]}),
+                data={"note": "New note", "document": document},
+            )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["form"].errors["document"] == [
+            "Virus scan took too long"
+        ]
+        assert mock_create_note.called is False
+
+    @override_settings(FILE_SCAN_ASYNC=False)
+    @patch("utils.api.client.DocumentsResource.create")
+    def test_upload_out_of_time_is_a_form_error(self, mock_create_document):
+        mock_create_document.side_effect = APIDeadlineExceededException("Out of time")
+
+        with open("tests/files/attachment.jpeg", "rb") as document:
+            response = self.client.post(
+                reverse("barriers:add_note", kwargs={"barrier_id": self.barrier["id"]}),
+                data={"note": "New note", "document": document},
+            )
+
+        assert response.status_code == HTTPStatus.OK
+        assert "document" in response.context["form"].errors
@@ -1,7 +1,9 @@
+import gzip
 from http import HTTPStatus
 
+from django.test import override_settings
 from django.urls import reverse
-from mock import patch
+from mock import Mock, patch
 
 from core.tests import MarketAccessTestCase
 
@@ -53,3 +55,40 @@ class DownloadBarriersTestCase(MarketAccessTestCase):
             archived="0",
             ordering="-reported_on",
         )
+
+    @override_settings(USE_S3_FOR_CSV_DOWNLOADS=False, CSV_DOWNLOAD_CHUNK_SIZE=4)
+    @patch("utils.api.client.BarriersResource.get_streamed_csv")
+    def test_stream_barriers(self, mock_get_streamed_csv):
+        mock_get_streamed_csv.return_value = self.mock_csv_response()
+        response = self.client.get(reverse("barriers:download"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Disposition"] == "attachment; filename=a.csv"
+        assert "Content-Encoding" not in response
+        assert b"".join(response.streaming_content) == b"id,title\n1,Test\n"
+
+        file = mock_get_streamed_csv.return_value
+        file.iter_content.assert_called_with(chunk_size=4)
+        file.close.assert_called_once()
+
+    @override_settings(USE_S3_FOR_CSV_DOWNLOADS=False)
+    @patch("utils.api.client.BarriersResource.get_streamed_csv")
+    def test_stream_barriers_gzipped(self, mock_get_streamed_csv):
+        mock_get_streamed_csv.return_value = self.mock_csv_response()
+        response = self.client.get(
+            reverse("barriers:download"), HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        content = gzip.decompress(b"".join(response.streaming_content))
+        assert content == b"id,title\n1,Test\n"
+
+    def mock_csv_response(self):
+        file = Mock()
+        file.headers = {
+            "Content-Type": "text/csv",
+            "Content-Disposition": "attachment; filename=a.csv",
+        }
+        file.iter_content.return_value = iter([b"id,t", b"itle", b"\n1,Test\n"])
+        return file
@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+from django.test import override_settings
+from django.urls import reverse
+from mock import patch
+
+from core.tests import MarketAccessTestCase
+from utils.api.client import MarketAccessAPIClient
+
+
+def make_history(count):
+    return [
+        {
+            "date": f"2020-03-{day:02d}T12:00:00Z",
+            "model": "barrier",
+            "field": "title",
+            "old_value": f"Title {day - 1}",
+            "new_value": f"Title {day}",
+            "user": {"id": 11, "name": "Vyvyan Holland"},
+        }
+        for day in range(1, count + 1)
+    ]
+
+
+class BarrierHistoryViewTestCase(MarketAccessTestCase):
+    @patch("utils.api.client.MarketAccessAPIClient.get")
+    def test_get_full_history_returns_newest_page(self, mock_get):
+        history = make_history(5)
+        mock_get.return_value = {"history": history[::2] + history[1::2]}
+        barriers = MarketAccessAPIClient("token").barriers
+
+        items = barriers.get_full_history(barrier_id=self.barrier["id"], limit=2)
+        assert [item.new_value for item in items] == ["Title 5", "Title 4"]
+        assert items.total_count == 5
+
+        items = barriers.get_full_history(
+            barrier_id=self.barrier["id"], limit=2, before=items.next_cursor
+        )
+        assert [item.new_value for item in items] == ["Title 3", "Title 2"]
+
+        items = barriers.get_full_history(
+            barrier_id=self.barrier["id"], limit=2, before=items.next_cursor
+        )
+        assert [item.new_value for item in items] == ["Title 1"]
+        assert items.next_cursor is None
+
+    @patch("utils.api.client.MarketAccessAPIClient.get")
+    def test_new_changes_dont_shift_older_pages(self, mock_get):
+        history = make_history(4)
+        barriers = MarketAccessAPIClient("token").barriers
+        mock_get.return_value = {"history": history[:3]}
+        first_page = barriers.get_full_history(barrier_id=self.barrier["id"], limit=2)
+
+        mock_get.return_value = {"history": history}
+        items = barriers.get_full_history(
+            barrier_id=self.barrier["id"], limit=2, before=first_page.next_cursor
+        )
+        assert [item.new_value for item in items] == ["Title 1"]
+
+    @patch("utils.api.client.MarketAccessAPIClient.get")
+    def test_changes_at_the_same_time_are_paged_once(self, mock_get):
+        history = [
+            {**make_history(1)[0], "field": field}
+            for field in ("title", "summary", "status")
+        ]
+        mock_get.return_value = {"history": history}
+        barriers = MarketAccessAPIClient("token").barriers
+
+        items = barriers.get_full_history(barrier_id=self.barrier["id"], limit=2)
+        more_items = barriers.get_full_history(
+            barrier_id=self.barrier["id"], limit=2, before=items.next_cursor
+        )
+        fields = [item.data["field"] for item in list(items) + list(more_items)]
+        assert sorted(fields) == ["status", "summary", "title"]
+
+    @override_settings(HISTORY_PAGE_SIZE=2)
+    @patch("utils.api.client.MarketAccessAPIClient.get")
+    def test_history_page_links_to_older_changes(self, mock_get):
+        mock_get.return_value = {"history": make_history(3)}
+
+        response = self.client.get(
+            reverse("barriers:history", kwargs={"barrier_id": self.barrier["id"]})
+        )
+        html = response.content.decode("utf8")
+
+        assert response.status_code == HTTPStatus.OK
+        assert "3 changes" in html
+        assert html.count('class="history-item"') == 2
+        items_url = reverse(
+            "barriers:history_items", kwargs={"barrier_id": self.barrier["id"]}
+        )
+        assert f"{items_url}?before=2020-03-02T12%3A00%3A00Z%7Cbarrier%7Ctitle" in html
+
+    @override_settings(HISTORY_PAGE_SIZE=2)
+    @patch("utils.api.client.MarketAccessAPIClient.get")
+    def test_history_items_renders_next_page(self, mock_get):
+        mock_get.return_value = {"history": make_history(3)}
+
+        response = self.client.get(
+            reverse(
+                "barriers:history_items", kwargs={"barrier_id": self.barrier["id"]}
+            ),
+            data={"before": "2020-03-02T12:00:00Z|barrier|title"},
+        )
+        html = response.content.decode("utf8")
+
+        assert response.status_code == HTTPStatus.OK
+        assert html.count('class="history-item"') == 1
+        assert "Title 1" in html
+        assert "Load older changes" not in html
+        assert "<html" not in html
+
+    @patch("utils.api.client.MarketAccessAPIClient.get")
+    def test_malformed_cursor_shows_newest_page(self, mock_get):
+        mock_get.return_value = {"history": make_history(3)}
+        url = reverse(
+            "barriers:history_items", kwargs={"barrier_id": self.barrier["id"]}
+        )
+
+        for cursor in ("2020-01-01||", "2020-03-02T12:00:00|barrier|title", "x|y"):
+            response = self.client.get(url, data={"before": cursor})
+            html = response.content.decode("utf8")
+
+            assert response.status_code == HTTPStatus.OK
+            assert html.count('class="history-item"') == 3
@@ -1,12 +1,15 @@
+import gc
+import weakref
 from http import HTTPStatus
 
 from django.conf import settings
 from django.urls import reverse
 from mock import patch
 
+from barriers.forms.search import BarrierSearchForm, SearchChoices
 from barriers.models import Barrier, SavedSearch
 from core.tests import MarketAccessTestCase
-from utils.metadata import get_metadata
+from utils.metadata import Metadata, get_metadata
 from utils.models import ModelList
 
 
@@ -359,3 +362,35 @@ class SearchTestCase(MarketAccessTestCase):
                 "has_no_information"
             ),
         )
+
+
+class SearchChoicesTestCase(MarketAccessTestCase):
+    def test_choices_are_shared_between_forms(self):
+        metadata = get_metadata()
+        form = BarrierSearchForm(metadata=metadata, data={})
+        other_form = BarrierSearchForm(metadata=metadata, data={})
+        assert form.search_choices is other_form.search_choices
+        assert form.search_choices is SearchChoices.for_metadata(metadata)
+        assert isinstance(form.search_choices.choices["country"], tuple)
+
+    def test_choices_go_away_with_their_metadata(self):
+        metadata = Metadata(get_metadata().data)
+        SearchChoices.for_metadata(metadata)
+        assert metadata in SearchChoices._instances
+
+        metadata_ref = weakref.ref(metadata)
+        del metadata
+        gc.collect()
+        assert metadata_ref() is None
+
+    def test_priorities_are_not_sorted_in_place(self):
+        metadata = get_metadata()
+        priorities = list(metadata.data["barrier_priorities"])
+        SearchChoices(metadata)
+        assert metadata.data["barrier_priorities"] == priorities
+
+    def test_readable_value_uses_lookup(self):
+        metadata = get_metadata()
+        form = BarrierSearchForm(metadata=metadata, data={})
+        status_id, status_name = form.search_choices.choices["status"][0]
+        assert form.get_filter_readable_value("status", [status_id]) == status_name
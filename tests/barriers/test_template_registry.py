@@ -0,0 +1,56 @@
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from mock import patch
+
+from barriers.models import HistoryItem
+from barriers.template_registry import PartialTemplateRegistry
+
+NOTE = {
+    "date": "2019-10-28T11:50:00.816000Z",
+    "model": "note",
+    "field": "text",
+    "old_value": "Attach rotary blades to sports cars.",
+    "new_value": "Attach rotary cutters to our cars.",
+    "user": {"id": 48, "name": "Test-user"},
+}
+
+
+@override_settings(DEBUG=False)
+class PartialTemplateRegistryTestCase(TestCase):
+    def setUp(self):
+        self.history_templates = PartialTemplateRegistry(
+            "barriers/history/partials",
+            default_template_name="barriers/history/partials/default.html",
+        )
+        self.activity_templates = PartialTemplateRegistry("barriers/activity/partials")
+
+    def test_partials_are_found(self):
+        self.history_templates.load()
+        template = self.history_templates.get("note", "text")
+        assert (
+            template.origin.template_name == "barriers/history/partials/note/text.html"
+        )
+        assert ("barrier", "summary") in self.history_templates.templates
+
+    def test_missing_partials(self):
+        history_default = self.history_templates.get("barrier", "not-a-field")
+        assert history_default.origin.template_name.endswith("default.html")
+        assert self.activity_templates.get("barrier", "not-a-field") is None
+
+    def test_templates_are_only_loaded_once(self):
+        self.history_templates.load()
+        with patch("barriers.template_registry.get_template") as mock_get_template:
+            self.history_templates.get("note", "text")
+            self.history_templates.get("barrier", "not-a-field")
+        assert mock_get_template.called is False
+
+    def test_activity_item_renders_with_page_context(self):
+        template = Template("{% load activity %}{% activity_item item %}")
+        context = Context({"item": HistoryItem(NOTE), "barrier": {"id": "1"}})
+        with patch("barriers.templatetags.activity.activity_templates") as registry:
+            registry.get.return_value.template = Template(
+                "{{ item.field }} on {{ barrier.id }}"
+            )
+            assert template.render(context) == "text on 1"
+        registry.get.assert_called_with("note", "text")
+        assert len(context.dicts) == 2
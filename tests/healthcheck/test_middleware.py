@@ -1,8 +1,12 @@
+import json
 from unittest.mock import Mock
 
-from django.test import TestCase
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django_log_formatter_ecs import ECSFormatter
 
-from healthcheck.middleware import StatsMiddleware
+from healthcheck.middleware import ServerTimingMiddleware, StatsMiddleware
+from utils.upstream import timed_call
 
 
 class TestMiddleware(TestCase):
@@ -17,7 +21,48 @@ class TestMiddleware(TestCase):
         self.request = Mock(spec=[""])
 
     def test_middleware_start_time_added(self):
-        """ Checks start_time is added to a request object in middleware"""
+        """Checks start_time is added to a request object in middleware"""
         self.assertFalse(hasattr(self.request, "start_time"))
         self.middleware.process_request(self.request)
         self.assertTrue(hasattr(self.request, "start_time"))
+
+
+@override_settings(SERVER_TIMING_HEADER=True)
+class TestServerTimingMiddleware(TestCase):
+    """
+    Test the upstream call timing middleware
+    """
+
+    def get_response(self, request):
+        with timed_call("api", "get", "barriers/1") as call:
+            call.status = 200
+        return HttpResponse()
+
+    def test_server_timing_header_and_log(self):
+        middleware = ServerTimingMiddleware(self.get_response)
+        request = RequestFactory().get("/barriers/1/")
+
+        with self.assertLogs("healthcheck.middleware", level="INFO") as logs:
+            response = middleware(request)
+
+        assert response["Server-Timing"].startswith("api;dur=")
+        assert 'desc="1 calls"' in response["Server-Timing"]
+        assert "total;dur=" in response["Server-Timing"]
+
+        formatted = json.loads(ECSFormatter().format(logs.records[0]))
+        metrics = json.loads(formatted["event"]["message"])
+        assert metrics["event"] == "upstream_calls"
+        assert metrics["path"] == "/barriers/1/"
+        assert metrics["upstream"]["api"]["count"] == 1
+        assert metrics["endpoints"][0]["path"] == "/barriers/{id}"
+        assert metrics["endpoints"][0]["status"] == 200
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_server_timing_header_can_be_turned_off(self):
+        middleware = ServerTimingMiddleware(self.get_response)
+        request = RequestFactory().get("/barriers/1/")
+
+        with self.assertLogs("healthcheck.middleware", level="INFO"):
+            response = middleware(request)
+
+        assert "Server-Timing" not in response
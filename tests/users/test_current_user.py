@@ -0,0 +1,59 @@
+from django.test import RequestFactory, TestCase
+from mock import patch
+
+from users.helpers import sync_user
+from utils.api.client import MarketAccessAPIClient
+from utils.context_processors import get_user, user_scope
+from utils.exceptions import APICircuitOpenException
+
+
+class CurrentUserTestCase(TestCase):
+    user_data = {"id": 49, "email": "test@test.com", "is_active": True}
+
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+        self.request.session = {"sso_token": "abcd", "user_data": {"id": 49}}
+        self.request.api_client = MarketAccessAPIClient("abcd")
+
+    @patch("utils.context_processors.cache")
+    def test_current_user_is_lazy(self, mock_cache):
+        mock_cache.get.return_value = self.user_data
+        context = user_scope(self.request)
+        assert mock_cache.get.called is False
+
+        assert context["current_user"].email == "test@test.com"
+        assert context["current_user"].id == 49
+        mock_cache.get.assert_called_once_with("user_data:49")
+
+    @patch("utils.context_processors.cache")
+    def test_user_is_looked_up_once_per_request(self, mock_cache):
+        mock_cache.get.return_value = self.user_data
+        assert get_user(self.request) is get_user(self.request)
+        assert mock_cache.get.call_count == 1
+
+    @patch("utils.api.client.MarketAccessAPIClient.get")
+    @patch("utils.context_processors.cache")
+    def test_user_fetched_for_permissions_is_reused(self, mock_cache, mock_get):
+        mock_get.return_value = self.user_data
+        user = self.request.api_client.users.get_current()
+
+        assert self.request.api_client.users.get_current() is user
+        assert get_user(self.request) is user
+        mock_get.assert_called_once_with("whoami")
+        assert mock_cache.get.called is False
+
+    def test_signed_out_user(self):
+        self.request.session = {}
+        context = user_scope(self.request)
+        assert not context["current_user"]
+        assert get_user(self.request) is None
+
+    @patch("utils.api.resources.UsersResource.get_current")
+    def test_outage_during_sync_keeps_user_data(self, mock_get_current):
+        mock_get_current.side_effect = APICircuitOpenException("Circuit open")
+        session = {"sso_token": "abcd", "user_data": {"id": 49}}
+
+        with self.assertRaises(APICircuitOpenException):
+            sync_user(session)
+
+        assert session["user_data"] == {"id": 49}
@@ -0,0 +1,48 @@
+import contextvars
+import threading
+import time
+
+from django.test import TestCase, override_settings
+
+from utils.api.client import MarketAccessAPIClient
+from utils.api.concurrency import gather
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class GatherTestCase(TestCase):
+    """
+    Test running independent API calls concurrently
+    """
+
+    def test_results_are_returned_in_order(self):
+        def slow():
+            time.sleep(0.05)
+            return "slow"
+
+        assert gather(slow, lambda: "fast", lambda: 3) == ["slow", "fast", 3]
+
+    def test_calls_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=1)
+        assert gather(barrier.wait, barrier.wait, barrier.wait) is not None
+
+    def test_first_exception_is_raised(self):
+        def fail(message):
+            raise ValueError(message)
+
+        with self.assertRaisesMessage(ValueError, "first"):
+            gather(lambda: 1, lambda: fail("first"), lambda: fail("second"))
+
+    def test_context_is_propagated(self):
+        request_id.set("abc")
+        assert gather(request_id.get, request_id.get) == ["abc", "abc"]
+
+    @override_settings(API_MAX_CONCURRENT_CALLS=1)
+    def test_serial_when_concurrency_disabled(self):
+        thread_ids = gather(threading.get_ident, threading.get_ident)
+        assert thread_ids == [threading.get_ident()] * 2
+
+    def test_client_gather(self):
+        client = MarketAccessAPIClient()
+        assert client.gather(lambda: 1, lambda: 2) == [1, 2]
+        assert client.gather() == []
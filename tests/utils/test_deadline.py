@@ -0,0 +1,157 @@
+from http import HTTPStatus
+
+import requests
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from mock import Mock, patch
+
+from core.tests import MarketAccessTestCase
+from utils.api.client import MarketAccessAPIClient
+from utils.api.concurrency import gather, optional
+from utils.api.deadline import (
+    fit_timeout,
+    get_remaining_time,
+    has_time_for,
+    request_deadline,
+)
+from utils.api.resilience import clear_state, get_breaker
+from utils.exceptions import APIDeadlineExceededException, APIHttpException
+from utils.middleware import RequestDeadlineMiddleware
+
+
+@patch("utils.api.deadline.time.monotonic")
+class DeadlineTestCase(TestCase):
+    def test_no_deadline(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        assert get_remaining_time() is None
+        assert fit_timeout((3.05, 15)) == (3.05, 15)
+        assert has_time_for(60) is True
+
+    def test_timeouts_shrink_to_fit(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        with request_deadline(10):
+            mock_monotonic.return_value = 105
+            assert get_remaining_time() == 5
+            assert fit_timeout((3.05, 15)) == (3.05, 5)
+            assert fit_timeout(2) == 2
+            assert fit_timeout(None) == 5
+            assert has_time_for(4) is True
+            assert has_time_for(5) is False
+
+            mock_monotonic.return_value = 110
+            with self.assertRaises(APIDeadlineExceededException):
+                fit_timeout((3.05, 15))
+        assert get_remaining_time() is None
+
+
+@patch("utils.api.client.get_session")
+class ClientDeadlineTestCase(TestCase):
+    def test_call_gets_remaining_time(self, mock_get_session):
+        mock_get_session().request.return_value = Mock(status_code=200)
+        with request_deadline(2):
+            MarketAccessAPIClient("token").get("barriers/export", raw=True)
+        connect_timeout, read_timeout = mock_get_session().request.call_args[1][
+            "timeout"
+        ]
+        assert read_timeout <= 2
+
+    def test_no_call_after_deadline(self, mock_get_session):
+        with request_deadline(0):
+            with self.assertRaises(APIDeadlineExceededException):
+                MarketAccessAPIClient("token").get("whoami")
+        assert mock_get_session().request.called is False
+
+    @override_settings(API_BREAKER_FAILURE_THRESHOLD=2)
+    def test_deadline_timeouts_dont_open_the_breaker(self, mock_get_session):
+        clear_state()
+        self.addCleanup(clear_state)
+        mock_get_session().request.side_effect = requests.exceptions.ReadTimeout()
+        client = MarketAccessAPIClient("token")
+        for _ in range(3):
+            with request_deadline(0.5):
+                with self.assertRaises(APIDeadlineExceededException):
+                    client.post("barriers", json={})
+        assert get_breaker("api").is_open is False
+
+        # Timeouts at the full configured timeout still count
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                client.post("barriers", json={})
+        assert get_breaker("api").is_open is True
+
+    @patch("utils.api.client.time.sleep")
+    def test_no_retry_without_time_for_it(self, mock_sleep, mock_get_session):
+        response = Mock(status_code=503)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=response
+        )
+        mock_get_session().request.return_value = response
+        with override_settings(API_RETRY_BACKOFF=5), request_deadline(3):
+            with self.assertRaises(APIHttpException):
+                MarketAccessAPIClient("token").get("whoami")
+        assert mock_get_session().request.call_count == 1
+        assert mock_sleep.called is False
+
+
+class OptionalCallTestCase(TestCase):
+    def test_optional_calls_degrade(self):
+        def timeout():
+            raise requests.exceptions.ReadTimeout()
+
+        def past_deadline():
+            raise APIDeadlineExceededException("Out of time")
+
+        assert gather(
+            optional(timeout, default=[]),
+            optional(past_deadline),
+            lambda: "barrier",
+        ) == [[], None, "barrier"]
+
+    def test_other_errors_are_raised(self):
+        def fail():
+            raise ValueError("Broken")
+
+        with self.assertRaises(ValueError):
+            optional(fail)()
+
+
+@override_settings(REQUEST_BUDGET=30, REQUEST_BUDGETS={"barriers:dashboard": 10})
+class RequestDeadlineMiddlewareTestCase(TestCase):
+    def get_remaining_time_for(self, view_name):
+        remaining_times = []
+
+        def view(request):
+            remaining_times.append(get_remaining_time())
+            return HttpResponse()
+
+        request = RequestFactory().get("/")
+        request.resolver_match = Mock(view_name=view_name)
+        middleware = RequestDeadlineMiddleware(
+            lambda request: middleware.process_view(request, view, (), {})
+            or view(request)
+        )
+        middleware(request)
+        assert get_remaining_time() is None
+        return remaining_times[0]
+
+    def test_budget_per_view(self):
+        assert 9 < self.get_remaining_time_for("barriers:dashboard") <= 10
+        assert 29 < self.get_remaining_time_for("barriers:search") <= 30
+
+    @override_settings(REQUEST_BUDGETS={"barriers:download": None})
+    def test_no_budget(self):
+        assert self.get_remaining_time_for("barriers:download") is None
+
+
+class DegradedBarrierDetailTestCase(MarketAccessTestCase):
+    @patch("utils.api.resources.BarriersResource.get_activity")
+    def test_page_renders_without_activity(self, mock_get_activity):
+        mock_get_activity.side_effect = APIDeadlineExceededException("Out of time")
+        response = self.client.get(
+            reverse(
+                "barriers:barrier_detail", kwargs={"barrier_id": self.barrier["id"]}
+            )
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.context["interactions"]) == len(self.notes)
@@ -0,0 +1,44 @@
+from django.test import TestCase
+
+from utils.diff import diff_match_patch
+
+OLD = (
+    "Exporters of pork to the market must register every consignment.\n\n"
+    "The registration takes up to 30 days, and costs £1,200 per shipment."
+)
+NEW = (
+    "Exporters of pork and poultry to the market must register every consignment.\n\n"
+    "The registration takes up to 45 days, and costs £1,200 per shipment."
+)
+
+
+class WordModeDiffTestCase(TestCase):
+    def setUp(self):
+        self.dmp = diff_match_patch()
+
+    def test_words_to_chars(self):
+        chars1, chars2, words = self.dmp.diff_wordsToChars("a b, a", "b c")
+        assert words == ["", "a", " ", "b", ",", "c"]
+        assert [ord(char) for char in chars1] == [1, 2, 3, 4, 2, 1]
+        assert [ord(char) for char in chars2] == [3, 2, 5]
+
+    def test_word_mode_rebuilds_both_texts(self):
+        diffs = self.dmp.diff_wordMode(OLD, NEW)
+        assert self.dmp.diff_text1(diffs) == OLD
+        assert self.dmp.diff_text2(diffs) == NEW
+
+    def test_word_mode_keeps_whole_words(self):
+        diffs = self.dmp.diff_wordMode("costs 30 days", "costs 45 days")
+        assert diffs == [
+            (self.dmp.DIFF_EQUAL, "costs "),
+            (self.dmp.DIFF_DELETE, "30"),
+            (self.dmp.DIFF_INSERT, "45"),
+            (self.dmp.DIFF_EQUAL, " days"),
+        ]
+
+    def test_line_mode_rebuilds_both_texts(self):
+        old = OLD * 5
+        new = NEW * 5
+        diffs = self.dmp.diff_main(old, new, checklines=True)
+        assert self.dmp.diff_text1(diffs) == old
+        assert self.dmp.diff_text2(diffs) == new
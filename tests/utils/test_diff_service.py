@@ -0,0 +1,93 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from mock import patch
+
+from barriers.models.history import HistoryItem
+from barriers.models.history.base import prefetch_diffs
+from utils.diff_service import (
+    DiffBudget,
+    get_diff,
+    get_diffs,
+    line_diff_html,
+    make_key,
+    pool_diff_html,
+)
+
+OLD = "Attach rotary blades to sports cars."
+NEW = "Attach rotary cutters to our cars."
+HTML = (
+    '<span class="diff__eq">Attach rotary </span>'
+    '<del class="diff__del">blades to sports</del>'
+    '<ins class="diff__ins">cutters to our</ins>'
+    '<span class="diff__eq"> cars.</span>'
+)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    DIFF_PROCESSES=0,
+)
+class DiffServiceTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_diffs_are_cached(self):
+        assert get_diff(OLD, NEW) == HTML
+        with patch("utils.diff_service.diff_html") as mock_diff_html:
+            assert get_diff(OLD, NEW) == HTML
+            assert get_diffs([(OLD, NEW)]) == [HTML]
+        assert mock_diff_html.called is False
+
+    def test_spent_budget_falls_back_to_line_diff(self):
+        budget = DiffBudget(0)
+        old = "first line\nsecond line"
+        new = "first line\nsecond line changed"
+        assert get_diff(old, new, budget) == line_diff_html(old, new)
+        assert '<del class="diff__del">second line</del>' in get_diff(old, new, budget)
+        assert get_diff(old, new) != line_diff_html(old, new)
+
+    def test_prefetch_diffs(self):
+        items = [
+            HistoryItem(
+                {
+                    "date": "2019-10-28T11:50:00.816000Z",
+                    "model": "note",
+                    "field": "text",
+                    "old_value": OLD,
+                    "new_value": NEW,
+                    "user": {"id": 48, "name": "Test-user"},
+                }
+            )
+        ]
+        with patch("utils.diff_service.diff_html", return_value="<ins/>"):
+            prefetch_diffs(items, DiffBudget(1))
+        assert items[0].diff == "<ins/>"
+
+    @override_settings(DIFF_PROCESSES=1)
+    @patch("utils.diff_service.compute_diffs_in_pool")
+    def test_single_process_pool_is_used(self, mock_compute_diffs_in_pool):
+        mock_compute_diffs_in_pool.side_effect = lambda missing, budget: {
+            key: (HTML, True) for key, old, new in missing
+        }
+        assert get_diffs([(OLD, NEW)]) == [HTML]
+        assert mock_compute_diffs_in_pool.called is True
+
+    @override_settings(DIFF_PROCESSES=1)
+    @patch("utils.diff_service.pool_diff_html", return_value=("<cut/>", False))
+    @patch("utils.diff_service.get_pool")
+    def test_cut_short_pool_diffs_are_not_cached(self, mock_get_pool, _):
+        mock_get_pool.return_value = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(mock_get_pool.return_value.shutdown)
+
+        assert get_diffs([(OLD, NEW)], DiffBudget(1)) == ["<cut/>"]
+        assert cache.get(make_key(OLD, NEW)) is None
+
+    def test_abandoned_pool_diffs_are_skipped(self):
+        assert pool_diff_html(OLD, NEW, 1, give_up_at=time.time() - 1) == (
+            None,
+            False,
+        )
+        assert pool_diff_html(OLD, NEW, 1, give_up_at=time.time() + 5) == (HTML, True)
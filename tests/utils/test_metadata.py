@@ -148,3 +148,43 @@ class MetadataTestCase(MarketAccessTestCase):
         assert len(barrier_types) > 0
         for barrier_type in barrier_types:
             assert barrier_type["category"] == "SERVICES"
+
+    def test_get_overseas_region_by_id(self):
+        metadata = get_metadata()
+        region_id = "c4679b44-079e-4394-8bf7-bb0881a5031d"
+        assert metadata.get_overseas_region_by_id(region_id)["name"] == "Middle East"
+        assert metadata.get_overseas_region_by_id("not-a-region") is None
+
+    def test_get_trading_bloc_by_country_id(self):
+        metadata = get_metadata()
+        country_id = "a05f66a0-5d95-e211-a939-e4115bead28a"
+        assert metadata.get_trading_bloc_by_country_id(country_id) == {
+            "code": "TB00016",
+            "name": "European Union",
+            "short_name": "the EU",
+        }
+        brazil_id = "b05f66a0-5d95-e211-a939-e4115bead28a"
+        assert metadata.get_trading_bloc_by_country_id(brazil_id) is None
+
+    def test_get_barrier_tag(self):
+        metadata = get_metadata()
+        assert metadata.get_barrier_tag("1")["title"] == "COVID-19"
+        assert metadata.get_barrier_tag(1)["title"] == "COVID-19"
+
+    def test_get_government_organisation(self):
+        metadata = get_metadata()
+        organisation = metadata.get_government_organisation("1")
+        assert organisation["name"] == "Attorney General's Office"
+
+    def test_get_status_returns_a_copy(self):
+        metadata = get_metadata()
+        status = metadata.get_status("2")
+        status["name"] = "Changed"
+        assert metadata.get_status("2")["name"] == "Open: In progress"
+
+    def test_lookup_lists_are_copies(self):
+        metadata = get_metadata()
+        metadata.get_overseas_region_list().clear()
+        metadata.get_category_list().clear()
+        assert len(metadata.get_overseas_region_list()) > 0
+        assert len(metadata.get_category_list()) > 0
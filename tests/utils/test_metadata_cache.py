@@ -0,0 +1,148 @@
+import json
+
+from django.test import TestCase, override_settings
+from mock import patch
+
+from utils.metadata import (
+    METADATA_FRESH_KEY,
+    METADATA_KEY,
+    METADATA_LOCK_KEY,
+    METADATA_VERSION_KEY,
+    MetadataCache,
+    clear_metadata_cache,
+    refresh_metadata,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def mget(self, *keys):
+        return [self.store.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        if isinstance(value, str):
+            value = value.encode()
+        self.store[key] = value
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+@override_settings(MOCK_METADATA=False, METADATA_VERSION_CHECK_INTERVAL=0)
+class MetadataCacheTestCase(TestCase):
+    """
+    Test the process level metadata cache
+    """
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.redis.set(METADATA_KEY, json.dumps({"countries": []}))
+        self.redis.set(METADATA_VERSION_KEY, b"1")
+        self.redis.set(METADATA_FRESH_KEY, b"1")
+
+        redis_patcher = patch("utils.metadata.redis_client", self.redis)
+        redis_patcher.start()
+        self.addCleanup(redis_patcher.stop)
+
+        self.cache = MetadataCache()
+
+    def test_parsed_metadata_is_reused(self):
+        metadata = self.cache.get()
+        assert metadata.data == {"countries": []}
+        assert metadata.version == b"1"
+        assert self.cache.get() is metadata
+
+    def test_reloads_when_version_changes(self):
+        metadata = self.cache.get()
+        self.redis.set(METADATA_KEY, json.dumps({"countries": [{"id": 1}]}))
+        self.redis.set(METADATA_VERSION_KEY, b"2")
+
+        new_metadata = self.cache.get()
+        assert new_metadata is not metadata
+        assert new_metadata.data == {"countries": [{"id": 1}]}
+
+    @override_settings(METADATA_VERSION_CHECK_INTERVAL=60)
+    def test_version_is_not_checked_within_interval(self):
+        metadata = self.cache.get()
+        self.redis.set(METADATA_VERSION_KEY, b"2")
+        assert self.cache.get() is metadata
+
+    @patch("utils.metadata.fetch_metadata")
+    def test_fetches_from_api_when_redis_is_empty(self, mock_fetch_metadata):
+        self.redis.delete(METADATA_KEY, METADATA_VERSION_KEY)
+        mock_fetch_metadata.return_value = {"countries": [{"id": 2}]}
+
+        metadata = self.cache.get()
+        assert metadata.data == {"countries": [{"id": 2}]}
+        assert json.loads(self.redis.get(METADATA_KEY)) == metadata.data
+        assert self.redis.get(METADATA_VERSION_KEY) == metadata.version
+
+    @patch("utils.metadata.fetch_metadata")
+    def test_clear_metadata_cache_bumps_version(self, mock_fetch_metadata):
+        self.cache.get()
+        mock_fetch_metadata.return_value = {"countries": [{"id": 3}]}
+
+        clear_metadata_cache()
+        assert self.redis.get(METADATA_KEY) is None
+        assert self.redis.get(METADATA_VERSION_KEY) != b"1"
+
+        assert self.cache.get().data == {"countries": [{"id": 3}]}
+
+    @patch("utils.metadata.threading.Thread")
+    def test_stale_metadata_is_served_while_refreshing(self, mock_thread):
+        self.redis.delete(METADATA_FRESH_KEY)
+
+        assert self.cache.get().data == {"countries": []}
+        mock_thread.assert_called_once_with(target=refresh_metadata, daemon=True)
+        mock_thread().start.assert_called_once_with()
+
+    @patch("utils.metadata.fetch_metadata")
+    def test_refresh_replaces_stale_metadata(self, mock_fetch_metadata):
+        self.redis.delete(METADATA_FRESH_KEY)
+        mock_fetch_metadata.return_value = {"countries": [{"id": 4}]}
+
+        refresh_metadata()
+        assert json.loads(self.redis.get(METADATA_KEY)) == {"countries": [{"id": 4}]}
+        assert self.redis.get(METADATA_FRESH_KEY) == self.redis.get(
+            METADATA_VERSION_KEY
+        )
+        assert self.redis.get(METADATA_LOCK_KEY) is None
+
+    @patch("utils.metadata.fetch_metadata")
+    def test_only_one_process_refreshes(self, mock_fetch_metadata):
+        self.redis.delete(METADATA_FRESH_KEY)
+        self.redis.set(METADATA_LOCK_KEY, b"other-process")
+
+        refresh_metadata()
+        assert mock_fetch_metadata.called is False
+        assert self.redis.get(METADATA_LOCK_KEY) == b"other-process"
+
+    @patch("utils.metadata.time.sleep")
+    @patch("utils.metadata.fetch_metadata")
+    def test_waits_for_the_refreshing_process(self, mock_fetch_metadata, mock_sleep):
+        self.redis.delete(METADATA_KEY, METADATA_VERSION_KEY)
+        self.redis.set(METADATA_LOCK_KEY, b"other-process")
+
+        def other_process_stores_metadata(seconds):
+            self.redis.set(METADATA_KEY, json.dumps({"countries": [{"id": 5}]}))
+            self.redis.set(METADATA_VERSION_KEY, b"5")
+
+        mock_sleep.side_effect = other_process_stores_metadata
+
+        assert self.cache.get().data == {"countries": [{"id": 5}]}
+        assert mock_fetch_metadata.called is False
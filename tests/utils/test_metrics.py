@@ -0,0 +1,87 @@
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from mock import patch
+
+from utils.metrics import MetricsStore, collect, get_quantile
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.metrics_dir.cleanup)
+        self.settings_override = override_settings(
+            METRICS_ENABLED=True,
+            METRICS_DIR=self.metrics_dir.name,
+            METRICS_RESERVOIR_SIZE=100,
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def make_store(self, pid):
+        with patch("utils.metrics.os.getpid", return_value=pid):
+            store = MetricsStore()
+        store.check_pid = lambda: None
+        return store
+
+    def test_metrics_are_added_up_across_workers(self):
+        for pid in (101, 102):
+            store = self.make_store(pid)
+            store.inc("market_access_metadata_cache_total", {"result": "hit"})
+            store.observe(
+                "market_access_view_duration_seconds",
+                {"view": "barriers:search", "method": "GET"},
+                0.3,
+            )
+            store.flush()
+
+        with patch("utils.metrics.store", self.make_store(103)):
+            text = collect()
+
+        assert 'market_access_metadata_cache_total{result="hit"} 2' in text
+        labels = 'method="GET",view="barriers:search"'
+        bucket = f"market_access_view_duration_seconds_bucket{{{labels},le="
+        assert f'{bucket}"0.25"}} 0' in text
+        assert f'{bucket}"0.5"}} 2' in text
+        assert f'{bucket}"+Inf"}} 2' in text
+        assert f"market_access_view_duration_seconds_count{{{labels}}} 2" in text
+        assert "# TYPE market_access_view_duration_seconds histogram" in text
+
+    def test_session_size_percentiles(self):
+        store = self.make_store(101)
+        for size in range(1, 1001):
+            store.observe("market_access_session_size_bytes", {}, size)
+        reservoir = store.reservoirs['["market_access_session_size_bytes", {}]']
+        assert len(reservoir["samples"]) == 100
+        store.flush()
+
+        with patch("utils.metrics.store", self.make_store(102)):
+            text = collect()
+        assert "market_access_session_size_bytes_count 1000" in text
+        assert "market_access_session_size_bytes_sum 500500" in text
+        assert 'market_access_session_size_bytes{quantile="0.5"}' in text
+
+    def test_weighted_quantile(self):
+        samples = [[10, 1], [20, 1], [30, 8]]
+        assert get_quantile(samples, 0.1) == 10
+        assert get_quantile(samples, 0.5) == 30
+        assert get_quantile([], 0.5) is None
+
+    def test_restarted_worker_carries_on_counting(self):
+        store = self.make_store(101)
+        store.inc("market_access_metadata_cache_total", {"result": "miss"})
+        store.flush()
+
+        store = self.make_store(101)
+        store.inc("market_access_metadata_cache_total", {"result": "miss"})
+        store.flush()
+        assert store.counters == {
+            '["market_access_metadata_cache_total", {"result": "miss"}]': 2
+        }
+
+    def test_metrics_view(self):
+        response = self.client.get(reverse("healthcheck:metrics"))
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/plain; version=0.0.4"
+        assert b"# TYPE market_access_session_size_bytes summary" in response.content
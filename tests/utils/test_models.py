@@ -0,0 +1,61 @@
+import datetime
+
+from django.test import TestCase
+from mock import patch
+
+from barriers.models import Barrier
+from utils.models import APIModel, ModelList, parse_datetime
+
+
+class Assessment(APIModel):
+    date_fields = ("created_on",)
+
+
+class APIModelTestCase(TestCase):
+    def test_parse_datetime(self):
+        parsed = parse_datetime("2020-03-04T10:15:30.123456Z")
+        assert parsed == datetime.datetime(
+            2020, 3, 4, 10, 15, 30, 123456, tzinfo=datetime.timezone.utc
+        )
+        assert parse_datetime("2020-03-04") == datetime.datetime(2020, 3, 4)
+        assert parse_datetime("4 March 2020") == datetime.datetime(2020, 3, 4)
+
+    def test_date_fields_are_parsed_once(self):
+        assessment = Assessment({"created_on": "2020-03-04T10:15:30Z", "rating": 1})
+        with patch("utils.models.parse_iso_datetime") as mock_parse:
+            mock_parse.return_value = datetime.datetime(2020, 3, 4)
+            assert assessment.created_on == assessment.created_on
+        assert mock_parse.call_count == 1
+        assert assessment.rating == 1
+
+    def test_barrier_dates_are_parsed_once(self):
+        barrier = Barrier({"created_on": "2020-03-04T10:15:30Z"})
+        with patch("barriers.models.barriers.parse_datetime") as mock_parse:
+            barrier.created_on
+            barrier.created_on
+        assert mock_parse.call_count == 1
+
+
+class ModelListTestCase(TestCase):
+    def setUp(self):
+        self.data = [{"id": i} for i in range(5)]
+        self.model_list = ModelList(model=Assessment, data=self.data, total_count=20)
+
+    def test_items_are_wrapped_once(self):
+        first = list(self.model_list)
+        second = list(self.model_list)
+        assert [obj.id for obj in first] == [0, 1, 2, 3, 4]
+        assert all(a is b for a, b in zip(first, second))
+
+    def test_indexing_and_slicing_are_lazy(self):
+        assert self.model_list[1].id == 1
+        assert self.model_list[-1].id == 4
+        assert [obj.id for obj in self.model_list[2:4]] == [2, 3]
+        assert self.model_list._objects[0] is None
+        assert self.model_list[1] is list(self.model_list)[1]
+
+    def test_count_and_raw_data(self):
+        assert len(self.model_list) == 5
+        assert self.model_list.total_count == 20
+        assert self.model_list.data is self.data
+        assert not ModelList(model=Assessment, data=[], total_count=0)
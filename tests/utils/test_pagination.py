@@ -0,0 +1,86 @@
+from django.test import RequestFactory, TestCase
+from mock import Mock, patch
+
+from barriers.models import Barrier
+from utils.api.client import MarketAccessAPIClient
+from utils.models import ModelList
+from utils.pagination import PaginationMixin, get_page_window
+
+
+class PaginationView(PaginationMixin):
+    pagination_limit = 10
+
+    def __init__(self, querystring="", cursor_pagination=False):
+        self.request = RequestFactory().get(f"/search?{querystring}")
+        self.cursor_pagination = cursor_pagination
+
+
+class PageWindowTestCase(TestCase):
+    def test_few_pages_are_all_shown(self):
+        assert get_page_window(1, 0) == []
+        assert get_page_window(2, 4) == [1, 2, 3, 4]
+
+    def test_window_around_current_page(self):
+        assert get_page_window(1, 13) == [1, 2, 3, 4, "...", 13]
+        assert get_page_window(3, 13) == [1, 2, 3, 4, 5, "...", 13]
+        assert get_page_window(6, 13) == [1, "...", 5, 6, 7, 8, "...", 13]
+        assert get_page_window(13, 13) == [1, "...", 10, 11, 12, 13]
+        assert get_page_window(50, 13) == [1, "...", 10, 11, 12, 13]
+
+
+class PaginationMixinTestCase(TestCase):
+    def test_only_visible_pages_are_built(self):
+        view = PaginationView("status=1&status=2&page=500")
+        object_list = ModelList(Barrier, [], total_count=100000)
+
+        with patch("django.http.QueryDict.urlencode") as mock_urlencode:
+            mock_urlencode.return_value = ""
+            pagination = view.get_pagination_data(object_list)
+
+        assert pagination["total_pages"] == 10000
+        assert len(pagination["pages"]) == 8
+        # 6 page links plus previous and next
+        assert mock_urlencode.call_count == 8
+
+    def test_page_urls(self):
+        view = PaginationView("status=1&status=2&page=6")
+        pagination = view.get_pagination_data(ModelList(Barrier, [], 123))
+
+        assert pagination["is_paginated"] is True
+        assert pagination["pages"][0] == {
+            "label": 1,
+            "url": "status=1&status=2&page=1",
+        }
+        assert pagination["pages"][1] == {"label": "..."}
+        assert pagination["previous"] == "status=1&status=2&page=5"
+        assert pagination["next"] == "status=1&status=2&page=7"
+
+    def test_cursor_pagination(self):
+        view = PaginationView("status=1&cursor=abc", cursor_pagination=True)
+        assert view.get_pagination_params() == {"limit": 10, "cursor": "abc"}
+
+        object_list = ModelList(
+            Barrier, [], None, next_cursor="def", previous_cursor="xyz"
+        )
+        pagination = view.get_pagination_data(object_list)
+        assert pagination == {
+            "is_paginated": True,
+            "pages": [],
+            "previous": "status=1&cursor=xyz",
+            "next": "status=1&cursor=def",
+        }
+
+    @patch("utils.api.client.get_session")
+    def test_list_reads_cursors(self, mock_get_session):
+        response = Mock(status_code=200)
+        response.json.return_value = {
+            "next": "http://api/barriers?cursor=cD0yMDIx&limit=10",
+            "previous": None,
+            "results": [{"id": "1"}],
+        }
+        mock_get_session().request.return_value = response
+
+        barriers = MarketAccessAPIClient("token").barriers.list(limit=10)
+        assert barriers.next_cursor == "cD0yMDIx"
+        assert barriers.previous_cursor is None
+        assert barriers.total_count is None
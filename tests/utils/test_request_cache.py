@@ -0,0 +1,67 @@
+from django.test import TestCase
+from mock import Mock, patch
+
+from utils.api.client import MarketAccessAPIClient
+from utils.api.request_cache import RequestCache, request_cache
+
+
+def mock_response(data):
+    response = Mock(status_code=200)
+    response.json.return_value = data
+    return response
+
+
+@patch("utils.api.client.get_session")
+class RequestCacheTestCase(TestCase):
+    """
+    Test memoization of API calls within a request
+    """
+
+    def setUp(self):
+        self.api_client = MarketAccessAPIClient("token")
+
+    def test_get_is_not_cached_outside_a_request(self, mock_get_session):
+        mock_get_session().request.return_value = mock_response({"id": 1})
+        self.api_client.get("whoami")
+        self.api_client.get("whoami")
+        assert mock_get_session().request.call_count == 2
+
+    def test_get_is_cached_within_a_request(self, mock_get_session):
+        mock_get_session().request.return_value = mock_response({"id": 1})
+        with request_cache():
+            assert self.api_client.get("whoami") == {"id": 1}
+            assert MarketAccessAPIClient("token").get("whoami") == {"id": 1}
+        assert mock_get_session().request.call_count == 1
+
+    def test_cache_is_keyed_on_token_and_params(self, mock_get_session):
+        mock_get_session().request.return_value = mock_response({"results": []})
+        with request_cache():
+            self.api_client.get("barriers", params={"limit": 10})
+            self.api_client.get("barriers", params={"limit": 20})
+            MarketAccessAPIClient("other").get("barriers", params={"limit": 10})
+        assert mock_get_session().request.call_count == 3
+
+    def test_cached_data_cannot_be_mutated(self, mock_get_session):
+        mock_get_session().request.return_value = mock_response({"status": {"id": 1}})
+        with request_cache():
+            self.api_client.get("barriers/1")["status"]["id"] = "changed"
+            assert self.api_client.get("barriers/1") == {"status": {"id": 1}}
+
+    def test_mutation_invalidates_resource(self, mock_get_session):
+        mock_get_session().request.return_value = mock_response({"id": 1})
+        with request_cache():
+            self.api_client.get("barriers/1")
+            self.api_client.get("mentions")
+            self.api_client.patch("barriers/1", json={"title": "New"})
+            self.api_client.get("barriers/1")
+            self.api_client.get("mentions")
+        methods = [call[0][0] for call in mock_get_session().request.call_args_list]
+        assert methods == ["get", "get", "patch", "get"]
+
+    def test_related_resources_are_invalidated(self, mock_get_session):
+        cache = RequestCache()
+        cache.set(cache.make_key("token", "whoami"), {"id": 1})
+        cache.set(cache.make_key("token", "mentions"), [])
+        cache.invalidate("users/1")
+        assert cache.make_key("token", "whoami") not in cache
+        assert cache.make_key("token", "mentions") in cache
@@ -0,0 +1,162 @@
+import requests
+from django.test import TestCase, override_settings
+from mock import Mock, patch
+
+from utils.api.client import MarketAccessAPIClient
+from utils.api.resilience import (
+    CircuitBreaker,
+    RetryBudget,
+    clear_state,
+    get_breaker,
+    get_timeout,
+)
+from utils.exceptions import APICircuitOpenException, APIHttpException
+
+
+def mock_response(status_code, data=None):
+    response = Mock(status_code=status_code)
+    response.json.return_value = data or {}
+    if status_code >= 400:
+        error = requests.exceptions.HTTPError(response=response)
+        response.raise_for_status.side_effect = error
+    return response
+
+
+@override_settings(
+    API_MAX_RETRIES=2,
+    API_RETRY_BACKOFF=0.1,
+    API_RETRY_BUDGET_RATIO=0.1,
+    API_RETRY_BUDGET_MAX=10,
+    API_BREAKER_FAILURE_THRESHOLD=3,
+    API_BREAKER_RECOVERY_TIME=10,
+)
+@patch("utils.api.client.time.sleep")
+@patch("utils.api.client.get_session")
+class ClientResilienceTestCase(TestCase):
+    def setUp(self):
+        clear_state()
+        self.addCleanup(clear_state)
+        self.api_client = MarketAccessAPIClient("token")
+
+    def test_timeout_is_sent(self, mock_get_session, mock_sleep):
+        mock_get_session().request.return_value = mock_response(200)
+        self.api_client.get("barriers/export", raw=True)
+        assert mock_get_session().request.call_args[1]["timeout"] == get_timeout(
+            "barriers/export"
+        )
+
+    def test_get_is_retried_after_connection_error(self, mock_get_session, mock_sleep):
+        mock_get_session().request.side_effect = [
+            requests.exceptions.ConnectionError(),
+            mock_response(503),
+            mock_response(200, {"id": 1}),
+        ]
+        assert self.api_client.get("whoami") == {"id": 1}
+        assert mock_get_session().request.call_count == 3
+        assert [call[0][0] for call in mock_sleep.call_args_list] == [0.1, 0.2]
+
+    def test_retries_are_limited(self, mock_get_session, mock_sleep):
+        mock_get_session().request.return_value = mock_response(503)
+        with self.assertRaises(APIHttpException):
+            self.api_client.get("whoami")
+        assert mock_get_session().request.call_count == 3
+
+    def test_read_timeouts_and_posts_are_not_retried(
+        self, mock_get_session, mock_sleep
+    ):
+        mock_get_session().request.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.api_client.get("whoami")
+        assert mock_get_session().request.call_count == 1
+
+        mock_get_session().request.side_effect = None
+        mock_get_session().request.return_value = mock_response(503)
+        with self.assertRaises(APIHttpException):
+            self.api_client.post("barriers", json={})
+        assert mock_get_session().request.call_count == 2
+
+    @override_settings(API_RETRY_BUDGET_MAX=1)
+    def test_retry_budget(self, mock_get_session, mock_sleep):
+        mock_get_session().request.return_value = mock_response(503)
+        with self.assertRaises(APIHttpException):
+            self.api_client.get("whoami")
+        # One retry from the budget, then none left
+        assert mock_get_session().request.call_count == 2
+
+    def test_breaker_fails_fast(self, mock_get_session, mock_sleep):
+        mock_get_session().request.side_effect = requests.exceptions.ReadTimeout()
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                self.api_client.get("whoami")
+
+        with self.assertRaises(APICircuitOpenException):
+            self.api_client.get("whoami")
+        assert mock_get_session().request.call_count == 3
+        assert get_breaker("api").is_open
+
+    def test_endpoint_errors_dont_open_the_breaker(self, mock_get_session, mock_sleep):
+        mock_get_session().request.return_value = mock_response(500)
+        for _ in range(5):
+            with self.assertRaises(APIHttpException):
+                self.api_client.get("whoami")
+        assert mock_get_session().request.call_count == 5
+        assert get_breaker("api").is_open is False
+
+    @patch("utils.api.resilience.time.monotonic")
+    def test_unexpected_error_releases_trial_call(
+        self, mock_monotonic, mock_get_session, mock_sleep
+    ):
+        mock_monotonic.return_value = 100
+        breaker = get_breaker("api")
+        for _ in range(3):
+            breaker.record_failure()
+
+        mock_monotonic.return_value = 111
+        mock_get_session().request.side_effect = ValueError("Unexpected")
+        with self.assertRaises(ValueError):
+            self.api_client.get("whoami")
+
+        mock_get_session().request.side_effect = None
+        mock_get_session().request.return_value = mock_response(200, {"id": 1})
+        assert self.api_client.get("whoami") == {"id": 1}
+        assert breaker.is_open is False
+
+
+class CircuitBreakerTestCase(TestCase):
+    @patch("utils.api.resilience.time.monotonic")
+    def test_trial_call_after_recovery_time(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        breaker = CircuitBreaker("api", failure_threshold=2, recovery_time=10)
+        breaker.record_failure()
+        assert breaker.before_call() is False
+        breaker.record_failure()
+        assert breaker.is_open
+
+        mock_monotonic.return_value = 111
+        assert breaker.before_call() is True
+        # Only one trial call at a time
+        with self.assertRaises(APICircuitOpenException):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.is_open is False
+        breaker.before_call()
+
+    def test_retry_budget(self):
+        budget = RetryBudget(ratio=0.5, max_retries=1)
+        assert budget.withdraw() is True
+        assert budget.withdraw() is False
+        budget.deposit()
+        budget.deposit()
+        assert budget.withdraw() is True
+
+    @override_settings(
+        API_READ_TIMEOUT=15,
+        UPSTREAM_CONNECT_TIMEOUT=3,
+        API_READ_TIMEOUTS={"barriers": 20, "barriers/export": 60},
+    )
+    def test_get_timeout(self):
+        assert get_timeout("whoami") == (3, 15)
+        assert get_timeout("barriers/1") == (3, 20)
+        assert get_timeout("/barriers/export") == (3, 60)
+        assert get_timeout("barriers-export") == (3, 15)
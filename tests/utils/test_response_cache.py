@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from mock import Mock, patch
+
+from utils.api.cache import NOT_MODIFIED, ResponseCache, get_cache_stats
+from utils.api.client import MarketAccessAPIClient
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ResponseCacheTestCase(TestCase):
+    """
+    Test the shared API response cache
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.response_cache = ResponseCache("commodities", timeout=60, stale_timeout=60)
+        self.fetch = Mock(return_value=({"code": "1"}, '"etag-1"'))
+
+    def age_entry(self, seconds):
+        key = self.response_cache.make_key("commodities", {})
+        entry = cache.get(key)
+        entry["fetched_at"] -= seconds
+        cache.set(key, entry)
+
+    def test_miss_then_hit(self):
+        assert self.response_cache.get("commodities", {}, self.fetch) == {"code": "1"}
+        assert self.response_cache.get("commodities", {}, self.fetch) == {"code": "1"}
+        assert self.fetch.call_count == 1
+        stats = get_cache_stats(["commodities"])["commodities"]
+        assert stats["miss"] == 1
+        assert stats["hit"] == 1
+
+    def test_expired_entry_is_revalidated_with_etag(self):
+        self.response_cache.get("commodities", {}, self.fetch)
+        self.age_entry(200)
+        self.fetch.return_value = (NOT_MODIFIED, '"etag-1"')
+
+        assert self.response_cache.get("commodities", {}, self.fetch) == {"code": "1"}
+        self.fetch.assert_called_with('"etag-1"')
+        assert get_cache_stats(["commodities"])["commodities"]["revalidated"] == 1
+
+    @patch("utils.api.cache.threading.Thread")
+    def test_stale_entry_is_served_while_revalidating(self, mock_thread):
+        self.response_cache.get("commodities", {}, self.fetch)
+        self.age_entry(90)
+
+        assert self.response_cache.get("commodities", {}, self.fetch) == {"code": "1"}
+        assert self.fetch.call_count == 1
+        mock_thread.return_value.start.assert_called_once()
+        assert get_cache_stats(["commodities"])["commodities"]["stale"] == 1
+
+    @patch("utils.api.client.get_session")
+    def test_client_sends_if_none_match(self, mock_get_session):
+        response = Mock(status_code=200, headers={"ETag": '"abc"'})
+        response.json.return_value = {"results": [], "count": 0}
+        mock_get_session().request.return_value = response
+
+        client = MarketAccessAPIClient("token")
+        client.commodities.list(codes="123456")
+        key = ResponseCache("commodities", 1).make_key(
+            "commodities", {"codes": "123456"}
+        )
+        entry = cache.get(key)
+        entry["fetched_at"] = 0
+        cache.set(key, entry)
+
+        response.status_code = 304
+        assert client.commodities.list(codes="123456").total_count == 0
+        headers = mock_get_session().request.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"abc"'
@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from mock import Mock, patch
+
+from barriers.models import Barrier
+from utils.api.client import MarketAccessAPIClient
+from utils.api.search_cache import SearchResultCache
+from utils.models import ModelList
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    BARRIER_SEARCH_CACHE_TIME=60,
+    BARRIER_SEARCH_PREFETCH=False,
+)
+class SearchResultCacheTestCase(TestCase):
+    """
+    Test the per user search result cache
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.search_cache = SearchResultCache("barriers", "token", Barrier)
+        self.fetch = Mock(
+            return_value=ModelList(Barrier, [{"id": "1"}, {"id": "2"}], 5)
+        )
+
+    def test_miss_then_hit(self):
+        params = {"limit": 2, "offset": 0, "status": ["2", "1"], "text": "steel"}
+        self.search_cache.get(params, self.fetch)
+        barriers = self.search_cache.get(params, self.fetch)
+
+        assert self.fetch.call_count == 1
+        assert [barrier.id for barrier in barriers] == ["1", "2"]
+        assert barriers.total_count == 5
+
+    def test_params_are_normalized(self):
+        self.search_cache.get({"limit": 2, "status": ["1", "2"]}, self.fetch)
+        self.search_cache.get({"status": ["2", "1"], "limit": 2}, self.fetch)
+        assert self.fetch.call_count == 1
+
+    def test_pages_and_users_are_cached_separately(self):
+        self.search_cache.get({"limit": 2, "offset": 0}, self.fetch)
+        self.search_cache.get({"limit": 2, "offset": 2}, self.fetch)
+        other_user_cache = SearchResultCache("barriers", "other", Barrier)
+        other_user_cache.get({"limit": 2, "offset": 0}, self.fetch)
+        assert self.fetch.call_count == 3
+
+    @patch("utils.api.client.get_session")
+    def test_barrier_changes_invalidate_results(self, mock_get_session):
+        response = Mock(status_code=200)
+        response.json.return_value = {}
+        mock_get_session().request.return_value = response
+        client = MarketAccessAPIClient("token")
+
+        self.search_cache.get({"limit": 2}, self.fetch)
+        client.saved_searches.patch(id="1", filters={})
+        self.search_cache.get({"limit": 2}, self.fetch)
+        assert self.fetch.call_count == 1
+
+        client.barriers.patch(id="1", title="New title")
+        self.search_cache.get({"limit": 2}, self.fetch)
+        assert self.fetch.call_count == 2
+
+        client.economic_assessments.create(barrier_id="1")
+        self.search_cache.get({"limit": 2}, self.fetch)
+        assert self.fetch.call_count == 3
+
+    @override_settings(BARRIER_SEARCH_PREFETCH=True)
+    @patch("utils.api.search_cache.threading.Thread")
+    def test_next_page_is_prefetched(self, mock_thread):
+        self.search_cache.get({"limit": 2, "offset": 0}, self.fetch)
+        mock_thread.return_value.start.assert_called_once()
+
+        run = mock_thread.call_args[1]["target"]
+        run()
+        self.fetch.assert_called_with({"limit": 2, "offset": 2})
+
+        self.search_cache.get({"limit": 2, "offset": 2}, self.fetch)
+        assert self.fetch.call_count == 2
+
+    @override_settings(BARRIER_SEARCH_PREFETCH=True)
+    @patch("utils.api.search_cache.threading.Thread")
+    def test_last_page_is_not_prefetched(self, mock_thread):
+        self.search_cache.get({"limit": 2, "offset": 4}, self.fetch)
+        assert mock_thread.called is False
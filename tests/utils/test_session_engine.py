@@ -0,0 +1,67 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from mock import patch
+
+from utils.session_engine import (
+    CompactJSONSerializer,
+    SessionStore,
+    get_key_sizes,
+)
+
+
+@override_settings(SESSION_COMPRESS_MIN_SIZE=100)
+class CompactJSONSerializerTestCase(TestCase):
+    def test_small_data_is_not_compressed(self):
+        data = CompactJSONSerializer().dumps({"sso_token": "abc"})
+        assert data == b'j{"sso_token":"abc"}'
+        assert CompactJSONSerializer().loads(data) == {"sso_token": "abc"}
+
+    def test_large_data_is_compressed(self):
+        session_data = {"user_data": {"permissions": ["change_barrier"] * 50}}
+        data = CompactJSONSerializer().dumps(session_data)
+        assert data.startswith(b"z")
+        assert len(data) < 100
+        assert CompactJSONSerializer().loads(data) == session_data
+
+
+@override_settings(SESSION_SIZE_WARNING=1000)
+class SessionStoreTestCase(TestCase):
+    def setUp(self):
+        caches["sessions"].clear()
+        self.session = SessionStore()
+        self.session["sso_token"] = "abc"
+        self.session.save()
+
+    def test_session_round_trip(self):
+        session = SessionStore(self.session.session_key)
+        assert session["sso_token"] == "abc"
+        assert session.size == len(b'j{"sso_token":"abc"}')
+
+    def test_unchanged_session_is_not_saved(self):
+        session = SessionStore(self.session.session_key)
+        session["sso_token"] = "abc"
+        assert session.modified is True
+
+        with patch.object(session._cache, "set") as mock_set:
+            session.save()
+            assert mock_set.called is False
+
+            session["sso_token"] = "def"
+            session.save()
+            assert mock_set.called is True
+
+    def test_deleted_session_is_reset(self):
+        session = SessionStore(self.session.session_key)
+        self.session.delete()
+        assert session.load() == {}
+        assert session.session_key is None
+
+    @override_settings(SESSION_COMPRESS_MIN_SIZE=10000)
+    def test_large_session_is_logged(self):
+        self.session["barrier"] = {"summary": "x" * 1000}
+        with self.assertLogs("utils.session_engine", level="WARNING") as logs:
+            self.session.save()
+        assert "largest keys: [('barrier', " in logs.output[0]
+
+    def test_key_sizes(self):
+        assert get_key_sizes({"a": "1", "b": ["1", "2"]}) == {"b": 9, "a": 3}
@@ -0,0 +1,55 @@
+from http.cookiejar import Cookie
+
+from django.test import TestCase, override_settings
+from mock import patch
+
+from utils.api.transport import build_session, close_session, get_session
+
+
+class TransportTestCase(TestCase):
+    """
+    Test the shared HTTP session
+    """
+
+    def tearDown(self):
+        close_session()
+
+    def test_session_is_shared(self):
+        assert get_session() is get_session()
+
+    def test_new_session_after_fork(self):
+        session = get_session()
+        with patch("utils.api.transport.os.getpid", return_value=-1):
+            assert get_session() is not session
+
+    @override_settings(HTTP_POOL_MAXSIZE=7, HTTP_POOL_BLOCK=True)
+    def test_pool_settings(self):
+        adapter = build_session().get_adapter("https://example.com/")
+        assert adapter._pool_maxsize == 7
+        assert adapter._pool_block is True
+
+    @override_settings(HTTP_KEEP_ALIVE=False)
+    def test_keep_alive_disabled(self):
+        assert build_session().headers["Connection"] == "close"
+
+    def test_cookies_are_not_stored(self):
+        session = build_session()
+        cookie = Cookie(
+            version=0,
+            name="sessionid",
+            value="abc",
+            port=None,
+            port_specified=False,
+            domain="example.com",
+            domain_specified=False,
+            domain_initial_dot=False,
+            path="/",
+            path_specified=True,
+            secure=False,
+            expires=None,
+            discard=True,
+            comment=None,
+            comment_url=None,
+            rest={},
+        )
+        assert session.cookies._policy.set_ok(cookie, None) is False
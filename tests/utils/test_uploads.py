@@ -0,0 +1,92 @@
+import io
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from mock import Mock, patch
+from requests.exceptions import HTTPError
+
+from utils.exceptions import FileUploadError
+from utils.uploads import (
+    UPLOAD_FAILED,
+    ChunkedFile,
+    get_upload_status,
+    upload_in_background,
+    upload_to_s3,
+)
+
+
+def mock_response(status_code):
+    response = Mock(status_code=status_code)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = HTTPError(response=response)
+    return response
+
+
+class ImmediateExecutor:
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+@override_settings(
+    S3_UPLOAD_CHUNK_SIZE=4,
+    S3_UPLOAD_RETRIES=2,
+    S3_UPLOAD_RETRY_DELAY=0,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+@patch("utils.uploads.get_session")
+class UploadsTestCase(TestCase):
+    """
+    Test streaming document uploads to S3
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_chunked_file(self, mock_get_session):
+        body = ChunkedFile(io.BytesIO(b"0123456789"), 4)
+        assert len(body) == 10
+        assert list(body) == [b"0123", b"4567", b"89"]
+        assert list(body) == [b"0123", b"4567", b"89"]
+
+    def test_upload_is_streamed(self, mock_get_session):
+        mock_get_session().put.return_value = mock_response(200)
+        upload_to_s3("someurl", io.BytesIO(b"0123456789"))
+        body = mock_get_session().put.call_args[1]["data"]
+        assert isinstance(body, ChunkedFile)
+        assert len(body) == 10
+
+    def test_server_errors_are_retried(self, mock_get_session):
+        mock_get_session().put.side_effect = [
+            mock_response(503),
+            mock_response(200),
+        ]
+        upload_to_s3("someurl", io.BytesIO(b"data"))
+        assert mock_get_session().put.call_count == 2
+
+    def test_client_errors_are_not_retried(self, mock_get_session):
+        mock_get_session().put.return_value = mock_response(403)
+        with self.assertRaises(FileUploadError):
+            upload_to_s3("someurl", io.BytesIO(b"data"))
+        assert mock_get_session().put.call_count == 1
+
+    def test_gives_up_after_retries(self, mock_get_session):
+        mock_get_session().put.return_value = mock_response(500)
+        with self.assertRaises(FileUploadError):
+            upload_to_s3("someurl", io.BytesIO(b"data"))
+        assert mock_get_session().put.call_count == 3
+
+    @patch("utils.uploads.get_executor", return_value=ImmediateExecutor())
+    def test_upload_in_background(self, mock_get_executor, mock_get_session):
+        mock_get_session().put.return_value = mock_response(200)
+        on_complete = Mock()
+        upload_in_background("1", "someurl", io.BytesIO(b"data"), on_complete)
+        on_complete.assert_called_once()
+        assert get_upload_status("1") is None
+
+    @patch("utils.uploads.get_executor", return_value=ImmediateExecutor())
+    def test_failed_background_upload(self, mock_get_executor, mock_get_session):
+        mock_get_session().put.return_value = mock_response(403)
+        on_complete = Mock()
+        upload_in_background("1", "someurl", io.BytesIO(b"data"), on_complete)
+        assert on_complete.called is False
+        assert get_upload_status("1") == UPLOAD_FAILED
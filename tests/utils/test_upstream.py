@@ -0,0 +1,59 @@
+from django.test import TestCase
+from mock import Mock, patch
+
+from utils.api.client import MarketAccessAPIClient
+from utils.upstream import CallRecorder, get_path_template, record_calls, timed_call
+
+
+class UpstreamCallTestCase(TestCase):
+    def test_path_template(self):
+        assert get_path_template(
+            "barriers/38ab3bed-fc19-4770-9c12-9e26667efbc5/history"
+        ) == ("/barriers/{id}/history")
+        assert get_path_template("barriers/members/12") == "/barriers/members/{id}"
+        assert get_path_template("user/search/?autocomplete=a") == "/user/search/"
+        assert get_path_template("/v4/public/company/1/") == "/v4/public/company/{id}/"
+
+    def test_calls_are_only_recorded_with_a_recorder(self):
+        with timed_call("api", "get", "whoami") as call:
+            call.status = 200
+
+        with record_calls() as recorder:
+            with timed_call("api", "get", "whoami") as call:
+                call.status = 200
+        assert [(c.service, c.method, c.path, c.status) for c in recorder.calls] == [
+            ("api", "GET", "/whoami", 200)
+        ]
+
+    def test_summaries(self):
+        recorder = CallRecorder()
+        recorder.record("api", "get", "barriers/1", 200, 0.1)
+        recorder.record("api", "get", "barriers/2", 200, 0.2)
+        recorder.record("api", "patch", "barriers/2", 400, 0.05)
+        recorder.record("redis", "get", "metadata:version", None, 0.001)
+
+        assert recorder.get_services() == {
+            "api": {"count": 3, "duration_ms": 350.0},
+            "redis": {"count": 1, "duration_ms": 1.0},
+        }
+        endpoints = recorder.get_endpoints()
+        assert endpoints[0]["path"] == "/barriers/{id}"
+        assert endpoints[0]["count"] == 2
+        assert endpoints[0]["duration_ms"] == 300.0
+        assert recorder.get_server_timing(0.5) == (
+            'api;dur=350.0;desc="3 calls", redis;dur=1.0;desc="1 calls", '
+            "total;dur=500.0"
+        )
+
+    @patch("utils.api.client.get_session")
+    def test_client_records_calls(self, mock_get_session):
+        response = Mock(status_code=200)
+        response.json.return_value = {"id": "1"}
+        mock_get_session().request.return_value = response
+
+        with record_calls() as recorder:
+            MarketAccessAPIClient("token").get("barriers/1")
+
+        assert recorder.calls[0].service == "api"
+        assert recorder.calls[0].path == "/barriers/{id}"
+        assert recorder.calls[0].status == 200
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the history diff modes on summary sized text.
+
+Usage: python tools/diff_benchmark.py [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.diff import diff_match_patch  # noqa: E402
+
+WORDS = (
+    "barrier exporters import tariff quota licence regulation customs market "
+    "goods services pork poultry dairy steel certification standards trade "
+    "agreement government ministry consignment registration inspection days "
+    "costs delays uk businesses products requirements the of and to a in for "
+    "is on that by with as are from this be at"
+).split()
+
+
+def make_paragraph(rng, sentences):
+    text = []
+    for _ in range(sentences):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+        text.append(sentence.capitalize() + ".")
+    return " ".join(text)
+
+
+def edit(rng, text, edits):
+    words = text.split(" ")
+    for _ in range(edits):
+        index = rng.randrange(len(words))
+        action = rng.choice(("replace", "insert", "delete"))
+        if action == "replace":
+            words[index] = rng.choice(WORDS)
+        elif action == "insert":
+            words.insert(index, rng.choice(WORDS))
+        elif len(words) > 1:
+            del words[index]
+    return " ".join(words)
+
+
+def make_pairs(seed=1):
+    """
+    Pairs of (old, new) text, from a short note to a long summary.
+    """
+    rng = random.Random(seed)
+    pairs = {}
+    for name, paragraphs, edits in (
+        ("note", 1, 3),
+        ("summary", 4, 10),
+        ("long summary", 12, 40),
+    ):
+        old = "\n\n".join(make_paragraph(rng, 5) for _ in range(paragraphs))
+        pairs[name] = (old, edit(rng, old, edits))
+    return pairs
+
+
+def char_mode(old, new):
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = 0
+    diffs = dmp.diff_main(old, new)
+    dmp.diff_cleanupSemantic(diffs)
+    return dmp.diff_prettyHtml(diffs)
+
+
+def word_mode(old, new):
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = 0
+    diffs = dmp.diff_wordMode(old, new)
+    dmp.diff_cleanupSemantic(diffs)
+    return dmp.diff_prettyHtml(diffs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'text':<14}{'chars':>8}{'char mode':>12}{'word mode':>12}{'speedup':>9}")
+    for name, (old, new) in make_pairs().items():
+        timings = [
+            min(timeit.repeat(lambda: mode(old, new), number=1, repeat=args.repeat))
+            for mode in (char_mode, word_mode)
+        ]
+        print(
+            f"{name:<14}{len(old):>8}"
+            f"{timings[0] * 1000:>10.2f}ms{timings[1] * 1000:>10.2f}ms"
+            f"{timings[0] / timings[1]:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
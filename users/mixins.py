@@ -33,7 +33,7 @@ class UserSearchMixin:
 
     @property
     def client(self):
-        return MarketAccessAPIClient(self.request.session.get("sso_token"))
+        return self.request.api_client
 
     def form_valid(self, form):
         if self.request.POST.get("action") == "add":
@@ -162,10 +162,7 @@ class ManageUsers(
         context_data["page"] = "manage-users"
         context_data["groups"] = client.groups.list()
         if group_id is None:
-            users = client.users.list(
-                limit=self.get_pagination_limit(),
-                offset=self.get_pagination_offset(),
-            )
+            users = client.users.list(**self.get_pagination_params())
             context_data["users"] = users
             context_data["pagination"] = self.get_pagination_data(object_list=users)
         else:
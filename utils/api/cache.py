@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+NOT_MODIFIED = object()
+
+CACHE_EVENTS = ("hit", "stale", "miss", "revalidated")
+
+
+class ResponseCache:
+    """
+    Shared read-through cache of API responses, stored in the django cache.
+
+    Entries are fresh for `timeout` seconds. For a further `stale_timeout`
+    seconds a stale entry is still returned while it is revalidated in the
+    background. After that the entry is revalidated before returning.
+
+    Revalidation sends If-None-Match with the stored ETag, so an unchanged
+    resource costs the API a 304 rather than a full response.
+    """
+
+    key_prefix = "api_response"
+    stats_prefix = "api_cache_stats"
+    revalidation_lock_timeout = 30
+
+    def __init__(self, name, timeout, stale_timeout=None):
+        self.name = name
+        self.timeout = timeout
+        if stale_timeout is None:
+            stale_timeout = settings.API_CACHE_STALE_TIME
+        self.stale_timeout = stale_timeout
+
+    def make_key(self, path, params=None):
+        raw_key = json.dumps(
+            [path.strip("/"), params or {}], sort_keys=True, default=str
+        )
+        digest = hashlib.md5(raw_key.encode()).hexdigest()
+        return f"{self.key_prefix}:{self.name}:{digest}"
+
+    def get(self, path, params, fetch):
+        """
+        Get the response data for path and params.
+
+        fetch(etag) is called on a miss and should return a tuple of
+        (data, etag), with data set to NOT_MODIFIED if the API said 304.
+        """
+        key = self.make_key(path, params)
+        entry = cache.get(key)
+
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age < self.timeout:
+                self.record("hit")
+                return entry["data"]
+            if age < self.timeout + self.stale_timeout:
+                self.record("stale")
+                self.revalidate_in_background(key, entry, fetch)
+                return entry["data"]
+
+        self.record("miss")
+        return self.revalidate(key, entry, fetch)["data"]
+
+    def revalidate(self, key, entry, fetch):
+        etag = entry.get("etag") if entry else None
+        data, new_etag = fetch(etag)
+
+        if data is NOT_MODIFIED and entry is not None:
+            self.record("revalidated")
+            entry["fetched_at"] = time.time()
+        else:
+            entry = {"data": data, "etag": new_etag, "fetched_at": time.time()}
+
+        cache.set(key, entry, self.timeout + self.stale_timeout)
+        return entry
+
+    def revalidate_in_background(self, key, entry, fetch):
+        # Only one process revalidates a given entry at a time
+        if not cache.add(f"{key}:revalidating", 1, self.revalidation_lock_timeout):
+            return
+
+        def run():
+            try:
+                self.revalidate(key, entry, fetch)
+            except Exception as e:
+                logger.warning(f"Background revalidation of {key} failed: {e}")
+            finally:
+                cache.delete(f"{key}:revalidating")
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def record(self, event):
+        key = f"{self.stats_prefix}:{self.name}:{event}"
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_cache_stats(names):
+    """
+    Get the hit/miss counters for each named cache.
+
+    :param names: iterable of cache names, e.g. resource names
+    :return: DICT - {name: {"hit": 1, "stale": 0, "miss": 2, ...}}
+    """
+    keys = {
+        f"{ResponseCache.stats_prefix}:{name}:{event}": (name, event)
+        for name in names
+        for event in CACHE_EVENTS
+    }
+    counts = cache.get_many(keys.keys())
+    stats = {name: dict.fromkeys(CACHE_EVENTS, 0) for name in names}
+    for key, (name, event) in keys.items():
+        stats[name][event] = counts.get(key, 0)
+    return stats
@@ -1,10 +1,23 @@
 import logging
+import time
+from http import HTTPStatus
 from json import JSONDecodeError
 
 import requests
 from django.conf import settings
-from utils.exceptions import APIHttpException, APIJsonException
 
+from utils.exceptions import (
+    APIDeadlineExceededException,
+    APIHttpException,
+    APIJsonException,
+)
+from utils.upstream import timed_call
+
+from .cache import NOT_MODIFIED, ResponseCache
+from .concurrency import gather
+from .deadline import fit_timeout, has_time_for
+from .request_cache import RequestCache, get_request_cache
+from .resilience import get_breaker, get_retry_budget, get_timeout
 from .resources import (
     BarriersResource,
     CommoditiesResource,
@@ -23,11 +36,25 @@ from .resources import (
     StrategicAssessmentResource,
     UsersResource,
 )
+from .search_cache import invalidate_search_results
+from .transport import get_session
 
 logger = logging.getLogger(__name__)
 
 
 class MarketAccessAPIClient:
+    retry_status_codes = (
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    )
+    # Resources whose changes can alter the results of a barrier search
+    search_resources = ("barriers",) + tuple(
+        resource
+        for resource, related in RequestCache.related_resources.items()
+        if "barriers" in related
+    )
+
     def __init__(self, token=None, **kwargs):
         self.token = token or settings.TRUSTED_USER_TOKEN
         self.barriers = BarriersResource(self)
@@ -47,14 +74,32 @@ class MarketAccessAPIClient:
         self.mentions = MentionResource(self)
         self.notification_exclusion = NotificationExclusionResource(self)
 
+    def gather(self, *calls):
+        """
+        Run independent resource calls concurrently, returning results in order.
+
+        e.g. barrier, notes = client.gather(
+            partial(client.barriers.get, id=barrier_id),
+            partial(client.notes.list, barrier_id=barrier_id),
+        )
+        """
+        return gather(*calls)
+
     def request(self, method, path, **kwargs):
         url = f"{settings.MARKET_ACCESS_API_URI}{path}"
         headers = {
             "Authorization": f"Bearer {self.token}",
             "X-User-Agent": "",
             "X-Forwarded-For": "",
+            **kwargs.pop("headers", {}),
         }
-        response = getattr(requests, method)(url, headers=headers, **kwargs)
+        if method != "get":
+            cache = get_request_cache()
+            if cache is not None:
+                cache.invalidate(path)
+
+        kwargs.setdefault("timeout", get_timeout(path))
+        response = self.send(method, path, url, headers=headers, **kwargs)
 
         try:
             response.raise_for_status()
@@ -62,14 +107,126 @@ class MarketAccessAPIClient:
             logger.warning(e)
             raise APIHttpException(e, response)
 
+        if method != "get" and RequestCache.get_resource(path) in self.search_resources:
+            invalidate_search_results()
+
         return response
 
-    def get(self, path, raw=False, **kwargs):
-        response = self.request("get", path, **kwargs)
+    def send(self, method, path, url, **kwargs):
+        """
+        Send a request through the API's circuit breaker.
+
+        Connection errors, timeouts and 502, 503 or 504 responses count
+        against the breaker. Other errors are down to the endpoint rather
+        than the API as a whole, so they don't. GETs are retried after a
+        connection error or a 502, 503 or 504 while the retry budget
+        allows. Read timeouts are not retried, as the API is most likely
+        just slow.
+
+        Each attempt's timeout is shrunk to fit the request's deadline. A
+        shrunk timeout running out raises APIDeadlineExceededException and
+        isn't held against the breaker.
+        """
+        breaker = get_breaker("api")
+        retry_budget = get_retry_budget("api")
+        retry_budget.deposit()
+        timeout = kwargs.pop("timeout")
+        attempt = 0
+
+        while True:
+            attempt_timeout = fit_timeout(timeout)
+            is_trial = breaker.before_call()
+            try:
+                with timed_call("api", method, path) as call:
+                    response = get_session().request(
+                        method, url, timeout=attempt_timeout, **kwargs
+                    )
+                    call.status = response.status_code
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if (
+                    isinstance(e, requests.exceptions.Timeout)
+                    and attempt_timeout != timeout
+                ):
+                    # Cut short by the request's deadline, not the API's fault
+                    raise APIDeadlineExceededException(
+                        f"Request deadline reached during {method.upper()} {path}"
+                    ) from e
+                breaker.record_failure()
+                retryable = isinstance(e, requests.exceptions.ConnectionError)
+                if not self.can_retry(method, attempt, retryable, retry_budget):
+                    raise
+            else:
+                if response.status_code not in self.retry_status_codes:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if not self.can_retry(method, attempt, True, retry_budget):
+                    return response
+                response.close()
+            finally:
+                if is_trial:
+                    breaker.release_trial()
+
+            attempt += 1
+            logger.warning(f"Retrying {method.upper()} {path} (attempt {attempt})")
+            time.sleep(self.get_backoff(attempt))
+
+    def get_backoff(self, attempt):
+        return settings.API_RETRY_BACKOFF * 2 ** (attempt - 1)
+
+    def can_retry(self, method, attempt, retryable, retry_budget):
+        return (
+            retryable
+            and method == "get"
+            and attempt < settings.API_MAX_RETRIES
+            and has_time_for(self.get_backoff(attempt + 1))
+            and retry_budget.withdraw()
+        )
+
+    def get(self, path, raw=False, cache_timeout=None, **kwargs):
+        """
+        GET a path from the API, returning the json data.
+
+        :param raw: return the response object instead of the json data
+        :param cache_timeout: opt in to the shared response cache, see
+            ResponseCache. Only use for data that is the same for all users.
+        """
+        cache = get_request_cache()
+        cache_key = None
+        if cache is not None and not raw and set(kwargs) <= {"params"}:
+            cache_key = cache.make_key(self.token, path, kwargs.get("params"))
+            if cache_key in cache:
+                return cache.get(cache_key)
 
         if raw:
-            return response
+            return self.request("get", path, **kwargs)
+
+        if cache_timeout:
+            response_data = self.get_from_shared_cache(path, cache_timeout, **kwargs)
+        else:
+            response_data = self.get_json(self.request("get", path, **kwargs))
+
+        if cache_key is not None:
+            cache.set(cache_key, response_data)
+        return response_data
+
+    def get_from_shared_cache(self, path, cache_timeout, params=None):
+        def fetch(etag):
+            headers = {"If-None-Match": etag} if etag else {}
+            response = self.request("get", path, params=params, headers=headers)
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                return NOT_MODIFIED, etag
+            return self.get_json(response), response.headers.get("ETag")
+
+        response_cache = ResponseCache(
+            name=RequestCache.get_resource(path), timeout=cache_timeout
+        )
+        return response_cache.get(path, params, fetch)
 
+    def get_json(self, response):
         try:
             return response.json()
         except JSONDecodeError:
@@ -0,0 +1,105 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+
+from utils.exceptions import APICircuitOpenException, APIDeadlineExceededException
+
+logger = logging.getLogger(__name__)
+
+# Failures an optional call is allowed to have, i.e. running out of time
+# or the upstream service being unavailable
+DEGRADABLE_EXCEPTIONS = (
+    APICircuitOpenException,
+    APIDeadlineExceededException,
+    requests.exceptions.Timeout,
+)
+
+
+def is_gevent_patched():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("socket")
+
+
+def gather(*calls):
+    """
+    Run independent calls at the same time and return their results in order.
+
+    Each call is a callable taking no arguments, e.g. a functools.partial
+    wrapping a resource method. Greenlets are used when running under
+    gevent, otherwise a short lived thread pool.
+
+    Every call is allowed to finish. If any of them raised, the exception
+    from the first failing call (in argument order) is re-raised.
+    """
+    if not calls:
+        return []
+
+    max_workers = min(len(calls), settings.API_MAX_CONCURRENT_CALLS)
+    if max_workers <= 1:
+        return [call() for call in calls]
+
+    if is_gevent_patched():
+        outcomes = _gather_greenlets(calls, max_workers)
+    else:
+        outcomes = _gather_threads(calls, max_workers)
+
+    results = []
+    for result, exception in outcomes:
+        if exception is not None:
+            raise exception
+        results.append(result)
+    return results
+
+
+def optional(call, default=None):
+    """
+    Wrap a call for an optional part of a page, so running out of time
+    returns default rather than failing the whole page.
+
+    e.g. mentions, barriers = gather(
+        optional(client.mentions.list, default=[]),
+        client.barriers.list,
+    )
+    """
+
+    def run_optional():
+        try:
+            return call()
+        except DEGRADABLE_EXCEPTIONS as e:
+            logger.warning(f"Optional call failed, using default instead: {e!r}")
+            return default
+
+    return run_optional
+
+
+def _run(call):
+    try:
+        return call(), None
+    except Exception as e:
+        return None, e
+
+
+def _gather_greenlets(calls, max_workers):
+    from gevent.pool import Pool
+
+    pool = Pool(max_workers)
+    greenlets = [
+        pool.spawn(contextvars.copy_context().run, _run, call) for call in calls
+    ]
+    pool.join()
+    return [greenlet.value for greenlet in greenlets]
+
+
+def _gather_threads(calls, max_workers):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, _run, call)
+            for call in calls
+        ]
+        return [future.result() for future in futures]
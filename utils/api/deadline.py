@@ -0,0 +1,71 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+from utils.exceptions import APIDeadlineExceededException
+
+_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+# Don't start an upstream call with less time than this left
+MIN_CALL_TIME = 0.1
+
+
+def start_deadline(budget, started_at=None):
+    """
+    Give the current request budget seconds from started_at to finish.
+
+    :return: token to pass to end_deadline
+    """
+    if started_at is None:
+        started_at = time.monotonic()
+    return _deadline.set(started_at + budget)
+
+
+def end_deadline(token):
+    _deadline.reset(token)
+
+
+@contextmanager
+def request_deadline(budget):
+    token = start_deadline(budget)
+    try:
+        yield
+    finally:
+        end_deadline(token)
+
+
+def get_remaining_time():
+    """
+    Seconds left before the request's deadline, or None without one.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def has_time_for(seconds):
+    remaining = get_remaining_time()
+    return remaining is None or remaining - seconds >= MIN_CALL_TIME
+
+
+def fit_timeout(timeout):
+    """
+    Shrink a requests timeout, (connect, read) or a number, so an upstream
+    call can't run past the request's deadline.
+
+    Raises APIDeadlineExceededException if there's too little time left
+    to make the call at all.
+    """
+    remaining = get_remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining < MIN_CALL_TIME:
+        raise APIDeadlineExceededException(
+            "Request deadline reached, not making any more upstream calls"
+        )
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
@@ -0,0 +1,80 @@
+import contextvars
+import copy
+from contextlib import contextmanager
+
+_request_cache = contextvars.ContextVar("api_request_cache", default=None)
+
+
+class RequestCache:
+    """
+    Memoizes API GET responses for the lifetime of a single request.
+
+    Entries are keyed on token, path and params. A mutation invalidates
+    every entry for the same top level resource (e.g. "barriers" for
+    "barriers/<id>/members") and for any resources that embed its data.
+    """
+
+    related_resources = {
+        "barriers": ("public-barriers", "reports", "saved-searches"),
+        "economic-assessments": ("barriers",),
+        "economic-impact-assessments": ("barriers",),
+        "public-barrier-notes": ("public-barriers",),
+        "public-barriers": ("barriers",),
+        "reports": ("barriers",),
+        "resolvability-assessments": ("barriers",),
+        "strategic-assessments": ("barriers",),
+        "users": ("whoami",),
+        "whoami": ("users",),
+    }
+
+    def __init__(self):
+        self.responses = {}
+
+    @classmethod
+    def get_resource(cls, path):
+        return path.strip("/").split("/", 1)[0]
+
+    @classmethod
+    def make_key(cls, token, path, params=None):
+        params = tuple(
+            sorted((key, str(value)) for key, value in (params or {}).items())
+        )
+        return (token, path.strip("/"), params)
+
+    def get(self, key):
+        try:
+            return copy.deepcopy(self.responses[key])
+        except KeyError:
+            return None
+
+    def __contains__(self, key):
+        return key in self.responses
+
+    def set(self, key, data):
+        self.responses[key] = copy.deepcopy(data)
+
+    def invalidate(self, path):
+        resource = self.get_resource(path)
+        resources = (resource,) + self.related_resources.get(resource, ())
+        for key in list(self.responses):
+            if self.get_resource(key[1]) in resources:
+                self.responses.pop(key, None)
+
+    def clear(self):
+        self.responses.clear()
+
+
+def get_request_cache():
+    return _request_cache.get()
+
+
+@contextmanager
+def request_cache():
+    """
+    Activate a fresh RequestCache for the duration of the block.
+    """
+    token = _request_cache.set(RequestCache())
+    try:
+        yield _request_cache.get()
+    finally:
+        _request_cache.reset(token)
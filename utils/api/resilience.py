@@ -0,0 +1,185 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from utils.exceptions import APICircuitOpenException
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_state = {}
+_state_pid = None
+
+
+def get_timeout(path):
+    """
+    Get the (connect, read) timeout for an API path.
+
+    The read timeout comes from the longest API_READ_TIMEOUTS prefix that
+    the path starts with, e.g. "barriers/export" or "barriers", falling
+    back to API_READ_TIMEOUT.
+    """
+    path = path.strip("/")
+    read_timeout = settings.API_READ_TIMEOUT
+    matched = ""
+    for prefix, timeout in settings.API_READ_TIMEOUTS.items():
+        if len(prefix) > len(matched) and (
+            path == prefix or path.startswith(f"{prefix}/")
+        ):
+            read_timeout = timeout
+            matched = prefix
+    return (settings.UPSTREAM_CONNECT_TIMEOUT, read_timeout)
+
+
+class CircuitBreaker:
+    """
+    Fails calls to an upstream service fast once it looks unhealthy.
+
+    After failure_threshold failures in a row the circuit opens and calls
+    raise APICircuitOpenException without being made. Once recovery_time
+    seconds have passed a single trial call is let through. If it works
+    the circuit closes again, otherwise it stays open for another
+    recovery_time.
+    """
+
+    def __init__(self, name, failure_threshold, recovery_time):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_progress = False
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def before_call(self):
+        """
+        :return: BOOL - True if this is the trial call, in which case
+                 release_trial must be called once it has finished
+        :raises APICircuitOpenException: if the circuit is open
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return False
+            recovering = time.monotonic() - self.opened_at >= self.recovery_time
+            if not recovering or self.trial_in_progress:
+                raise APICircuitOpenException(
+                    f"{self.name} is unavailable, not calling it for now"
+                )
+            self.trial_in_progress = True
+            return True
+
+    def release_trial(self):
+        """
+        Let another trial call through, even if this one ended without a
+        success or failure being recorded, e.g. on an unexpected error.
+        """
+        with self.lock:
+            self.trial_in_progress = False
+
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit for {self.name} closed")
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_progress = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_progress = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(
+                        f"Circuit for {self.name} opened after "
+                        f"{self.failures} failures"
+                    )
+                self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the calls made.
+
+    Every call adds ratio to the budget, up to max_retries, and every
+    retry takes one from it. When an upstream service is struggling the
+    budget soon runs out, so retries can't multiply the load on it.
+    """
+
+    def __init__(self, ratio, max_retries):
+        self.ratio = ratio
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.balance = max_retries
+
+    def deposit(self):
+        with self.lock:
+            self.balance = min(self.max_retries, self.balance + self.ratio)
+
+    def withdraw(self):
+        with self.lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+def get_state():
+    """
+    The breakers and retry budgets of this worker, shared by its greenlets.
+    """
+    global _state, _state_pid
+
+    pid = os.getpid()
+    if _state_pid != pid:
+        with _lock:
+            if _state_pid != pid:
+                _state = {}
+                _state_pid = pid
+    return _state
+
+
+def clear_state():
+    global _state, _state_pid
+
+    with _lock:
+        _state = {}
+        _state_pid = None
+
+
+def get_breaker(name):
+    state = get_state()
+    key = ("breaker", name)
+    if key not in state:
+        with _lock:
+            state.setdefault(
+                key,
+                CircuitBreaker(
+                    name,
+                    failure_threshold=settings.API_BREAKER_FAILURE_THRESHOLD,
+                    recovery_time=settings.API_BREAKER_RECOVERY_TIME,
+                ),
+            )
+    return state[key]
+
+
+def get_retry_budget(name):
+    state = get_state()
+    key = ("retry_budget", name)
+    if key not in state:
+        with _lock:
+            state.setdefault(
+                key,
+                RetryBudget(
+                    ratio=settings.API_RETRY_BUDGET_RATIO,
+                    max_retries=settings.API_RETRY_BUDGET_MAX,
+                ),
+            )
+    return state[key]
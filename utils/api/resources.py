@@ -1,6 +1,12 @@
+import heapq
 import time
+from urllib.parse import parse_qs, urlparse
 
 import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import is_aware
+
 from barriers.constants import Statuses
 from barriers.models import (
     Barrier,
@@ -16,27 +22,84 @@ from barriers.models import (
     StrategicAssessment,
 )
 from barriers.models.history.mentions import Mention, NotificationExclusion
-from django.conf import settings
-from django.core.cache import cache
 from reports.models import Report
 from users.models import Group, User
-from utils.exceptions import ScanError
-from utils.models import ModelList
+from utils.exceptions import (
+    APICircuitOpenException,
+    APIDeadlineExceededException,
+    APIHttpException,
+    ScanError,
+)
+from utils.models import ModelList, parse_datetime
+
+from .deadline import get_remaining_time
+from .search_cache import SearchResultCache
+
+
+def get_history_key(data):
+    """
+    Sort key for history items, newest last. Changes made at the same time
+    are told apart by model and field, so the order is stable.
+    """
+    return (
+        parse_datetime(data["date"]),
+        data.get("model") or "",
+        data.get("field") or "",
+    )
+
+
+def get_history_cursor(data):
+    return "|".join((data["date"], data.get("model") or "", data.get("field") or ""))
+
+
+def parse_history_cursor(cursor):
+    """
+    :return: the sort key for a history cursor, or None if it isn't valid
+    """
+    try:
+        date, model, field = cursor.split("|")
+        parsed_date = parse_datetime(date)
+    except (ValueError, OverflowError):
+        return None
+    # History dates are timezone aware and can't be compared with naive ones
+    if not is_aware(parsed_date):
+        return None
+    return (parsed_date, model, field)
+
+
+def get_cursor(url):
+    """
+    Get the cursor from a next or previous page url, if it has one.
+    """
+    if url:
+        return parse_qs(urlparse(url).query).get("cursor", [None])[0]
 
 
 class APIResource:
     resource_name = None
     model = None
+    # Name of the setting holding the shared cache timeout for this resource
+    cache_timeout_setting = None
 
     def __init__(self, client):
         self.client = client
 
+    def get_cache_timeout(self):
+        if self.cache_timeout_setting:
+            return getattr(settings, self.cache_timeout_setting)
+
     def list(self, **kwargs):
-        response_data = self.client.get(self.resource_name, params=kwargs)
+        response_data = self.client.get(
+            self.resource_name,
+            params=kwargs,
+            cache_timeout=self.get_cache_timeout(),
+        )
         return ModelList(
             model=self.model,
             data=response_data["results"],
-            total_count=response_data["count"],
+            total_count=response_data.get("count"),
+            next_cursor=get_cursor(response_data.get("next")),
+            previous_cursor=get_cursor(response_data.get("previous")),
         )
 
     def get(self, id=None, *args, **kwargs):
@@ -44,7 +107,11 @@ class APIResource:
             url = f"{self.resource_name}"
         else:
             url = f"{self.resource_name}/{id}"
-        return self.model(self.client.get(url, *args, **kwargs))
+        return self.model(
+            self.client.get(
+                url, *args, cache_timeout=self.get_cache_timeout(), **kwargs
+            )
+        )
 
     def patch(self, id, *args, **kwargs):
         url = f"{self.resource_name}/{id}"
@@ -66,6 +133,17 @@ class BarriersResource(APIResource):
     resource_name = "barriers"
     model = Barrier
 
+    def search(self, **kwargs):
+        """
+        List barriers matching a search, using the per user search cache.
+        """
+        search_cache = SearchResultCache(
+            name=self.resource_name,
+            token=self.client.token,
+            model=self.model,
+        )
+        return search_cache.get(kwargs, fetch=lambda params: self.list(**params))
+
     def get_activity(self, barrier_id, **kwargs):
         url = f"barriers/{barrier_id}/activity"
         return [
@@ -80,12 +158,40 @@ class BarriersResource(APIResource):
             for result in self.client.get(url, params=kwargs)["history"]
         ]
 
-    def get_full_history(self, barrier_id, **kwargs):
+    def get_full_history(self, barrier_id, limit=None, before=None, **kwargs):
+        """
+        Get a page of a barrier's history, most recent first.
+
+        With a limit the history isn't sorted, just scanned for the newest
+        limit changes, and only those are wrapped in HistoryItem. Pass the
+        next_cursor of a page as before to get the changes older than it.
+        The cursor marks a position in the history rather than a count of
+        items, so changes recorded in between don't shift the next page.
+
+        :return: ModelList with the total number of changes as total_count
+        """
         url = f"barriers/{barrier_id}/full_history"
-        return [
-            HistoryItem(result)
-            for result in self.client.get(url, params=kwargs)["history"]
-        ]
+        history = self.client.get(url, params=kwargs)["history"]
+
+        older = history
+        before_key = parse_history_cursor(before) if before else None
+        if before_key is not None:
+            older = [item for item in history if get_history_key(item) < before_key]
+
+        next_cursor = None
+        if limit is None:
+            newest = sorted(older, key=get_history_key, reverse=True)
+        else:
+            newest = heapq.nlargest(limit, older, key=get_history_key)
+            if len(older) > limit:
+                next_cursor = get_history_cursor(newest[-1])
+
+        return ModelList(
+            model=HistoryItem,
+            data=newest,
+            total_count=len(history),
+            next_cursor=next_cursor,
+        )
 
     def get_team_members(self, barrier_id, **kwargs):
         url = f"barriers/{barrier_id}/members"
@@ -178,31 +284,60 @@ class DocumentsResource(APIResource):
     def complete_upload(self, document_id):
         return self.client.post(f"documents/{document_id}/upload-callback")
 
-    def check_scan_status(self, document_id):
-        max_wait_time = settings.FILE_SCAN_MAX_WAIT_TIME
-        interval = settings.FILE_SCAN_STATUS_CHECK_INTERVAL
+    def get_scan_status(self, document_id):
+        """
+        Check the virus scan status of a document once, without waiting.
 
+        :return: BOOL - True if the file has been scanned and is clean,
+                 False if the scan is still in progress
+        :raises ScanError: if the scan failed or the file may be infected
+        """
         url = f"documents/{document_id}/upload-callback"
-        max_attempts = int(max_wait_time / interval)
+        try:
+            response = self.client.post(url)
+        except (
+            requests.exceptions.HTTPError,
+            APIHttpException,
+            APICircuitOpenException,
+        ):
+            raise ScanError("Unable to get scan status")
+        except APIDeadlineExceededException:
+            raise ScanError("Virus scan took too long")
+
+        if response.get("status") == "virus_scanning_failed":
+            raise ScanError("Unable to virus scan the file")
+        elif response.get("status") == "virus_scanned":
+            if "av_clean" not in response or response.get("av_clean") is True:
+                return True
+            raise ScanError(
+                "This file may be infected with a virus and will not be accepted."
+            )
+        return False
 
-        for i in range(max_attempts):
-            try:
-                response = self.client.post(url)
-            except requests.exceptions.HTTPError:
-                raise ScanError("Unable to get scan status")
-
-            if response.get("status") == "virus_scanning_failed":
-                raise ScanError("Unable to virus scan the file")
-            elif response.get("status") == "virus_scanned":
-                if "av_clean" not in response or response.get("av_clean") is True:
-                    return
-                raise ScanError(
-                    "This file may be infected with a virus and will not be accepted."
-                )
-
-            time.sleep(interval / 1000)
+    def check_scan_status(self, document_id):
+        """
+        Poll the scan status until the scan completes or we run out of time.
+
+        The interval between checks backs off exponentially, starting at
+        FILE_SCAN_STATUS_CHECK_INTERVAL and capped at FILE_SCAN_MAX_CHECK_INTERVAL.
+        It never waits past the request's deadline.
+        """
+        max_wait = settings.FILE_SCAN_MAX_WAIT_TIME / 1000
+        remaining_time = get_remaining_time()
+        if remaining_time is not None:
+            max_wait = min(max_wait, remaining_time)
+        deadline = time.monotonic() + max_wait
+        interval = settings.FILE_SCAN_STATUS_CHECK_INTERVAL
 
-        raise ScanError("Virus scan took too long")
+        while not self.get_scan_status(document_id):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ScanError("Virus scan took too long")
+            time.sleep(min(interval / 1000, remaining))
+            interval = min(
+                interval * settings.FILE_SCAN_BACKOFF_FACTOR,
+                settings.FILE_SCAN_MAX_CHECK_INTERVAL,
+            )
 
     def get_download(self, document_id):
         return self.client.get(f"documents/{document_id}/download")
@@ -211,15 +346,25 @@ class DocumentsResource(APIResource):
 class UsersResource(APIResource):
     resource_name = "users"
     model = User
+    current_user = None
 
     def get_current(self):
-        user_data = self.client.get("whoami")
-        self.update_cached_user_data(user_data)
-        return self.model(user_data)
+        """
+        Get the user the client's token belongs to.
+
+        The user is only fetched once for each client, so for the
+        request's client it is shared by everything handling the request.
+        """
+        if self.current_user is None:
+            user_data = self.client.get("whoami")
+            self.update_cached_user_data(user_data)
+            self.current_user = self.model(user_data)
+        return self.current_user
 
     def patch(self, *args, **kwargs):
         user = super().patch(*args, **kwargs)
         self.update_cached_user_data(user.data)
+        self.current_user = None
         return user
 
     def update_cached_user_data(self, user_data):
@@ -246,11 +391,13 @@ class SavedSearchesResource(APIResource):
 class GroupsResource(APIResource):
     resource_name = "groups"
     model = Group
+    cache_timeout_setting = "GROUPS_CACHE_TIME"
 
 
 class CommoditiesResource(APIResource):
     resource_name = "commodities"
     model = Commodity
+    cache_timeout_setting = "COMMODITIES_CACHE_TIME"
 
 
 class PublicBarrierNotesResource(APIResource):
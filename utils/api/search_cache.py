@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.models import ModelList
+from utils.tools import nested_sort
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "search_results:generation"
+
+
+def get_generation():
+    """
+    Get the current search generation.
+
+    Every cached search result is keyed on the generation it was fetched
+    in, so bumping it makes all of them unreachable at once.
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = int(time.time() * 1000)
+        cache.add(GENERATION_KEY, generation, None)
+    return generation
+
+
+def invalidate_search_results():
+    """
+    Start a new search generation, e.g. after a barrier has been changed.
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, int(time.time() * 1000), None)
+
+
+class SearchResultCache:
+    """
+    Short lived per user cache of search result pages, stored in the django cache.
+
+    Entries are keyed on the user's token, the search generation and the
+    search parameters including limit and offset. Parameters are normalized
+    with nested_sort, so the order of filters and of their values doesn't
+    matter.
+
+    With BARRIER_SEARCH_PREFETCH on, the page after the one asked for is
+    fetched in the background so that paging through results is served
+    from the cache.
+    """
+
+    key_prefix = "search_results"
+    prefetch_lock_timeout = 30
+
+    def __init__(self, name, token, model, timeout=None):
+        self.name = name
+        self.token = token
+        self.model = model
+        if timeout is None:
+            timeout = settings.BARRIER_SEARCH_CACHE_TIME
+        self.timeout = timeout
+
+    def make_key(self, params, generation):
+        raw_key = json.dumps([self.token, nested_sort(params)], default=str)
+        digest = hashlib.md5(raw_key.encode()).hexdigest()
+        return f"{self.key_prefix}:{self.name}:{generation}:{digest}"
+
+    def get(self, params, fetch):
+        """
+        Get a page of search results for params.
+
+        fetch(params) is called on a miss and should return a ModelList.
+        """
+        if not self.timeout:
+            return fetch(params)
+
+        generation = get_generation()
+        key = self.make_key(params, generation)
+        entry = cache.get(key)
+
+        if entry is None:
+            object_list = fetch(params)
+            self.set(key, object_list)
+        else:
+            object_list = ModelList(
+                model=self.model,
+                data=entry["results"],
+                total_count=entry["count"],
+                next_cursor=entry.get("next_cursor"),
+                previous_cursor=entry.get("previous_cursor"),
+            )
+
+        if settings.BARRIER_SEARCH_PREFETCH:
+            self.prefetch_next_page(params, object_list, generation, fetch)
+        return object_list
+
+    def set(self, key, object_list):
+        entry = {
+            "results": object_list.data,
+            "count": object_list.total_count,
+            "next_cursor": object_list.next_cursor,
+            "previous_cursor": object_list.previous_cursor,
+        }
+        cache.set(key, entry, self.timeout)
+
+    def get_next_page_params(self, params, object_list):
+        if object_list.next_cursor:
+            return {**params, "cursor": object_list.next_cursor}
+
+        limit = params.get("limit")
+        if not limit or object_list.total_count is None:
+            return None
+        offset = params.get("offset") or 0
+        if offset + limit >= object_list.total_count:
+            return None
+        return {**params, "offset": offset + limit}
+
+    def prefetch_next_page(self, params, object_list, generation, fetch):
+        next_params = self.get_next_page_params(params, object_list)
+        if next_params is None:
+            return
+
+        key = self.make_key(next_params, generation)
+        if key in cache or not cache.add(
+            f"{key}:prefetching", 1, self.prefetch_lock_timeout
+        ):
+            return
+
+        def run():
+            try:
+                self.set(key, fetch(next_params))
+            except Exception as e:
+                logger.warning(f"Prefetching search results failed: {e}")
+            finally:
+                cache.delete(f"{key}:prefetching")
+
+        threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,75 @@
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+_lock = threading.Lock()
+_session = None
+_session_pid = None
+
+
+class NoCookiesPolicy(DefaultCookiePolicy):
+    """
+    Never store or send cookies.
+
+    The session is shared by every user served by this process, so cookies
+    set by one upstream response must not leak into another user's request.
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+def build_session():
+    session = requests.Session()
+    session.cookies.set_policy(NoCookiesPolicy())
+
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        pool_block=settings.HTTP_POOL_BLOCK,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if not settings.HTTP_KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def get_session():
+    """
+    Get the HTTP session shared by all outbound calls in this process.
+
+    Connections are kept alive and reused between calls, so only the first
+    call to each host pays for the TCP and TLS handshakes. The underlying
+    urllib3 pools are guarded by locks, which gevent's monkey patching makes
+    greenlet aware. A new session is built after a fork so that workers
+    never share sockets with their parent.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = build_session()
+                _session_pid = pid
+    return _session
+
+
+def close_session():
+    global _session, _session_pid
+
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pid = None
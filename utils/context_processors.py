@@ -1,21 +1,39 @@
 from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
 
 from users.models import User
-from utils.api.client import MarketAccessAPIClient
 
 
 def get_user(request):
+    """
+    Get the signed in user, looking them up at most once per request.
+
+    A user the request's client has already fetched from the API, e.g. for
+    APIPermissionMixin, is reused. Otherwise the cached user data is used,
+    falling back to the API.
+    """
+    if not hasattr(request, "_current_user"):
+        request._current_user = load_user(request)
+    return request._current_user
+
+
+def load_user(request):
     user_id = request.session.get("user_data", {}).get("id")
     if user_id:
+        users = request.api_client.users
+        if users.current_user is not None:
+            return users.current_user
+
         cache_key = f"user_data:{user_id}"
         user_data = cache.get(cache_key)
         if user_data is not None:
             return User(user_data)
 
-        client = MarketAccessAPIClient(request.session.get("sso_token"))
-        return client.users.get_current()
+        return users.get_current()
 
 
 def user_scope(request):
-    user = get_user(request)
-    return {"current_user": user}
+    """
+    Adds current_user, which is only looked up if a template uses it.
+    """
+    return {"current_user": SimpleLazyObject(lambda: get_user(request))}
@@ -5,7 +5,10 @@ from django.conf import settings
 from mohawk import Sender
 
 from barriers.models import Company
+from utils.api.deadline import fit_timeout
+from utils.api.transport import get_session
 from utils.exceptions import APIHttpException, DataHubException
+from utils.upstream import timed_call
 
 
 class DatahubClient:
@@ -28,9 +31,19 @@ class DatahubClient:
             always_hash_content=False,
         )
         headers = {"Authorization": sender.request_header}
-        response = getattr(requests, method)(
-            url, verify=not settings.DEBUG, headers=headers, json=kwargs
+        timeout = fit_timeout(
+            (settings.UPSTREAM_CONNECT_TIMEOUT, settings.DATAHUB_READ_TIMEOUT)
         )
+        with timed_call("datahub", method, path) as call:
+            response = get_session().request(
+                method,
+                url,
+                verify=not settings.DEBUG,
+                headers=headers,
+                json=kwargs,
+                timeout=timeout,
+            )
+            call.status = response.status_code
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
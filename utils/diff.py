@@ -228,26 +228,28 @@ class diff_match_patch:
         pointer = 0
         count_delete = 0
         count_insert = 0
-        text_delete = ""
-        text_insert = ""
+        text_delete = []
+        text_insert = []
         while pointer < len(diffs):
             if diffs[pointer][0] == self.DIFF_INSERT:
                 count_insert += 1
-                text_insert += diffs[pointer][1]
+                text_insert.append(diffs[pointer][1])
             elif diffs[pointer][0] == self.DIFF_DELETE:
                 count_delete += 1
-                text_delete += diffs[pointer][1]
+                text_delete.append(diffs[pointer][1])
             elif diffs[pointer][0] == self.DIFF_EQUAL:
                 # Upon reaching an equality, check for prior redundancies.
                 if count_delete >= 1 and count_insert >= 1:
                     # Delete the offending records and add the merged ones.
-                    subDiff = self.diff_main(text_delete, text_insert, False, deadline)
+                    subDiff = self.diff_main(
+                        "".join(text_delete), "".join(text_insert), False, deadline
+                    )
                     diffs[pointer - count_delete - count_insert : pointer] = subDiff
                     pointer = pointer - count_delete - count_insert + len(subDiff)
                 count_insert = 0
                 count_delete = 0
-                text_delete = ""
-                text_insert = ""
+                text_delete = []
+                text_insert = []
 
             pointer += 1
 
@@ -255,6 +257,69 @@ class diff_match_patch:
 
         return diffs
 
+    # Words, runs of whitespace and single punctuation marks.
+    WORD_RE = re.compile(r"\w+|\s+|[^\w\s]")
+
+    def diff_wordMode(self, text1, text2, deadline=None):
+        """Diff two texts word by word rather than character by character.
+          Much faster on long prose, at the cost of never splitting a word.
+
+        Args:
+          text1: Old string to be diffed.
+          text2: New string to be diffed.
+          deadline: Optional time when the diff should be complete by.
+
+        Returns:
+          Array of changes.
+        """
+        if deadline is None:
+            if self.Diff_Timeout <= 0:
+                deadline = sys.maxsize
+            else:
+                deadline = time.time() + self.Diff_Timeout
+
+        (chars1, chars2, wordArray) = self.diff_wordsToChars(text1, text2)
+        diffs = self.diff_main(chars1, chars2, False, deadline)
+        self.diff_charsToLines(diffs, wordArray)
+        return diffs
+
+    def diff_wordsToChars(self, text1, text2):
+        """Split two texts into words and reduce each text to an array of word
+        ids, encoded as a string with one Unicode character per word.
+
+        Args:
+          text1: First string.
+          text2: Second string.
+
+        Returns:
+          Three element tuple, containing the encoded text1, the encoded text2 and
+          the array of unique words.  The zeroth element of the array of unique
+          words is intentionally blank.
+        """
+        wordArray = [""]  # e.g. wordArray[4] == "Hello"
+        wordHash = {}  # e.g. wordHash["Hello"] == 4
+
+        def diff_wordsToCharsMunge(text, maxWords):
+            ids = []
+            for match in self.WORD_RE.finditer(text):
+                word = match.group()
+                bailOut = word not in wordHash and len(wordArray) == maxWords
+                if bailOut:
+                    # Bail out at 1114111 because chr(1114112) throws.
+                    word = text[match.start() :]
+                if word not in wordHash:
+                    wordArray.append(word)
+                    wordHash[word] = len(wordArray) - 1
+                ids.append(wordHash[word])
+                if bailOut:
+                    break
+            return "".join(map(chr, ids))
+
+        # Allocate 2/3rds of the space for text1, the rest for text2.
+        chars1 = diff_wordsToCharsMunge(text1, 666666)
+        chars2 = diff_wordsToCharsMunge(text2, 1114111)
+        return (chars1, chars2, wordArray)
+
     def diff_bisect(self, text1, text2, deadline):  # noqa: C901
         """Find the 'middle snake' of a diff, split the problem in two
           and return the recursively constructed diff.
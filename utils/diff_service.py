@@ -0,0 +1,195 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.diff import diff_match_patch
+
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+
+
+class DiffBudget:
+    """
+    Total time allowed for diffing everything on a page.
+
+    The clock starts on first use, so building the budget early doesn't
+    use any of it up.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.started_at = None
+
+    def remaining(self):
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        return self.seconds - (time.monotonic() - self.started_at)
+
+
+def make_key(old, new):
+    digest = hashlib.sha256(f"{old}\0{new}".encode()).hexdigest()
+    return f"diff:{digest}"
+
+
+def diff_html(old, new, timeout):
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = timeout
+    diffs = dmp.diff_wordMode(old, new)
+    dmp.diff_cleanupSemantic(diffs)
+    return dmp.diff_prettyHtml(diffs)
+
+
+def timed_diff_html(old, new, timeout):
+    """
+    :return: TUPLE - (html, complete) where complete is False if the diff
+             ran out of time and was cut short
+    """
+    started_at = time.monotonic()
+    html = diff_html(old, new, timeout)
+    return html, time.monotonic() - started_at < timeout
+
+
+def pool_diff_html(old, new, timeout, give_up_at=None):
+    """
+    Diff in a pool process, skipping diffs whose request has stopped
+    waiting by the time they start.
+
+    A diff that has started can't be cancelled, but it stops itself once
+    its timeout is up, so an abandoned diff only holds up the pool that
+    long.
+
+    :param give_up_at: time.time() after which the result isn't wanted
+    """
+    if give_up_at is not None:
+        timeout = min(timeout, give_up_at - time.time())
+        if timeout <= 0:
+            return None, False
+    return timed_diff_html(old, new, timeout)
+
+
+def line_diff_html(old, new):
+    """
+    Cheap diff of whole lines, used once the budget has run out.
+    """
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = 0
+    chars1, chars2, lines = dmp.diff_linesToChars(old, new)
+    diffs = dmp.diff_main(chars1, chars2, checklines=False)
+    dmp.diff_charsToLines(diffs, lines)
+    return dmp.diff_prettyHtml(diffs)
+
+
+def get_timeout(budget):
+    timeout = settings.DIFF_TIMEOUT
+    if budget is not None:
+        timeout = min(timeout, budget.remaining())
+    return timeout
+
+
+def compute_diff(old, new, budget=None):
+    """
+    Diff two texts within the budget.
+
+    :return: TUPLE - (html, complete) where complete is False if the diff
+             was cut short and so shouldn't be cached
+    """
+    timeout = get_timeout(budget)
+    if timeout <= 0:
+        return line_diff_html(old, new), False
+    return timed_diff_html(old, new, timeout)
+
+
+def get_diff(old, new, budget=None):
+    """
+    Get the html diff between two texts, using the cache where possible.
+    """
+    old = old or ""
+    new = new or ""
+    key = make_key(old, new)
+
+    html = cache.get(key)
+    if html is None:
+        html, complete = compute_diff(old, new, budget)
+        if complete:
+            cache.set(key, html, settings.DIFF_CACHE_TIME)
+    return html
+
+
+def get_pool():
+    global _pool, _pool_pid
+
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = ProcessPoolExecutor(max_workers=settings.DIFF_PROCESSES)
+                _pool_pid = pid
+    return _pool
+
+
+def get_diffs(pairs, budget=None):
+    """
+    Get the html diffs for a batch of (old, new) text pairs.
+
+    Cached diffs are fetched in one go. With DIFF_PROCESSES set, the rest
+    are computed in a process pool, otherwise one after another. Anything
+    not finished within the budget gets a line level diff instead.
+    """
+    pairs = [(old or "", new or "") for old, new in pairs]
+    keys = [make_key(old, new) for old, new in pairs]
+    diffs = cache.get_many(keys)
+    missing = [
+        (key, old, new) for key, (old, new) in zip(keys, pairs) if key not in diffs
+    ]
+
+    if missing and settings.DIFF_PROCESSES > 0:
+        results = compute_diffs_in_pool(missing, budget)
+    else:
+        results = {key: compute_diff(old, new, budget) for key, old, new in missing}
+
+    to_cache = {}
+    for key, (html, complete) in results.items():
+        diffs[key] = html
+        if complete:
+            to_cache[key] = html
+    if to_cache:
+        cache.set_many(to_cache, settings.DIFF_CACHE_TIME)
+    return [diffs[key] for key in keys]
+
+
+def compute_diffs_in_pool(missing, budget=None):
+    """
+    Diff each (key, old, new) in a process pool.
+
+    :return: DICT - {key: (html, complete)}
+    """
+    futures = {}
+    timeout = get_timeout(budget)
+    if timeout > 0:
+        pool = get_pool()
+        wait_time = max(budget.remaining(), 0) if budget else None
+        give_up_at = time.time() + wait_time if budget else None
+        futures = {
+            key: pool.submit(pool_diff_html, old, new, timeout, give_up_at)
+            for key, old, new in missing
+        }
+        wait(futures.values(), timeout=wait_time)
+
+    results = {}
+    for key, old, new in missing:
+        future = futures.get(key)
+        html = None
+        if future is not None and future.done() and not future.exception():
+            html, complete = future.result()
+        if html is None:
+            if future is not None:
+                future.cancel()
+            html, complete = line_diff_html(old, new), False
+        results[key] = (html, complete)
+    return results
@@ -42,3 +42,29 @@ class FileUploadError(Exception):
 
 class ScanError(Exception):
     pass
+
+
+class UpstreamUnavailableException(Exception):
+    """
+    An upstream call was skipped rather than failing.
+
+    Deliberately not an APIException so handlers that treat API errors as
+    bad or missing data don't swallow a short outage.
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class APICircuitOpenException(UpstreamUnavailableException):
+    """
+    Raised instead of calling an upstream service that is failing.
+    """
+
+
+class APIDeadlineExceededException(UpstreamUnavailableException):
+    """
+    Raised instead of calling an upstream service once the request has
+    used up its time budget.
+    """
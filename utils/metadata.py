@@ -1,29 +1,185 @@
 import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from operator import itemgetter
 
 import redis
-import requests
 from django.conf import settings
+from django.utils.functional import cached_property
 from mohawk import Sender
 
 from barriers.constants import Statuses
 from core.filecache import memfiles
+from utils.api.resilience import get_timeout
+from utils.api.transport import get_session
 from utils.exceptions import HawkException
+from utils.metrics import record_metadata_lookup
+from utils.upstream import timed_call
+
+logger = logging.getLogger(__name__)
+
+METADATA_KEY = "metadata"
+METADATA_VERSION_KEY = "metadata:version"
+METADATA_FRESH_KEY = "metadata:fresh"
+METADATA_LOCK_KEY = "metadata:refreshing"
+
+# How often to look for metadata stored by the process refreshing it
+METADATA_WAIT_INTERVAL = 0.1
 
 redis_client = None
 if not settings.MOCK_METADATA:
     redis_client = redis.Redis.from_url(url=settings.REDIS_URI)
 
 
+class MetadataCache:
+    """
+    Process level cache of the parsed metadata.
+
+    Redis holds the raw metadata next to a version stamp that is replaced
+    whenever the metadata is rewritten or cleared. The parsed and indexed
+    Metadata is kept in memory and only reloaded when that version changes,
+    which is checked at most every METADATA_VERSION_CHECK_INTERVAL seconds.
+
+    The metadata is kept in redis for METADATA_STALE_TIME after it stops
+    being fresh. A stale copy is still served, while one process refreshes
+    it from the API in the background.
+    """
+
+    def __init__(self):
+        self.metadata = None
+        self.version = None
+        self.checked_at = None
+        self.refresh_thread = None
+
+    def get(self):
+        now = time.monotonic()
+        if self.metadata is not None and self.is_recently_checked(now):
+            record_metadata_lookup(hit=True)
+            return self.metadata
+
+        with timed_call("redis", "mget", METADATA_VERSION_KEY):
+            version, fresh = redis_client.mget(METADATA_VERSION_KEY, METADATA_FRESH_KEY)
+        if self.metadata is None or version is None or version != self.version:
+            record_metadata_lookup(hit=False)
+            self.metadata = load_metadata()
+            self.version = self.metadata.version
+        else:
+            record_metadata_lookup(hit=True)
+
+        if version is not None and fresh is None:
+            self.refresh_in_background()
+
+        self.checked_at = now
+        return self.metadata
+
+    def is_recently_checked(self, now):
+        interval = settings.METADATA_VERSION_CHECK_INTERVAL
+        return self.checked_at is not None and now - self.checked_at < interval
+
+    def refresh_in_background(self):
+        if self.refresh_thread is not None and self.refresh_thread.is_alive():
+            return
+        self.refresh_thread = threading.Thread(target=refresh_metadata, daemon=True)
+        self.refresh_thread.start()
+
+    def clear(self):
+        self.metadata = None
+        self.version = None
+        self.checked_at = None
+
+
+metadata_cache = MetadataCache()
+
+
 def get_metadata():
     if settings.MOCK_METADATA:
-        file = f"{settings.BASE_DIR}/../core/fixtures/metadata.json"
-        return Metadata(json.loads(memfiles.open(file)))
+        return get_mock_metadata()
+    return metadata_cache.get()
+
+
+def get_mock_metadata():
+    file = f"{settings.BASE_DIR}/../core/fixtures/metadata.json"
+    if metadata_cache.metadata is None:
+        metadata_cache.metadata = Metadata(json.loads(memfiles.open(file)))
+    return metadata_cache.metadata
+
+
+@contextmanager
+def refresh_lock():
+    """
+    Lock held across all processes while fetching the metadata from the API.
 
-    metadata = redis_client.get("metadata")
-    if metadata:
-        return Metadata(json.loads(metadata))
+    Yields whether the lock was acquired. It expires by itself after
+    METADATA_REFRESH_LOCK_TIMEOUT in case its holder dies.
+    """
+    token = uuid.uuid4().hex.encode()
+    acquired = redis_client.set(
+        METADATA_LOCK_KEY,
+        token,
+        nx=True,
+        ex=settings.METADATA_REFRESH_LOCK_TIMEOUT,
+    )
+    try:
+        yield bool(acquired)
+    finally:
+        # Only release the lock if it hasn't expired and been taken since
+        if acquired and redis_client.get(METADATA_LOCK_KEY) == token:
+            redis_client.delete(METADATA_LOCK_KEY)
+
+
+def load_metadata():
+    """
+    Get the metadata from redis, falling back to the API.
+
+    Only one process fetches the metadata from the API at a time. The
+    others wait for it to be stored, up to METADATA_REFRESH_LOCK_TIMEOUT.
+    """
+    give_up_at = time.monotonic() + settings.METADATA_REFRESH_LOCK_TIMEOUT
+    while time.monotonic() < give_up_at:
+        metadata = read_metadata()
+        if metadata is not None:
+            return metadata
 
+        with refresh_lock() as acquired:
+            if acquired:
+                # It may have been stored just before the lock was released
+                return read_metadata() or update_metadata()
+        time.sleep(METADATA_WAIT_INTERVAL)
+
+    logger.warning("Timed out waiting for the metadata to be refreshed")
+    return update_metadata()
+
+
+def read_metadata():
+    with timed_call("redis", "mget", METADATA_KEY):
+        metadata, version = redis_client.mget(METADATA_KEY, METADATA_VERSION_KEY)
+    if metadata and version:
+        return Metadata(json.loads(metadata), version=version)
+    return None
+
+
+def update_metadata():
+    metadata = fetch_metadata()
+    version = store_metadata(metadata)
+    return Metadata(metadata, version=version)
+
+
+def refresh_metadata():
+    """
+    Replace stale metadata in redis, unless another process is already.
+    """
+    try:
+        with refresh_lock() as acquired:
+            if acquired and not redis_client.get(METADATA_FRESH_KEY):
+                update_metadata()
+    except Exception as e:
+        logger.warning(f"Refreshing the metadata failed: {e}")
+
+
+def fetch_metadata():
     url = f"{settings.MARKET_ACCESS_API_URI}metadata"
     sender = Sender(
         settings.MARKET_ACCESS_API_HAWK_CREDS,
@@ -34,21 +190,61 @@ def get_metadata():
         always_hash_content=False,
     )
 
-    response = requests.get(
-        url,
-        verify=not settings.DEBUG,
-        headers={
-            "Authorization": sender.request_header,
-            "Content-Type": "text/plain",
-        },
-    )
+    with timed_call("api", "get", "metadata") as call:
+        response = get_session().get(
+            url,
+            verify=not settings.DEBUG,
+            headers={
+                "Authorization": sender.request_header,
+                "Content-Type": "text/plain",
+            },
+            timeout=get_timeout("metadata"),
+        )
+        call.status = response.status_code
 
     if not response.ok:
         raise HawkException(f"Call to fetch metadata failed {response}")
 
-    metadata = response.json()
-    redis_client.set("metadata", json.dumps(metadata), ex=settings.METADATA_CACHE_TIME)
-    return Metadata(metadata)
+    return response.json()
+
+
+def get_metadata_expiry():
+    return settings.METADATA_CACHE_TIME + settings.METADATA_STALE_TIME
+
+
+def store_metadata(metadata):
+    """
+    Write the metadata to redis with a new version stamp.
+
+    Both keys share the same expiry so the version disappears with the data.
+    The fresh key expires METADATA_CACHE_TIME from now, when the metadata
+    starts being refreshed in the background.
+    """
+    version = new_metadata_version()
+    pipeline = redis_client.pipeline()
+    pipeline.set(METADATA_KEY, json.dumps(metadata), ex=get_metadata_expiry())
+    pipeline.set(METADATA_VERSION_KEY, version, ex=get_metadata_expiry())
+    pipeline.set(METADATA_FRESH_KEY, version, ex=settings.METADATA_CACHE_TIME)
+    pipeline.execute()
+    return version
+
+
+def clear_metadata_cache():
+    """
+    Remove the metadata from redis and bump the version.
+
+    Every process notices the new version on its next check, reloads and
+    in turn refetches the metadata from the API.
+    """
+    pipeline = redis_client.pipeline()
+    pipeline.delete(METADATA_KEY, METADATA_FRESH_KEY)
+    pipeline.set(METADATA_VERSION_KEY, new_metadata_version(), ex=get_metadata_expiry())
+    pipeline.execute()
+    metadata_cache.clear()
+
+
+def new_metadata_version():
+    return uuid.uuid4().hex.encode()
 
 
 class Metadata:
@@ -101,13 +297,134 @@ class Metadata:
         },
     }
 
-    def __init__(self, data):
+    def __init__(self, data, version=None):
         self.data = data
+        self.version = version
 
-    def get_admin_area(self, admin_area_id):
+    @staticmethod
+    def index_by(items, key=itemgetter("id"), include=None):
+        """
+        Build a lookup dict of items keyed on key(item).
+
+        Earlier items win over later ones with the same key, matching the
+        first-match behaviour of a linear scan.
+        """
+        index = {}
+        for item in items:
+            if include is None or include(item):
+                index.setdefault(key(item), item)
+        return index
+
+    @cached_property
+    def admin_areas_by_id(self):
+        return self.index_by(
+            self.data["admin_areas"],
+            include=lambda admin_area: admin_area["disabled_on"] is None,
+        )
+
+    @cached_property
+    def admin_areas_by_country_id(self):
+        admin_areas = {}
         for admin_area in self.data["admin_areas"]:
-            if admin_area["id"] == admin_area_id and admin_area["disabled_on"] is None:
-                return admin_area
+            admin_areas.setdefault(admin_area["country"]["id"], []).append(admin_area)
+        return admin_areas
+
+    @cached_property
+    def countries_by_id(self):
+        return self.index_by(self.data["countries"])
+
+    @cached_property
+    def overseas_regions(self):
+        regions = {
+            country["overseas_region"]["id"]: country["overseas_region"]
+            for country in self.get_country_list()
+            if country["disabled_on"] is None
+            and country.get("overseas_region") is not None
+        }
+        regions = list(regions.values())
+        regions.sort(key=itemgetter("name"))
+        return regions
+
+    @cached_property
+    def overseas_regions_by_id(self):
+        return self.index_by(self.overseas_regions)
+
+    @cached_property
+    def sectors_by_id(self):
+        return self.index_by(self.data.get("sectors", []))
+
+    @cached_property
+    def sectors_by_level(self):
+        sectors = {None: []}
+        for sector in self.data["sectors"]:
+            if sector["disabled_on"] is None:
+                sectors[None].append(sector)
+                sectors.setdefault(sector["level"], []).append(sector)
+        return sectors
+
+    @cached_property
+    def status_info(self):
+        status_info = {
+            status_id: dict(info) for status_id, info in self.STATUS_INFO.items()
+        }
+        for status_id, name in self.data["barrier_status"].items():
+            status_info[status_id].update({"id": status_id, "name": name})
+        return status_info
+
+    @cached_property
+    def priorities_by_code(self):
+        return self.index_by(self.data["barrier_priorities"], key=itemgetter("code"))
+
+    @cached_property
+    def unique_categories(self):
+        return list(self.index_by(self.data.get("categories")).values())
+
+    @cached_property
+    def sorted_categories(self):
+        return sorted(self.unique_categories, key=itemgetter("title"))
+
+    @cached_property
+    def categories_by_id(self):
+        return self.index_by(
+            self.data["categories"], key=lambda category: str(category["id"])
+        )
+
+    @cached_property
+    def categories_by_group(self):
+        categories = {}
+        for category in self.unique_categories:
+            categories.setdefault(category["category"], []).append(category)
+        return categories
+
+    @cached_property
+    def barrier_tags(self):
+        tags = self.data.get("barrier_tags", [])
+        return sorted(tags, key=lambda k: k["order"])
+
+    @cached_property
+    def barrier_tags_by_id(self):
+        return self.index_by(self.barrier_tags, key=lambda tag: str(tag["id"]))
+
+    @cached_property
+    def trading_blocs_by_code(self):
+        return self.index_by(self.get_trading_bloc_list(), key=itemgetter("code"))
+
+    @cached_property
+    def trading_blocs_by_country_id(self):
+        trading_blocs = {}
+        for trading_bloc in self.get_trading_bloc_list():
+            for country_id in trading_bloc["country_ids"]:
+                trading_blocs.setdefault(country_id, trading_bloc)
+        return trading_blocs
+
+    @cached_property
+    def gov_organisations_by_id(self):
+        return self.index_by(
+            self.get_gov_organisations(), key=lambda org: str(org["id"])
+        )
+
+    def get_admin_area(self, admin_area_id):
+        return self.admin_areas_by_id.get(admin_area_id)
 
     def get_admin_areas(self, admin_area_ids):
         """
@@ -123,16 +440,10 @@ class Metadata:
         return admin_areas
 
     def get_admin_areas_by_country(self, country_id):
-        return [
-            admin_area
-            for admin_area in self.data["admin_areas"]
-            if admin_area["country"]["id"] == country_id
-        ]
+        return list(self.admin_areas_by_country_id.get(country_id, []))
 
     def get_country(self, country_id):
-        for country in self.data["countries"]:
-            if country["id"] == country_id:
-                return country
+        return self.countries_by_id.get(country_id)
 
     def get_country_list(self):
         return self.data["countries"]
@@ -141,21 +452,10 @@ class Metadata:
         return [(country["id"], country["name"]) for country in self.get_country_list()]
 
     def get_overseas_region_list(self):
-        regions = {
-            country["overseas_region"]["id"]: country["overseas_region"]
-            for country in self.get_country_list()
-            if country["disabled_on"] is None
-            and country.get("overseas_region") is not None
-        }
-        regions = list(regions.values())
-        regions.sort(key=itemgetter("name"))
-        return regions
+        return list(self.overseas_regions)
 
     def get_overseas_region_by_id(self, region_id):
-        for region in self.get_overseas_region_list():
-            if region["id"] == str(region_id):
-                return region
-        return None
+        return self.overseas_regions_by_id.get(str(region_id))
 
     def get_overseas_region_choices(self):
         return [
@@ -163,9 +463,7 @@ class Metadata:
         ]
 
     def get_sector(self, sector_id):
-        for sector in self.data.get("sectors", []):
-            if sector["id"] == sector_id:
-                return sector
+        return self.sectors_by_id.get(sector_id)
 
     def get_sectors(self, sector_ids):
         """
@@ -181,6 +479,7 @@ class Metadata:
         return sectors
 
     def get_sectors_by_ids(self, sector_ids):
+        sector_ids = set(sector_ids)
         return [
             sector
             for sector in self.data.get("sectors", [])
@@ -188,12 +487,7 @@ class Metadata:
         ]
 
     def get_sector_list(self, level=None):
-        return [
-            sector
-            for sector in self.data["sectors"]
-            if (level is None or sector["level"] == level)
-            and sector["disabled_on"] is None
-        ]
+        return list(self.sectors_by_level.get(level, []))
 
     def get_sector_choices(self, level=None):
         return [
@@ -201,11 +495,7 @@ class Metadata:
         ]
 
     def get_status(self, status_id):
-        for id, name in self.data["barrier_status"].items():
-            self.STATUS_INFO[id]["id"] = id
-            self.STATUS_INFO[id]["name"] = name
-
-        return self.STATUS_INFO[status_id]
+        return dict(self.status_info[status_id])
 
     def get_status_text(
         self,
@@ -247,36 +537,21 @@ class Metadata:
         if priority_code == "None":
             priority_code = "UNKNOWN"
 
-        for priority in self.data["barrier_priorities"]:
-            if priority["code"] == priority_code:
-                return priority
+        return self.priorities_by_code.get(priority_code)
 
     def get_category_list(self, sort=True):
         """
         Dedupe and sort the barrier types
         """
-        ids = []
-        unique_categories = []
-        for category in self.data.get("categories"):
-            if category["id"] not in ids:
-                unique_categories.append(category)
-                ids.append(category["id"])
-
         if sort:
-            unique_categories.sort(key=itemgetter("title"))
-        return unique_categories
+            return list(self.sorted_categories)
+        return list(self.unique_categories)
 
     def get_category(self, category_id):
-        for category in self.data["categories"]:
-            if str(category["id"]) == str(category_id):
-                return category
+        return self.categories_by_id.get(str(category_id))
 
     def get_categories_by_group(self, group):
-        return [
-            category
-            for category in self.get_category_list(sort=False)
-            if category["category"] == group
-        ]
+        return list(self.categories_by_group.get(group, []))
 
     def get_goods(self):
         return self.get_categories_by_group("GOODS")
@@ -303,24 +578,15 @@ class Metadata:
         stages = self.data.get("report_stages", {})
         # filter out "Add a barrier" as that's not a valid stage
         exclude_stages = ("Add a barrier",)
-        remove_keys = []
-        for key, value in stages.items():
-            if value in exclude_stages:
-                remove_keys.append(key)
-
-        for key in remove_keys:
-            stages.pop(key)
-
-        return stages
+        return {
+            key: value for key, value in stages.items() if value not in exclude_stages
+        }
 
     def get_barrier_tag(self, tag_id):
-        for tag in self.get_barrier_tags():
-            if str(tag["id"]) == str(tag_id):
-                return tag
+        return self.barrier_tags_by_id.get(str(tag_id))
 
     def get_barrier_tags(self):
-        tags = self.data.get("barrier_tags", [])
-        return sorted(tags, key=lambda k: k["order"])
+        return list(self.barrier_tags)
 
     def get_barrier_tag_choices(self):
         """
@@ -364,21 +630,19 @@ class Metadata:
         return (td for td in self.get_trade_direction(all_items=True))
 
     def get_trading_bloc(self, code):
-        for trading_bloc in self.get_trading_bloc_list():
-            if trading_bloc["code"] == code:
-                return trading_bloc
+        return self.trading_blocs_by_code.get(code)
 
     def get_trading_bloc_list(self):
         return self.data.get("trading_blocs", [])
 
     def get_trading_bloc_by_country_id(self, country_id):
-        for trading_bloc in self.get_trading_bloc_list():
-            if country_id in trading_bloc["country_ids"]:
-                return {
-                    "code": trading_bloc["code"],
-                    "name": trading_bloc["name"],
-                    "short_name": trading_bloc["short_name"],
-                }
+        trading_bloc = self.trading_blocs_by_country_id.get(country_id)
+        if trading_bloc:
+            return {
+                "code": trading_bloc["code"],
+                "name": trading_bloc["name"],
+                "short_name": trading_bloc["short_name"],
+            }
 
     def is_trading_bloc_code(self, code):
         return self.get_trading_bloc(code) is not None
@@ -396,12 +660,10 @@ class Metadata:
         return ((str(org["id"]), org["name"]) for org in self.get_gov_organisations())
 
     def get_government_organisation(self, org_id):
-        for org in self.get_gov_organisations():
-            if str(org["id"]) == str(org_id):
-                return org
+        return self.gov_organisations_by_id.get(str(org_id))
 
     def get_gov_organisations_by_ids(self, list_of_ids):
-        list_of_ids = [str(id) for id in list_of_ids]
+        list_of_ids = {str(id) for id in list_of_ids}
         return (
             org for org in self.get_gov_organisations() if str(org["id"]) in list_of_ids
         )
@@ -0,0 +1,350 @@
+import bisect
+import glob
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+SUMMARY = "summary"
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUANTILES = (0.5, 0.9, 0.99)
+
+METRICS = {
+    "market_access_view_duration_seconds": {
+        "type": HISTOGRAM,
+        "help": "Time taken to respond, by view.",
+        "buckets": LATENCY_BUCKETS,
+    },
+    "market_access_upstream_duration_seconds": {
+        "type": HISTOGRAM,
+        "help": "Time taken by upstream calls, by service and resource.",
+        "buckets": LATENCY_BUCKETS,
+    },
+    "market_access_metadata_cache_total": {
+        "type": COUNTER,
+        "help": "Metadata lookups served from memory (hit) or reloaded (miss).",
+    },
+    "market_access_session_size_bytes": {
+        "type": SUMMARY,
+        "help": "Serialized size of sessions, sampled.",
+    },
+}
+
+
+def make_key(name, labels):
+    return json.dumps([name, labels], sort_keys=True)
+
+
+class MetricsStore:
+    """
+    Metrics collected by this process.
+
+    Every so often the metrics are written to a JSON file named after the
+    process id in METRICS_DIR. Reading the metrics merges the files from
+    every process, so counts add up across all the gunicorn workers on
+    the host.
+
+    Summaries keep a fixed size random sample (a reservoir) of the
+    observed values, from which quantiles are worked out when read.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.counters = {}
+        self.histograms = {}
+        self.reservoirs = {}
+        self.flushed_at = None
+
+    def check_pid(self):
+        # Start afresh after a fork, rather than double counting the parent
+        if self.pid != os.getpid():
+            self.reset()
+
+    def inc(self, name, labels, value=1):
+        with self.lock:
+            self.check_pid()
+            key = make_key(name, labels)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        with self.lock:
+            self.check_pid()
+            key = make_key(name, labels)
+            metric = METRICS[name]
+            if metric["type"] == HISTOGRAM:
+                self.observe_histogram(key, metric["buckets"], value)
+            else:
+                self.observe_reservoir(key, value)
+
+    def observe_histogram(self, key, buckets, value):
+        histogram = self.histograms.setdefault(
+            key, {"buckets": [0] * len(buckets), "sum": 0, "count": 0}
+        )
+        index = bisect.bisect_left(buckets, value)
+        if index < len(buckets):
+            histogram["buckets"][index] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+    def observe_reservoir(self, key, value):
+        reservoir = self.reservoirs.setdefault(
+            key, {"samples": [], "sum": 0, "count": 0}
+        )
+        reservoir["sum"] += value
+        reservoir["count"] += 1
+        samples = reservoir["samples"]
+        if len(samples) < settings.METRICS_RESERVOIR_SIZE:
+            samples.append(value)
+        else:
+            index = random.randrange(reservoir["count"])
+            if index < len(samples):
+                samples[index] = value
+
+    def get_path(self):
+        return os.path.join(settings.METRICS_DIR, f"{self.pid}.json")
+
+    def flush(self, force=False):
+        """
+        Write this process's metrics to its file, at most every
+        METRICS_FLUSH_INTERVAL seconds unless forced.
+        """
+        now = time.monotonic()
+        if not force and self.flushed_at is not None:
+            if now - self.flushed_at < settings.METRICS_FLUSH_INTERVAL:
+                return
+
+        with self.lock:
+            self.check_pid()
+            if self.flushed_at is None:
+                self.load_previous()
+            data = json.dumps(
+                {
+                    "counters": self.counters,
+                    "histograms": self.histograms,
+                    "reservoirs": self.reservoirs,
+                }
+            )
+            self.flushed_at = now
+            path = self.get_path()
+
+        try:
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=settings.METRICS_DIR, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {path}: {e}")
+
+    def load_previous(self):
+        """
+        Carry on from the metrics of an earlier process with the same pid,
+        so counts never go backwards.
+        """
+        previous = read_metrics_file(self.get_path())
+        if not previous:
+            return
+
+        for key, value in previous["counters"].items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, previous_histogram in previous["histograms"].items():
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                self.histograms[key] = previous_histogram
+                continue
+            histogram["buckets"] = [
+                a + b
+                for a, b in zip(histogram["buckets"], previous_histogram["buckets"])
+            ]
+            histogram["sum"] += previous_histogram["sum"]
+            histogram["count"] += previous_histogram["count"]
+        for key, reservoir in previous["reservoirs"].items():
+            self.reservoirs.setdefault(key, reservoir)
+
+
+def read_metrics_file(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def merge(all_data):
+    """
+    Merge the metrics written by each process.
+
+    :return: TUPLE - (counters, histograms, reservoirs)
+    """
+    counters = {}
+    histograms = {}
+    reservoirs = {}
+    for data in all_data:
+        for key, value in data["counters"].items():
+            counters[key] = counters.get(key, 0) + value
+
+        for key, histogram in data["histograms"].items():
+            merged = histograms.setdefault(
+                key,
+                {"buckets": [0] * len(histogram["buckets"]), "sum": 0, "count": 0},
+            )
+            merged["buckets"] = [
+                a + b for a, b in zip(merged["buckets"], histogram["buckets"])
+            ]
+            merged["sum"] += histogram["sum"]
+            merged["count"] += histogram["count"]
+
+        for key, reservoir in data["reservoirs"].items():
+            merged = reservoirs.setdefault(key, {"samples": [], "sum": 0, "count": 0})
+            # Each sample stands for count / len(samples) observations
+            weight = reservoir["count"] / max(len(reservoir["samples"]), 1)
+            merged["samples"].extend([value, weight] for value in reservoir["samples"])
+            merged["sum"] += reservoir["sum"]
+            merged["count"] += reservoir["count"]
+    return counters, histograms, reservoirs
+
+
+def get_quantile(weighted_samples, quantile):
+    weighted_samples = sorted(weighted_samples)
+    total = sum(weight for _, weight in weighted_samples)
+    running = 0
+    for value, weight in weighted_samples:
+        running += weight
+        if running >= quantile * total:
+            return value
+    return None
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+    return f"{{{pairs}}}"
+
+
+def format_value(value):
+    if value is None:
+        return "NaN"
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def render(counters, histograms, reservoirs):
+    """
+    Render merged metrics in the Prometheus text exposition format.
+    """
+    series = {name: [] for name in METRICS}
+    for key, value in sorted(counters.items()):
+        name, labels = json.loads(key)
+        series[name].append(f"{name}{format_labels(labels)} {format_value(value)}")
+
+    for key, histogram in sorted(histograms.items()):
+        name, labels = json.loads(key)
+        cumulative = 0
+        for bound, count in zip(METRICS[name]["buckets"], histogram["buckets"]):
+            cumulative += count
+            bucket_labels = format_labels({**labels, "le": str(bound)})
+            series[name].append(f"{name}_bucket{bucket_labels} {cumulative}")
+        inf_labels = format_labels({**labels, "le": "+Inf"})
+        series[name].append(f"{name}_bucket{inf_labels} {histogram['count']}")
+        series[name].append(
+            f"{name}_sum{format_labels(labels)} {format_value(histogram['sum'])}"
+        )
+        series[name].append(f"{name}_count{format_labels(labels)} {histogram['count']}")
+
+    for key, reservoir in sorted(reservoirs.items()):
+        name, labels = json.loads(key)
+        for quantile in QUANTILES:
+            value = get_quantile(reservoir["samples"], quantile)
+            quantile_labels = format_labels({**labels, "quantile": str(quantile)})
+            series[name].append(f"{name}{quantile_labels} {format_value(value)}")
+        series[name].append(
+            f"{name}_sum{format_labels(labels)} {format_value(reservoir['sum'])}"
+        )
+        series[name].append(f"{name}_count{format_labels(labels)} {reservoir['count']}")
+
+    lines = []
+    for name, metric in METRICS.items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        lines.extend(series[name])
+    return "\n".join(lines) + "\n"
+
+
+def collect():
+    """
+    Get the metrics of every process on this host as Prometheus text.
+    """
+    store.flush(force=True)
+    all_data = filter(
+        None,
+        (
+            read_metrics_file(path)
+            for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.json"))
+        ),
+    )
+    return render(*merge(all_data))
+
+
+def observe_request(request, response, recorder, duration):
+    """
+    Record the metrics for a request that has just been handled.
+    """
+    if not settings.METRICS_ENABLED:
+        return
+
+    resolver_match = getattr(request, "resolver_match", None)
+    view = resolver_match.view_name if resolver_match else "unresolved"
+    store.observe(
+        "market_access_view_duration_seconds",
+        {"view": view, "method": request.method},
+        duration,
+    )
+
+    for call in recorder.calls:
+        store.observe(
+            "market_access_upstream_duration_seconds",
+            {"service": call.service, "resource": get_resource(call.path)},
+            call.duration,
+        )
+
+    session_size = getattr(getattr(request, "session", None), "size", 0)
+    if session_size:
+        store.observe("market_access_session_size_bytes", {}, session_size)
+
+    store.flush()
+
+
+def get_resource(path_template):
+    return path_template.strip("/").split("/", 1)[0]
+
+
+def record_metadata_lookup(hit):
+    if settings.METRICS_ENABLED:
+        store.inc(
+            "market_access_metadata_cache_total", {"result": "hit" if hit else "miss"}
+        )
+
+
+store = MetricsStore()
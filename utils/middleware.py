@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from utils.api.client import MarketAccessAPIClient
+from utils.api.deadline import end_deadline, start_deadline
+from utils.api.request_cache import request_cache
+
+
+class APIClientMiddleware:
+    """
+    Binds one API client to each request as request.api_client.
+
+    GET calls made through any client while the request is being handled
+    are memoized, so mixins and context processors that ask for the same
+    resource share a single round trip.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.api_client = SimpleLazyObject(
+            lambda: MarketAccessAPIClient(request.session.get("sso_token"))
+        )
+        with request_cache():
+            return self.get_response(request)
+
+
+class RequestDeadlineMiddleware:
+    """
+    Gives each request a time budget for its upstream calls.
+
+    The budget comes from REQUEST_BUDGETS by url name, falling back to
+    REQUEST_BUDGET, and is counted from when the request came in. API,
+    Data Hub and SSO calls shrink their timeouts to fit what is left of
+    it, so a view making several calls can't take forever. A budget of
+    None means no deadline.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.deadline_started_at = time.monotonic()
+        try:
+            return self.get_response(request)
+        finally:
+            token = getattr(request, "deadline_token", None)
+            if token is not None:
+                end_deadline(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        budget = self.get_budget(request)
+        if budget is not None:
+            request.deadline_token = start_deadline(
+                budget, started_at=request.deadline_started_at
+            )
+
+    def get_budget(self, request):
+        view_name = request.resolver_match.view_name
+        return settings.REQUEST_BUDGETS.get(view_name, settings.REQUEST_BUDGET)
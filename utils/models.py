@@ -1,10 +1,35 @@
-from collections import UserList
+from collections.abc import Sequence
 from typing import Dict, Tuple
 
 import dateutil.parser
+from django.utils.dateparse import parse_datetime as parse_iso_datetime
+
+
+def parse_datetime(value):
+    """
+    Parse a date string from the API.
+
+    API timestamps are ISO 8601, which django's parser handles much faster
+    than dateutil. Anything it can't handle, such as a plain date, falls
+    back to dateutil.
+    """
+    try:
+        parsed = parse_iso_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        parsed = dateutil.parser.parse(value)
+    return parsed
 
 
 class APIModel:
+    """
+    Wrapper around API data, exposing its keys as attributes.
+
+    Fields in date_fields are parsed on first access and the result is
+    stored on the instance, so later lookups skip __getattr__ entirely.
+    """
+
     data: Dict = {}
     date_fields: Tuple = tuple()
 
@@ -20,23 +45,53 @@ class APIModel:
             return value
 
         if name in self.date_fields:
-            return dateutil.parser.parse(value)
+            value = parse_datetime(value)
+            setattr(self, name, value)
 
         return value
 
 
-class ModelList(UserList):
+class ModelList(Sequence):
     """
     A list of objects from the API.
 
-    Also stores the count from the API for use in pagination.
+    Each item is wrapped in the model the first time it is accessed and the
+    wrapper is kept, so iterating again reuses the same objects (and any
+    values they have cached). Indexing and slicing only wrap the items
+    asked for.
+
+    The raw API results stay in data, and the count from the API is stored
+    in total_count for use in pagination. Results paged by cursor have no
+    count, just the cursors for the previous and next pages.
     """
 
-    def __init__(self, model, data, total_count):
+    def __init__(
+        self, model, data, total_count, next_cursor=None, previous_cursor=None
+    ):
         self.model = model
         self.data = data
         self.total_count = total_count
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._objects = [None] * len(data)
+
+    def get_object(self, index):
+        obj = self._objects[index]
+        if obj is None:
+            obj = self._objects[index] = self.model(self.data[index])
+        return obj
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get_object(i) for i in range(*index.indices(len(self)))]
+        return self.get_object(index)
 
     def __iter__(self):
-        for obj in self.data:
-            yield self.model(obj)
+        for index in range(len(self)):
+            yield self.get_object(index)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"<ModelList {self.model.__name__} {len(self)}/{self.total_count}>"
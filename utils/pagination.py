@@ -9,6 +9,8 @@ class PaginationMixin:
     """
 
     pagination_limit = settings.API_RESULTS_LIMIT
+    # Page by the API's cursors rather than by offset
+    cursor_pagination = False
 
     def get_current_page(self):
         page = self.request.GET.get("page", 1)
@@ -20,87 +22,128 @@ class PaginationMixin:
     def update_querystring(self, **kwargs):
         params = self.request.GET.copy()
         params.pop("page", None)
+        params.pop("cursor", None)
         params.update(kwargs)
         return params.urlencode()
 
     def get_pagination_data(self, object_list):
+        if self.cursor_pagination:
+            return self.get_cursor_pagination_data(object_list)
+
         limit = self.get_pagination_limit()
-        total_pages = math.ceil(object_list.total_count / limit)
+        total_pages = int(math.ceil(object_list.total_count / limit))
         current_page = self.get_current_page()
+        page_querystring = self.get_page_querystring_builder()
         pagination_data = {
+            "is_paginated": total_pages > 1,
             "total_pages": total_pages,
             "current_page": current_page,
             "pages": [
-                {
-                    "label": i,
-                    "url": self.update_querystring(page=i),
-                }
-                for i in range(1, total_pages + 1)
+                {"label": label, "url": page_querystring(label)}
+                if label != "..."
+                else {"label": label}
+                for label in get_page_window(current_page, total_pages)
             ],
         }
         if current_page > 1:
-            pagination_data["previous"] = self.update_querystring(page=current_page - 1)
+            pagination_data["previous"] = page_querystring(current_page - 1)
 
         if current_page != total_pages:
-            pagination_data["next"] = self.update_querystring(page=current_page + 1)
-
-        return self.truncate_pagination_data(pagination_data)
+            pagination_data["next"] = page_querystring(current_page + 1)
 
-    def get_pagination_limit(self):
-        return self.pagination_limit
+        return pagination_data
 
-    def get_pagination_offset(self):
-        return self.get_pagination_limit() * (self.get_current_page() - 1)
+    def get_cursor_pagination_data(self, object_list):
+        """
+        Previous and next links for results paged by cursor.
 
-    def truncate_pagination_data(self, pagination_data, block_size=4):
+        There are no page numbers as the API doesn't count the results.
         """
-        Truncate the pagination links.
+        pagination_data = {"pages": []}
+        if object_list.previous_cursor:
+            pagination_data["previous"] = self.update_querystring(
+                cursor=object_list.previous_cursor
+            )
+        if object_list.next_cursor:
+            pagination_data["next"] = self.update_querystring(
+                cursor=object_list.next_cursor
+            )
+        pagination_data["is_paginated"] = bool(
+            object_list.previous_cursor or object_list.next_cursor
+        )
+        return pagination_data
 
-        We don't want to show a link for every page if there are hundreds of
-        pages. This trims out page links we're probably not interested in.
+    def get_page_querystring_builder(self):
+        """
+        Returns a function giving the querystring for a page number.
 
-        This is a direct port from the node project.
+        The querystring is copied once and reused for every page link.
         """
-        pages = pagination_data["pages"]
-
-        if len(pages) <= block_size:
-            return pagination_data
-
-        current_page_num = pagination_data["current_page"]
-        current_page_index = pagination_data["current_page"] - 1
-        first_page = pages[0]
-        last_page = pages[-1]
-
-        block_pivot = int(block_size / 2)
-        start_of_current_block = abs(current_page_num - block_pivot)
-        start_of_last_block = last_page["label"] - block_size
-        block_start_index = min(
-            start_of_current_block,
-            start_of_last_block,
-            current_page_index,
-        )
+        params = self.request.GET.copy()
+        params.pop("page", None)
+
+        def page_querystring(page):
+            params["page"] = page
+            return params.urlencode()
 
-        truncated_pages = pages[block_start_index:][:block_size]
-        first_of_truncated_pages_num = truncated_pages[0]["label"]
-        last_of_truncated_pages_num = truncated_pages[-1]["label"]
+        return page_querystring
 
-        if first_of_truncated_pages_num > 3:
-            truncated_pages = [{"label": "..."}] + truncated_pages
+    def get_pagination_limit(self):
+        return self.pagination_limit
 
-        if first_of_truncated_pages_num == 3:
-            truncated_pages = [pages[1]] + truncated_pages
+    def get_pagination_offset(self):
+        return self.get_pagination_limit() * (self.get_current_page() - 1)
 
-        if first_of_truncated_pages_num > 1:
-            truncated_pages = [first_page] + truncated_pages
+    def get_pagination_params(self):
+        """
+        The params to pass to APIResource.list for the current page.
+        """
+        params = {"limit": self.get_pagination_limit()}
+        if self.cursor_pagination:
+            cursor = self.request.GET.get("cursor")
+            if cursor:
+                params["cursor"] = cursor
+        else:
+            params["offset"] = self.get_pagination_offset()
+        return params
 
-        if last_of_truncated_pages_num < last_page["label"] - 2:
-            truncated_pages.append({"label": "..."})
 
-        if last_of_truncated_pages_num == last_page["label"] - 2:
-            truncated_pages.append(pages[-2])
+def get_page_window(current_page, total_pages, block_size=4):
+    """
+    The page labels to show in the pagination links.
 
-        if last_of_truncated_pages_num < last_page["label"]:
-            truncated_pages.append(last_page)
+    We don't want to show a link for every page if there are hundreds of
+    pages. This gives a block of pages around the current one, the first
+    and last pages and "..." where pages have been left out, without
+    building the pages in between.
 
-        pagination_data["pages"] = truncated_pages
-        return pagination_data
+    This is a port of the truncation logic from the node project.
+    """
+    if total_pages <= block_size:
+        return list(range(1, total_pages + 1))
+
+    block_pivot = block_size // 2
+    block_start = min(
+        abs(current_page - block_pivot),
+        total_pages - block_size,
+        current_page - 1,
+    )
+    first = block_start + 1
+    last = block_start + block_size
+    window = list(range(first, last + 1))
+
+    if first > 3:
+        window.insert(0, "...")
+    if first == 3:
+        window.insert(0, 2)
+    if first > 1:
+        window.insert(0, 1)
+
+    if last < total_pages - 2:
+        window.append("...")
+    if last == total_pages - 2:
+        window.append(total_pages - 1)
+    if last < total_pages:
+        window.append(total_pages)
+
+    return window
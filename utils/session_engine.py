@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+import zlib
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError, UpdateError
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+
+logger = logging.getLogger(__name__)
+
+RAW = b"j"
+COMPRESSED = b"z"
+
+
+class CompactJSONSerializer:
+    """
+    JSON without whitespace, compressed with zlib once it is big enough.
+
+    The first byte says whether the rest is compressed, so small sessions
+    don't pay for compression they wouldn't benefit from.
+    """
+
+    def dumps(self, obj):
+        data = json.dumps(obj, separators=(",", ":")).encode()
+        if len(data) >= settings.SESSION_COMPRESS_MIN_SIZE:
+            return COMPRESSED + zlib.compress(data)
+        return RAW + data
+
+    def loads(self, data):
+        if data[:1] == COMPRESSED:
+            return json.loads(zlib.decompress(data[1:]).decode())
+        return json.loads(data[1:].decode())
+
+
+def get_key_sizes(session_data):
+    """
+    The serialized size of each value in a session, largest first.
+    """
+    sizes = {
+        key: len(json.dumps(value, separators=(",", ":")))
+        for key, value in session_data.items()
+    }
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+class SessionStore(CacheSessionStore):
+    """
+    Sessions kept in the cache rather than the database.
+
+    The session data is stored with CompactJSONSerializer. Saving is
+    skipped when the data is the same as when it was loaded, as setting a
+    key to the value it already had still marks the session as modified.
+
+    Sessions over SESSION_SIZE_WARNING bytes are logged along with the
+    size of their largest keys.
+    """
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self.serializer = CompactJSONSerializer
+        self.loaded_digest = None
+        self.size = 0
+
+    def get_digest(self, data):
+        return hashlib.md5(data).digest()
+
+    def load(self):
+        try:
+            data = self._cache.get(self.cache_key)
+        except Exception:
+            # Some backends (e.g. memcache) raise an exception on invalid
+            # cache keys. If this happens, reset the session. See #17810.
+            data = None
+
+        if data is not None:
+            try:
+                session_data = self.serializer().loads(data)
+            except (TypeError, ValueError, zlib.error):
+                logger.warning("Discarding session data that could not be decoded")
+            else:
+                self.loaded_digest = self.get_digest(data)
+                self.size = len(data)
+                return session_data
+
+        self._session_key = None
+        return {}
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+
+        session_data = self._get_session(no_load=must_create)
+        data = self.serializer().dumps(session_data)
+        digest = self.get_digest(data)
+        if not must_create and digest == self.loaded_digest:
+            return
+
+        if must_create:
+            func = self._cache.add
+        elif self._cache.get(self.cache_key) is not None:
+            func = self._cache.set
+        else:
+            raise UpdateError
+        result = func(self.cache_key, data, self.get_expiry_age())
+        if must_create and not result:
+            raise CreateError
+
+        self.loaded_digest = digest
+        self.size = len(data)
+        self.check_size(session_data)
+
+    def check_size(self, session_data):
+        if self.size > settings.SESSION_SIZE_WARNING:
+            key_sizes = list(get_key_sizes(session_data).items())[:5]
+            logger.warning(
+                f"Session is {self.size} bytes, largest keys: {key_sizes}",
+                extra={"session_bytes": self.size},
+            )
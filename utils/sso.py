@@ -4,7 +4,10 @@ import requests
 from django.conf import settings
 
 from users.exceptions import SSOException
+from utils.api.deadline import fit_timeout
+from utils.api.transport import get_session
 from utils.exceptions import APIHttpException
+from utils.upstream import timed_call
 
 
 class SSOClient:
@@ -30,7 +33,17 @@ class SSOClient:
     def get(self, path, **kwargs):
         url = f"{self.uri}{path}"
         headers = self.prepare_headers()
-        response = requests.get(url=url, params=kwargs, headers=headers)
+        timeout = fit_timeout(
+            (settings.UPSTREAM_CONNECT_TIMEOUT, settings.SSO_READ_TIMEOUT)
+        )
+        with timed_call("sso", "get", path) as call:
+            response = get_session().get(
+                url=url,
+                params=kwargs,
+                headers=headers,
+                timeout=timeout,
+            )
+            call.status = response.status_code
 
         try:
             response.raise_for_status()
@@ -0,0 +1,85 @@
+import logging
+import re
+import time
+
+from django.utils.text import compress_sequence
+
+logger = logging.getLogger(__name__)
+
+accepts_gzip_re = re.compile(r"\bgzip\b")
+
+
+def accepts_gzip(request):
+    return bool(accepts_gzip_re.search(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+
+
+class StreamingExport:
+    """
+    Passes a streamed upstream response through to the browser.
+
+    The upstream body is read in chunk_size pieces only as fast as the
+    browser consumes them, so memory stays bounded at roughly one chunk
+    however large the export is. Chunks are optionally gzipped on the fly.
+
+    Once the stream finishes the upstream response is closed and the time
+    to first byte, bytes sent and throughput are logged.
+    """
+
+    def __init__(self, name, response, chunk_size, compress=False, started_at=None):
+        self.name = name
+        self.response = response
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self.started_at = started_at or time.monotonic()
+        self.first_byte_at = None
+        self.bytes_sent = 0
+
+    def __iter__(self):
+        chunks = (
+            chunk
+            for chunk in self.response.iter_content(chunk_size=self.chunk_size)
+            if chunk
+        )
+        if self.compress:
+            chunks = compress_sequence(chunks)
+
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if self.first_byte_at is None:
+                    self.first_byte_at = time.monotonic()
+                self.bytes_sent += len(chunk)
+                yield chunk
+        finally:
+            self.response.close()
+            self.log_metrics()
+
+    def get_metrics(self):
+        duration = time.monotonic() - self.started_at
+        ttfb = None
+        if self.first_byte_at is not None:
+            ttfb = self.first_byte_at - self.started_at
+        return {
+            "export": self.name,
+            "bytes_sent": self.bytes_sent,
+            "duration_seconds": round(duration, 3),
+            "time_to_first_byte_seconds": ttfb and round(ttfb, 3),
+            "bytes_per_second": int(self.bytes_sent / duration) if duration else None,
+            "gzip": self.compress,
+        }
+
+    def log_metrics(self):
+        metrics = self.get_metrics()
+        logger.info(f"Streamed export {self.name}: {metrics}", extra=metrics)
+
+
+def log_export_prepared(name, started_at, mode):
+    """
+    Log how long the API took to prepare an export.
+    """
+    duration = round(time.monotonic() - started_at, 3)
+    logger.info(
+        f"Export {name} prepared by the API in {duration}s ({mode})",
+        extra={"export": name, "prepare_seconds": duration, "mode": mode},
+    )
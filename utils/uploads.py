@@ -0,0 +1,143 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.api.transport import get_session
+from utils.exceptions import FileUploadError
+from utils.upstream import timed_call
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_ERROR_MESSAGE = (
+    "A system error has occured, so the file has not been uploaded. Try again."
+)
+UPLOADING = "uploading"
+UPLOAD_FAILED = "failed"
+UPLOAD_STATUS_TIMEOUT = 60 * 60
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+
+
+class ChunkedFile:
+    """
+    Reads a file in fixed size chunks for streaming as a request body.
+
+    Having a length means requests sends a Content-Length header rather
+    than using chunked transfer encoding, which S3 won't accept for a PUT.
+    Iterating again starts from the beginning, so a failed upload can be
+    retried with the same object.
+    """
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.file.seek(0, os.SEEK_END)
+        self.size = self.file.tell()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        self.file.seek(0)
+        while True:
+            chunk = self.file.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def upload_to_s3(url, file):
+    """
+    Stream a file to a presigned S3 url.
+
+    Connection errors and 5xx responses are retried up to S3_UPLOAD_RETRIES
+    times, waiting a little longer before each attempt.
+    """
+    body = ChunkedFile(file, settings.S3_UPLOAD_CHUNK_SIZE)
+    attempts = settings.S3_UPLOAD_RETRIES + 1
+
+    for attempt in range(1, attempts + 1):
+        try:
+            with timed_call("s3", "put", "documents") as call:
+                response = get_session().put(
+                    url,
+                    headers={"x-amz-server-side-encryption": "AES256"},
+                    data=body,
+                )
+                call.status = response.status_code
+            response.raise_for_status()
+            return
+        except requests.exceptions.RequestException as e:
+            status_code = getattr(e.response, "status_code", None)
+            if attempt == attempts or (status_code and status_code < 500):
+                raise FileUploadError(UPLOAD_ERROR_MESSAGE)
+            logger.warning(f"S3 upload attempt {attempt} failed: {e}")
+            time.sleep(settings.S3_UPLOAD_RETRY_DELAY * 2 ** (attempt - 1))
+
+
+def get_executor():
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.S3_UPLOAD_WORKERS,
+                    thread_name_prefix="s3-upload",
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def get_upload_status_key(document_id):
+    return f"document_upload:{document_id}"
+
+
+def get_upload_status(document_id):
+    """
+    Get the status of a background upload.
+
+    :return: UPLOADING, UPLOAD_FAILED or None once the upload has finished
+    """
+    return cache.get(get_upload_status_key(document_id))
+
+
+def upload_in_background(document_id, url, file, on_complete):
+    """
+    Upload a file to S3 without holding up the request.
+
+    The file is copied to a temporary file first, as django deletes its
+    own upload once the request is over. on_complete is called after the
+    upload succeeds. Progress is kept in the cache so it can be polled
+    from any process with get_upload_status.
+    """
+    spooled = tempfile.TemporaryFile()
+    file.seek(0)
+    shutil.copyfileobj(file, spooled, settings.S3_UPLOAD_CHUNK_SIZE)
+
+    key = get_upload_status_key(document_id)
+    cache.set(key, UPLOADING, UPLOAD_STATUS_TIMEOUT)
+
+    def run():
+        try:
+            with spooled:
+                upload_to_s3(url, spooled)
+            on_complete()
+        except Exception as e:
+            logger.warning(f"Background upload of document {document_id} failed: {e}")
+            cache.set(key, UPLOAD_FAILED, UPLOAD_STATUS_TIMEOUT)
+        else:
+            cache.delete(key)
+
+    get_executor().submit(run)
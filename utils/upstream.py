@@ -0,0 +1,144 @@
+import contextvars
+import re
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+_recorder = contextvars.ContextVar("upstream_call_recorder", default=None)
+
+id_re = re.compile(
+    r"(?<=/)([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)(?=/|$)",
+    re.IGNORECASE,
+)
+
+UpstreamCall = namedtuple(
+    "UpstreamCall", ("service", "method", "path", "status", "duration")
+)
+
+
+def get_path_template(path):
+    """
+    Replace ids in a path so calls to the same endpoint are grouped.
+
+    e.g. "/barriers/<uuid>/history" becomes "/barriers/{id}/history"
+    """
+    path = path.split("?", 1)[0]
+    return id_re.sub("{id}", "/" + path.lstrip("/"))
+
+
+class CallRecorder:
+    """
+    Collects the upstream calls made while handling a request.
+
+    Calls made from threads started with gather share the recorder, as
+    they run in a copy of the request's context.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def record(self, service, method, path, status, duration):
+        self.calls.append(
+            UpstreamCall(
+                service=service,
+                method=method.upper(),
+                path=get_path_template(path),
+                status=status,
+                duration=duration,
+            )
+        )
+
+    def get_services(self):
+        """
+        :return: DICT - {service: {"count": 2, "duration_ms": 12.3}}
+        """
+        services = {}
+        for call in self.calls:
+            service = services.setdefault(call.service, {"count": 0, "duration_ms": 0})
+            service["count"] += 1
+            service["duration_ms"] += call.duration * 1000
+        for service in services.values():
+            service["duration_ms"] = round(service["duration_ms"], 1)
+        return services
+
+    def get_endpoints(self):
+        """
+        The calls grouped by endpoint, slowest first.
+        """
+        endpoints = {}
+        for call in self.calls:
+            key = (call.service, call.method, call.path, call.status)
+            endpoint = endpoints.setdefault(
+                key,
+                {
+                    "service": call.service,
+                    "method": call.method,
+                    "path": call.path,
+                    "status": call.status,
+                    "count": 0,
+                    "duration_ms": 0,
+                },
+            )
+            endpoint["count"] += 1
+            endpoint["duration_ms"] += call.duration * 1000
+        for endpoint in endpoints.values():
+            endpoint["duration_ms"] = round(endpoint["duration_ms"], 1)
+        return sorted(
+            endpoints.values(),
+            key=lambda endpoint: endpoint["duration_ms"],
+            reverse=True,
+        )
+
+    def get_server_timing(self, total_duration=None):
+        """
+        Format the calls per service as a Server-Timing header value.
+        """
+        metrics = [
+            f'{name};dur={service["duration_ms"]};desc="{service["count"]} calls"'
+            for name, service in self.get_services().items()
+        ]
+        if total_duration is not None:
+            metrics.append(f"total;dur={round(total_duration * 1000, 1)}")
+        return ", ".join(metrics)
+
+
+def get_recorder():
+    return _recorder.get()
+
+
+@contextmanager
+def record_calls():
+    """
+    Activate a fresh CallRecorder for the duration of the block.
+    """
+    token = _recorder.set(CallRecorder())
+    try:
+        yield _recorder.get()
+    finally:
+        _recorder.reset(token)
+
+
+class TimedCall:
+    status = None
+
+
+@contextmanager
+def timed_call(service, method, path):
+    """
+    Time an upstream call and record it if a recorder is active.
+
+    Set .status on the yielded object once the call has a response.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        yield TimedCall()
+        return
+
+    call = TimedCall()
+    started_at = time.monotonic()
+    try:
+        yield call
+    finally:
+        recorder.record(
+            service, method, path, call.status, time.monotonic() - started_at
+        )